@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
+from datetime import datetime
 from typing import List, Optional
 from app.user.service.service import UserService
 from app.group.service.service import GroupService
 from app.board.service.service import BoardService
+from app.server.response import FastJSONResponse, NDJSONResponse
 from app.board.dto.dto import (
     BoardCreate, 
     BoardUpdate, 
+    BoardPage,
+    CommentPage,
     CommentCreate,
     CommentUpdate
 )
@@ -18,37 +22,54 @@ board_service = BoardService()
 router = APIRouter()
 
 @router.post("/boards/", status_code=201)
-def create_new_board(board_data: BoardCreate, user_id: int = Depends(user_service.get_userid_by_email)):
-    return board_service.create_board(board_data, user_id)
+async def create_new_board(board_data: BoardCreate, user_id: int = Depends(user_service.get_userid_by_email)):
+    return await board_service.create_board(board_data, user_id)
 
-@router.get("/boards/")
-def get_all_boards(category_id: Optional[int] = None, category_type: Optional[str] = None):
-    return board_service.get_boards(category_id, category_type)
+# 목록 응답은 리포지토리에서 검증을 마친 dict 라 response_model 은 문서용이고, 인코딩만 한 번 합니다.
+@router.get("/boards/", response_model=BoardPage, response_class=FastJSONResponse)
+async def get_all_boards(category_id: Optional[int] = None, category_type: Optional[str] = None, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None, preview: int = Query(0, ge=0, le=500), if_none_match: Optional[str] = Header(None)):
+    etag, boards = await board_service.get_boards(category_id, category_type, limit, cursor, preview, if_none_match)
+    return FastJSONResponse(boards, headers={"ETag": etag})
+
+# 보고용 전체 내보내기: 한 줄에 한 행인 NDJSON 을 청크 단위로 흘려보냅니다.
+# created_from 은 포함, created_to 는 제외하는 범위입니다. "/boards/{board_id}/" 보다 먼저 등록해야 합니다.
+@router.get("/boards/export/")
+async def export_boards(category_id: Optional[int] = None, category_type: Optional[str] = None, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None, user_id: int = Depends(user_service.get_userid_by_email)):
+    return NDJSONResponse(board_service.export_boards(category_id, category_type, created_from, created_to))
+
+@router.get("/comments/export/")
+async def export_comments(category_id: Optional[int] = None, category_type: Optional[str] = None, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None, user_id: int = Depends(user_service.get_userid_by_email)):
+    return NDJSONResponse(board_service.export_comments(category_id, category_type, created_from, created_to))
 
 @router.get("/boards/{board_id}/")
-def get_board_by_id(board_id: int):
-    return board_service.get_board(board_id)
+async def get_board_by_id(board_id: int, response: Response, include: Optional[str] = None, comment_limit: int = Query(20, ge=1, le=100), if_none_match: Optional[str] = Header(None)):
+    # include=comments 이면 첫 댓글 페이지를 함께 돌려줍니다.
+    include_comments = include is not None and "comments" in include.split(",")
+    etag, board = await board_service.get_board(board_id, include_comments, comment_limit, if_none_match)
+    response.headers["ETag"] = etag
+    return board
 
 @router.put("/boards/{board_id}/", status_code=200)
-def update_board_by_id(board_id: int, board_data: BoardUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
-    return board_service.update_board(board_id, board_data, user_id)
+async def update_board_by_id(board_id: int, board_data: BoardUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
+    return await board_service.update_board(board_id, board_data, user_id)
 
 @router.delete("/boards/{board_id}/", status_code=204)
-def delete_board_by_id(board_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
-    return board_service.delete_board(board_id, user_id)
+async def delete_board_by_id(board_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
+    return await board_service.delete_board(board_id, user_id)
 
 @router.post("/boards/{board_id}/comments/", status_code=201)
-def create_new_comment(board_id: int, comment_data: CommentCreate, user_id: int = Depends(user_service.get_userid_by_email)):
-    return board_service.create_comment(board_id, comment_data, user_id)
+async def create_new_comment(board_id: int, comment_data: CommentCreate, user_id: int = Depends(user_service.get_userid_by_email)):
+    return await board_service.create_comment(board_id, comment_data, user_id)
 
-@router.get("/boards/{board_id}/comments/")
-def get_comments_by_board_id(board_id: int):
-    return board_service.get_comments(board_id)
+@router.get("/boards/{board_id}/comments/", response_model=CommentPage, response_class=FastJSONResponse)
+async def get_comments_by_board_id(board_id: int, limit: int = Query(20, ge=1, le=100), cursor: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
+    etag, comments = await board_service.get_comments(board_id, limit, cursor, if_none_match)
+    return FastJSONResponse(comments, headers={"ETag": etag})
 
 @router.put("/comments/{comment_id}/", status_code=200)
-def update_comment_by_id(comment_id: int, comment_data: CommentUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
-    return board_service.update_comment(comment_id, comment_data, user_id)
+async def update_comment_by_id(comment_id: int, comment_data: CommentUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
+    return await board_service.update_comment(comment_id, comment_data, user_id)
 
 @router.delete("/comments/{comment_id}/", status_code=204)
-def delete_comment_by_id(comment_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
-    return board_service.delete_comment(comment_id, user_id)
\ No newline at end of file
+async def delete_comment_by_id(comment_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
+    return await board_service.delete_comment(comment_id, user_id)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
 from app.user.dto.dto import UserID
 from app.group.dto.dto import (
     Group,
@@ -6,9 +6,13 @@ from app.group.dto.dto import (
     GroupMembershipRequest,
     MemberRequestsView,
     AdminUser,
+    GroupPage,
+    MemberRequestBatch,
+    MemberRequestOutcome,
 )
 from app.user.service.service import UserService
 from app.group.service.service import GroupService
+from app.server.response import FastJSONResponse
 from typing import List, Optional
 
 router = APIRouter()
@@ -21,16 +25,17 @@ async def create_group(
     group_create: GroupCreate,
     user_id: UserID = Depends(user_service.get_userid_by_email),
 ):
-    group = group_service.create_group(group_create, user_id)
+    group = await group_service.create_group(group_create, user_id)
     return group
 
 
-@router.get("/mygroup/", response_model=List[Group])
+# 목록 응답은 리포지토리에서 검증을 마친 dict 라 response_model 은 문서용이고, 인코딩만 한 번 합니다.
+@router.get("/mygroup/", response_model=List[Group], response_class=FastJSONResponse)
 async def get_user_groups(user_id: UserID = Depends(user_service.get_userid_by_email)):
-    user_groups = group_service.get_user_groups(user_id)
+    user_groups = await group_service.get_user_groups(user_id)
     if not user_groups:
         raise HTTPException(status_code=404, detail="User has no groups")
-    return user_groups
+    return FastJSONResponse(user_groups)
 
 
 @router.delete("/mygroup/")
@@ -38,7 +43,7 @@ async def delete_group(
     group_id: int, user_id: UserID = Depends(user_service.get_userid_by_email)
 ):
     try:
-        group_service.delete_group(group_id, user_id)
+        await group_service.delete_group(group_id, user_id)
         return {"message": "Group deleted successfully"}
     except HTTPException as e:
         return e
@@ -48,7 +53,7 @@ async def delete_group(
 async def study_group_join_request(
     group_id: int, user_id: UserID = Depends(user_service.get_userid_by_email)
 ):
-    group_service.study_group_join_request(user_id, group_id)
+    await group_service.study_group_join_request(user_id, group_id)
     return {"message": "Successfully send study group join request"}
 
 
@@ -56,25 +61,25 @@ async def study_group_join_request(
 async def get_member_requests_by_user(
     user_id: UserID = Depends(user_service.get_userid_by_email),
 ):
-    requests = group_service.get_member_requests_by_user(user_id)
+    requests = await group_service.get_member_requests_by_user(user_id)
     if not requests:
         raise HTTPException(status_code=404, detail="No member requests found")
     return requests
 
 
-@router.get("/member_requests/", response_model=List[MemberRequestsView])
+@router.get("/member_requests/", response_model=List[MemberRequestsView], response_class=FastJSONResponse)
 async def get_member_requests(
     group_id: int, user_id: UserID = Depends(user_service.get_userid_by_email)
 ):
-    requests = group_service.get_member_requests(group_id, user_id)
+    requests = await group_service.get_member_requests(group_id, user_id)
     if not requests:
         raise HTTPException(status_code=404, detail="No member requests found")
-    return requests
+    return FastJSONResponse(requests)
 
 
 @router.put("/member_requests/")
 async def add_member(request_id: int):
-    success = group_service.add_member(request_id)
+    success = await group_service.add_member(request_id)
     if success:
         return {"message": "Successfully added members"}
     else:
@@ -83,42 +88,66 @@ async def add_member(request_id: int):
 
 @router.delete("/member_requests/deny_request/")
 async def deny_request(request_id: int):
-    success = group_service.deny_request(request_id)
+    success = await group_service.deny_request(request_id)
     if success == 1:
         return {"message": "Successfully denied request"}
     else:
         raise HTTPException(status_code=404, detail="That's not the right approach.")
 
 
+@router.put("/member_requests/batch/", response_model=List[MemberRequestOutcome])
+async def add_members(
+    batch: MemberRequestBatch,
+    user_id: UserID = Depends(user_service.get_userid_by_email),
+):
+    return await group_service.add_members(batch, user_id)
+
+
+@router.post("/member_requests/deny_request/batch/", response_model=List[MemberRequestOutcome])
+async def deny_requests(
+    batch: MemberRequestBatch,
+    user_id: UserID = Depends(user_service.get_userid_by_email),
+):
+    return await group_service.deny_requests(batch, user_id)
+
+
 @router.get("/group/members")
 async def get_all_members(
     group_id: int, current_user_id: UserID = Depends(user_service.get_userid_by_email)
 ):
-    return group_service.get_all_members(group_id, current_user_id)
+    return await group_service.get_all_members(group_id, current_user_id)
 
 
 @router.delete("/group/group_withdrawal")
 async def group_withdrawal(
     group_id: int, current_user_id: UserID = Depends(user_service.get_userid_by_email)
 ):
-    return group_service.group_withdrawal(group_id, current_user_id)
+    return await group_service.group_withdrawal(group_id, current_user_id)
 
 
 @router.delete("/group/remove_member")
 async def remove_member(admin_user: AdminUser):
-    return group_service.remove_member(admin_user)
+    return await group_service.remove_member(admin_user)
 
 
-@router.get("/group/", response_model=List[Group])
-async def get_all_groups(name: Optional[str] = None):
-    return group_service.get_all_groups(name)
+@router.get("/group/", response_model=GroupPage)
+async def get_all_groups(
+    response: Response,
+    name: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    etag, groups = await group_service.get_all_groups(name, limit, cursor, if_none_match)
+    response.headers["ETag"] = etag
+    return groups
 
 
 @router.put("/group/{group_id}/{user_id}/ad")
 async def change_member_role_to_admin(role: str, group_id: int, user_id: int):
-    return group_service.change_member_role_to_admin(role, group_id, user_id)
+    return await group_service.change_member_role_to_admin(role, group_id, user_id)
 
 
 @router.put("/group/{group_id}/{user_id}/mem")
 async def change_member_role_to_member(role: str, group_id: int, user_id: int):
-    return group_service.change_member_role_to_member(role, group_id, user_id)
+    return await group_service.change_member_role_to_member(role, group_id, user_id)
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends, File, UploadFile
+from typing import Optional
+from app.user.service.service import UserService
+from app.importer.service.service import ImportService
+from app.importer.dto.dto import ImportReport
+
+router = APIRouter()
+user_service = UserService()
+import_service = ImportService()
+
+
+# type 컬럼이 user / group / member 인 행을 담은 CSV 또는 NDJSON 파일을 받습니다.
+# 형식은 format 이 없으면 파일 확장자나 Content-Type 으로 정합니다.
+@router.post("/import/", response_model=ImportReport)
+async def import_records(file: UploadFile = File(...), format: Optional[str] = None, email: str = Depends(user_service.get_email_from_token)):
+    return await import_service.import_upload(email, file.file, file.filename, file.content_type, format)
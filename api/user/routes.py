@@ -2,30 +2,28 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from app.user.service.service import UserService
-from app.user.repository.repository import UserRepository
-from app.user.dto.dto import User, UserInfo
+from app.user.dto.dto import User, UserInfo, TokenRefresh
 
 router = APIRouter()
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/")
 
 user_service = UserService()
-user_repository = UserRepository()
 
 
 @router.post("/signup/")
 async def register(user: User):
-    user_service.register(user)
+    await user_service.register(user)
     return {"message": "User registered successfully"}
 
 
 @router.post("/login/")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = user_service.authenticate(form_data.username, form_data.password)
+    user = await user_service.authenticate(form_data.username, form_data.password)
     if user:
         access_token = user_service.create_access_token(user.email)
+        # 로그인마다 새 토큰 가족을 시작합니다. DB 에는 첫 교환 때 기록합니다.
         refresh_token = user_service.create_refresh_token(user.email)
-        user_repository.update_refresh_token(user.email, refresh_token)
         return {
             "access_token": access_token,
             "token_type": "bearer",
@@ -36,10 +34,22 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
         raise HTTPException(status_code=401, detail="Incorrect email or password")
 
 
+@router.post("/token/refresh/")
+async def refresh_token(body: TokenRefresh):
+    # 비밀번호 확인(bcrypt) 없이 access token 을 다시 받습니다. 쓴 refresh token 은 다시 쓸 수 없습니다.
+    return await user_service.refresh(body.refresh_token)
+
+
+@router.post("/token/revoke/")
+async def revoke_token(body: TokenRefresh):
+    await user_service.revoke_refresh_token(body.refresh_token)
+    return {"message": "Refresh token revoked"}
+
+
 @router.get("/user/info/", response_model=UserInfo)
 async def get_user_info(email: str = Depends(user_service.get_email_from_token)):
     if email:
-        user_info = user_service.get_user_info(email)
+        user_info = await user_service.get_user_info(email)
         if user_info:
             return user_info
         else:
@@ -53,7 +63,7 @@ async def update_user_info(
     user_info_request: UserInfo, email: str = Depends(user_service.get_email_from_token)
 ):
     if email:
-        user_service.update_user_info(
+        await user_service.update_user_info(
             email,
             user_info_request.username,
             user_info_request.nickname,
@@ -70,13 +80,13 @@ async def update_user_password(
     new_password: str,
     email: str = Depends(user_service.get_email_from_token),
 ):
-    user = user_service.authenticate(email, current_password)
+    user = await user_service.authenticate(email, current_password)
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect current password")
 
     # 새로운 해싱된 비밀번호로 사용자 정보를 업데이트합니다.
     try:
-        user_service.update_user_password(email, new_password)
+        await user_service.update_user_password(email, new_password)
         return {"message": "User password updated successfully"}
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -87,12 +97,12 @@ async def withdrawal(
     password: str, email: str = Depends(user_service.get_email_from_token)
 ):
     # 사용자의 현재 비밀번호를 확인합니다.
-    user = user_service.authenticate(email, password)
+    user = await user_service.authenticate(email, password)
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect password")
     try:
         # 사용자의 회원탈퇴를 처리합니다.
-        user_service.withdrawal(email)
+        await user_service.withdrawal(email)
         return {"message": "User account deleted successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
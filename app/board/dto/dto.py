@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class BoardBase(BaseModel):
@@ -20,6 +20,20 @@ class Board(BoardBase):
     user_id: int
     created_at: datetime
 
+class BoardSummary(BaseModel):
+    id: int
+    title: str
+    category_id: int
+    category_type: str
+    status: str
+    user_id: int
+    created_at: datetime
+    preview: Optional[str] = None
+
+class BoardPage(BaseModel):
+    items: List[BoardSummary]
+    next_cursor: Optional[str] = None
+
 class CommentBase(BaseModel):
     content: str
 
@@ -33,4 +47,14 @@ class Comment(CommentBase):
     id: int
     user_id: int
     board_id: int
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+class CommentView(Comment):
+    nickname: Optional[str] = None
+
+class CommentPage(BaseModel):
+    items: List[CommentView]
+    next_cursor: Optional[str] = None
+
+class BoardDetail(Board):
+    comments: Optional[CommentPage] = None
\ No newline at end of file
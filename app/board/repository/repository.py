@@ -1,124 +1,439 @@
-from typing import List, Optional
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional, Tuple
 from app.board.dto.dto import (
     BoardCreate, 
     BoardUpdate, 
     CommentCreate, 
     CommentUpdate, 
     Board, 
-    Comment
+    BoardSummary,
+    BoardDetail,
+    Comment,
+    CommentView,
 )
-from typing import List, Optional
-import sqlite3
+from app.database.connection import pool
+from app.database.reference import reference_data
+from app.database.pagination import encode_cursor, decode_cursor
+from app.database.rows import row_adapter, as_dicts
+from app.database.executor import run_sync
+from app.database.batcher import WriteBatcher, WRITE_BATCH, write_batcher
+
+# 목록 조회는 행마다 모델을 만들지 않고 dict 목록으로 한 번에 검증합니다.
+board_summary_rows = row_adapter(BoardSummary)
+comment_rows = row_adapter(CommentView)
+board_rows = row_adapter(Board)
+export_comment_rows = row_adapter(Comment)
+
+# 내보내기에서 한 번의 짧은 읽기로 가져오는 행 수
+EXPORT_CHUNK_SIZE = int(os.environ.get("SUDDEN_ATTACK_EXPORT_CHUNK_SIZE", "500"))
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    # created_at 은 UTC "YYYY-MM-DD HH:MM:SS" 문자열로 저장되므로 같은 형식으로 바꿔 문자열로 비교합니다.
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
 
 class BoardRepository:
     def __init__(self):
-        self.conn = sqlite3.connect("sudden-attack.db", check_same_thread=False)
-        self.cursor = self.conn.cursor()
+        self.pool = pool
+        self.reference = reference_data
 
     def get_board(self, board_id: int) -> Optional[Board]:
-        self.cursor.execute(
-            """
-            SELECT b.id, b.title, b.content, b.category_id, b.category_type, b.status, b.user_id, b.created_at
-            FROM board b
-            WHERE b.id = ?
-            """,
-            (board_id,)
-        )
-        result = self.cursor.fetchone()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT b.id, b.title, b.content, b.category_id, b.category_type, b.status, b.user_id, b.created_at
+                FROM board b
+                WHERE b.id = ?
+                """,
+                (board_id,)
+            )
+            result = cursor.fetchone()
         if result:
-            return Board(*result)
+            return self._to_board(result)
         else:
             return None
 
-    def get_boards(self, category_id: Optional[int] = None, category_type: Optional[str] = None) -> List[Board]:
-        self.cursor.execute( 
-            """
-            SELECT b.id, b.title, b.content, b.category_id, b.category_type, b.status, b.user_id, b.created_at
-            FROM board b
-            WHERE (? IS NULL OR b.category_id = ?)
-              AND (? IS NULL OR b.category_type = ?)
-            """,
-            (category_id, category_id, category_type, category_type)
-        )
-        results = self.cursor.fetchall()
-        return [Board(*result) for result in results]
+    def get_boards(
+        self,
+        category_id: Optional[int] = None,
+        category_type: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        preview: int = 0,
+    ) -> dict:
+        # BoardPage 형태의 dict 를 돌려줍니다.
+        # "(? IS NULL OR ...)" 형태는 인덱스를 쓰지 못하므로 주어진 조건만 WHERE 절에 넣습니다.
+        conditions = []
+        params = []
+        if category_id is not None:
+            conditions.append("b.category_id = ?")
+            params.append(category_id)
+        if category_type is not None:
+            conditions.append("b.category_type = ?")
+            params.append(category_type)
+        # 마지막으로 본 (created_at, id) 다음부터 읽으므로 몇 번째 페이지든 비용이 같습니다.
+        after = decode_cursor(cursor, 2)
+        if after:
+            conditions.append("(b.created_at, b.id) < (?, ?)")
+            params.extend(after)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            # 목록에는 본문 전체 대신 SQL 에서 잘라낸 미리보기만 가져옵니다.
+            cur.execute( 
+                f"""
+                SELECT b.id, b.title, b.category_id, b.category_type, b.status, b.user_id, b.created_at,
+                    CASE WHEN ? > 0 THEN substr(b.content, 1, ?) END AS preview
+                FROM board b
+                {where}
+                ORDER BY b.created_at DESC, b.id DESC
+                LIMIT ?
+                """,
+                (preview, preview, *params, limit + 1)
+            )
+            results = cur.fetchall()
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor(results[-1][6], results[-1][0])
+        return {
+            "items": board_summary_rows.validate_python(as_dicts(cur.description, results)),
+            "next_cursor": next_cursor,
+        }
 
     def create_board(self, board_data: BoardCreate, user_id: int) -> int:
-        self.cursor.execute(
-            """
-            INSERT INTO board (title, content, category_id, category_type, user_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (board_data.title, board_data.content, board_data.category_id, board_data.category_type, user_id)
-        )
-        self.conn.commit()
-        return self.cursor.lastrowid
+        # 카테고리는 참조 데이터로 먼저 확인합니다. 외래 키는 그 사이에 지워진 경우를 위한 마지막 확인입니다.
+        if not self.reference.has_category(board_data.category_id, board_data.category_type):
+            raise ValueError("Invalid category")
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO board (title, content, category_id, category_type, user_id)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    (board_data.title, board_data.content, board_data.category_id, board_data.category_type, user_id)
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError("Invalid category")
+            conn.commit()
+        return cursor.lastrowid
 
     def update_board(self, board_id: int, board_data: BoardUpdate, user_id: int) -> bool:
-        self.cursor.execute(
-            """
-            UPDATE board
-            SET title = ?, content = ?, category_id = ?, category_type = ?
-            WHERE id = ? AND user_id = ?
-            """,
-            (board_data.title, board_data.content, board_data.category_id, board_data.category_type, board_id, user_id)
-        )
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        if not self.reference.has_category(board_data.category_id, board_data.category_type):
+            raise ValueError("Invalid category")
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    UPDATE board
+                    SET title = ?, content = ?, category_id = ?, category_type = ?
+                    WHERE id = ? AND user_id = ?
+                    """,
+                    (board_data.title, board_data.content, board_data.category_id, board_data.category_type, board_id, user_id)
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError("Invalid category")
+            conn.commit()
+        return cursor.rowcount > 0
 
     def delete_board(self, board_id: int, user_id: int) -> bool:
-        self.cursor.execute(
-            """
-            DELETE FROM board
-            WHERE id = ? AND user_id = ?
-            """,
-            (board_id, user_id)
-        )
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            # board_comment 의 외래 키에는 ON DELETE CASCADE 가 없으므로 댓글을 먼저 지웁니다.
+            cursor.execute(
+                """
+                DELETE FROM board_comment
+                WHERE board_id = (
+                    SELECT id
+                    FROM board
+                    WHERE id = ? AND user_id = ?
+                )
+                """,
+                (board_id, user_id)
+            )
+            cursor.execute(
+                """
+                DELETE FROM board
+                WHERE id = ? AND user_id = ?
+                """,
+                (board_id, user_id)
+            )
+            conn.commit()
+        return cursor.rowcount > 0
 
     def create_comment(self, board_id: int, comment_data: CommentCreate, user_id: int) -> int:
-        self.cursor.execute(
-            """
-            INSERT INTO board_comment (content, board_id, user_id)
-            VALUES (?, ?, ?)
-            """,
-            (comment_data.content, board_id, user_id)
-        )
-        self.conn.commit()
-        return self.cursor.lastrowid
-
-    def get_comments(self, board_id: int) -> List[Comment]:
-        self.cursor.execute(
-            """
-            SELECT c.id, c.content, c.user_id, c.board_id, c.created_at
-            FROM board_comment c
-            WHERE c.board_id = ?
-            """,
-            (board_id,)
-        )
-        results = self.cursor.fetchall()
-        return [Comment(*result) for result in results]
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO board_comment (content, board_id, user_id)
+                    VALUES (?, ?, ?)
+                    """,
+                    (comment_data.content, board_id, user_id)
+                )
+            except sqlite3.IntegrityError:
+                raise ValueError("Board not found")
+            conn.commit()
+        return cursor.lastrowid
+
+    def get_comments(self, board_id: int, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        # CommentPage 형태의 dict 를 돌려줍니다.
+        # (board_id, created_at, id) 인덱스를 따라 마지막으로 본 댓글 다음부터 읽습니다.
+        after = decode_cursor(cursor, 2)
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                f"""
+                SELECT c.id, c.content, c.user_id, c.board_id, c.created_at, u.nickname
+                FROM board_comment c
+                LEFT JOIN user u ON u.id = c.user_id
+                WHERE c.board_id = ?
+                {"AND (c.created_at, c.id) > (?, ?)" if after else ""}
+                ORDER BY c.created_at, c.id
+                LIMIT ?
+                """,
+                (board_id, *(after or ()), limit + 1)
+            )
+            results = cur.fetchall()
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor(results[-1][4], results[-1][0])
+        return {
+            "items": comment_rows.validate_python(as_dicts(cur.description, results)),
+            "next_cursor": next_cursor,
+        }
+
+    def get_board_with_comments(self, board_id: int, comment_limit: int = 20) -> Optional[BoardDetail]:
+        # 게시글과 첫 댓글 페이지를 하나의 커넥션 체크아웃으로 읽습니다.
+        with self.pool.connection():
+            board = self.get_board(board_id)
+            if board is None:
+                return None
+            comments = self.get_comments(board_id, comment_limit)
+        return BoardDetail(**board.model_dump(), comments=comments)
 
     def update_comment(self, comment_id: int, comment_data: CommentUpdate, user_id: int) -> bool:
-        self.cursor.execute(
-            """
-            UPDATE board_comment
-            SET content = ?
-            WHERE id = ? AND user_id = ?
-            """,
-            (comment_data.content, comment_id, user_id)
-        )
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE board_comment
+                SET content = ?
+                WHERE id = ? AND user_id = ?
+                """,
+                (comment_data.content, comment_id, user_id)
+            )
+            conn.commit()
+        return cursor.rowcount > 0
 
     def delete_comment(self, comment_id: int, user_id: int) -> bool:
-        self.cursor.execute(
-            """
-            DELETE FROM board_comment
-            WHERE id = ? AND user_id = ?
-            """,
-            (comment_id, user_id)
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE FROM board_comment
+                WHERE id = ? AND user_id = ?
+                """,
+                (comment_id, user_id)
+            )
+            conn.commit()
+        return cursor.rowcount > 0
+
+    def export_boards(
+        self,
+        category_id: Optional[int] = None,
+        category_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: Optional[Tuple[str, int]] = None,
+        limit: int = EXPORT_CHUNK_SIZE,
+    ) -> Tuple[List[dict], Optional[Tuple[str, int]]]:
+        # 내보내기 한 청크와 다음 청크를 읽을 위치를 돌려줍니다. 마지막 청크이면 위치는 None 입니다.
+        # 청크마다 커넥션을 잠깐만 쓰므로 내보내기가 길어져도 풀 커넥션이나 읽기 스냅숏을 붙잡지 않습니다.
+        conditions = ["(b.created_at, b.id) > (?, ?)"]
+        params = list(after or (_timestamp(created_from) or "", 0))
+        if category_id is not None:
+            conditions.append("b.category_id = ?")
+            params.append(category_id)
+        if category_type is not None:
+            conditions.append("b.category_type = ?")
+            params.append(category_type)
+        if created_to is not None:
+            conditions.append("b.created_at < ?")
+            params.append(_timestamp(created_to))
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT b.id, b.title, b.content, b.category_id, b.category_type, b.status, b.user_id, b.created_at
+                FROM board b
+                WHERE {" AND ".join(conditions)}
+                ORDER BY b.created_at, b.id
+                LIMIT ?
+                """,
+                (*params, limit)
+            )
+            results = cursor.fetchmany(limit)
+        position = (results[-1][7], results[-1][0]) if len(results) == limit else None
+        return board_rows.validate_python(as_dicts(cursor.description, results)), position
+
+    def export_comments(
+        self,
+        category_id: Optional[int] = None,
+        category_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        after: int = 0,
+        limit: int = EXPORT_CHUNK_SIZE,
+    ) -> Tuple[List[dict], Optional[int]]:
+        # 댓글은 id 순서로 내보냅니다. 카테고리 조건은 댓글이 달린 게시글의 카테고리입니다.
+        conditions = ["c.id > ?"]
+        params: list = [after]
+        if category_id is not None:
+            conditions.append("b.category_id = ?")
+            params.append(category_id)
+        if category_type is not None:
+            conditions.append("b.category_type = ?")
+            params.append(category_type)
+        if created_from is not None:
+            conditions.append("c.created_at >= ?")
+            params.append(_timestamp(created_from))
+        if created_to is not None:
+            conditions.append("c.created_at < ?")
+            params.append(_timestamp(created_to))
+        # CROSS JOIN 은 댓글을 바깥 루프로 고정해, 청크마다 조건에 맞는 댓글 전체를 정렬하지 않고
+        # 마지막으로 내보낸 id 다음부터 LIMIT 까지만 읽게 합니다.
+        join = "CROSS JOIN board b ON b.id = c.board_id" if category_id is not None or category_type is not None else ""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT c.id, c.content, c.user_id, c.board_id, c.created_at
+                FROM board_comment c
+                {join}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY c.id
+                LIMIT ?
+                """,
+                (*params, limit)
+            )
+            results = cursor.fetchmany(limit)
+        position = results[-1][0] if len(results) == limit else None
+        return export_comment_rows.validate_python(as_dicts(cursor.description, results)), position
+
+    def _to_board(self, row) -> Board:
+        return Board(
+            id=row[0],
+            title=row[1],
+            content=row[2],
+            category_id=row[3],
+            category_type=row[4],
+            status=row[5],
+            user_id=row[6],
+            created_at=row[7],
         )
-        self.conn.commit()
-        return self.cursor.rowcount > 0
\ No newline at end of file
+
+
+
+class AsyncBoardRepository:
+    def __init__(
+        self, board_repository: BoardRepository = None, batcher: Optional[WriteBatcher] = None
+    ):
+        self.board_repository = board_repository or BoardRepository()
+        # 쓰기 배치 모드에서는 게시글/댓글 INSERT 를 그룹 커밋 스레드로 보냅니다.
+        self.batcher = batcher or (write_batcher if WRITE_BATCH else None)
+
+    async def get_board(self, board_id: int) -> Optional[Board]:
+        return await run_sync(self.board_repository.get_board, board_id)
+
+    async def get_boards(
+        self,
+        category_id: Optional[int] = None,
+        category_type: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        preview: int = 0,
+    ) -> dict:
+        return await run_sync(
+            self.board_repository.get_boards, category_id, category_type, limit, cursor, preview
+        )
+
+    async def create_board(self, board_data: BoardCreate, user_id: int) -> int:
+        if self.batcher is not None:
+            return await self.batcher.submit(self.board_repository.create_board, board_data, user_id)
+        return await run_sync(self.board_repository.create_board, board_data, user_id)
+
+    async def update_board(self, board_id: int, board_data: BoardUpdate, user_id: int) -> bool:
+        return await run_sync(self.board_repository.update_board, board_id, board_data, user_id)
+
+    async def delete_board(self, board_id: int, user_id: int) -> bool:
+        return await run_sync(self.board_repository.delete_board, board_id, user_id)
+
+    async def create_comment(self, board_id: int, comment_data: CommentCreate, user_id: int) -> int:
+        if self.batcher is not None:
+            return await self.batcher.submit(self.board_repository.create_comment, board_id, comment_data, user_id)
+        return await run_sync(self.board_repository.create_comment, board_id, comment_data, user_id)
+
+    async def get_comments(self, board_id: int, limit: int = 20, cursor: Optional[str] = None) -> dict:
+        return await run_sync(self.board_repository.get_comments, board_id, limit, cursor)
+
+    async def get_board_with_comments(self, board_id: int, comment_limit: int = 20) -> Optional[BoardDetail]:
+        return await run_sync(self.board_repository.get_board_with_comments, board_id, comment_limit)
+
+    async def export_boards(
+        self,
+        category_id: Optional[int] = None,
+        category_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[List[dict]]:
+        # 청크를 하나씩 읽어 넘기므로 메모리 사용량은 테이블 크기와 상관없이 청크 하나 분량입니다.
+        after = None
+        while True:
+            rows, after = await run_sync(
+                self.board_repository.export_boards,
+                category_id, category_type, created_from, created_to, after, chunk_size,
+            )
+            if rows:
+                yield rows
+            if after is None:
+                return
+
+    async def export_comments(
+        self,
+        category_id: Optional[int] = None,
+        category_type: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[List[dict]]:
+        after = 0
+        while True:
+            rows, after = await run_sync(
+                self.board_repository.export_comments,
+                category_id, category_type, created_from, created_to, after, chunk_size,
+            )
+            if rows:
+                yield rows
+            if after is None:
+                return
+
+    async def update_comment(self, comment_id: int, comment_data: CommentUpdate, user_id: int) -> bool:
+        return await run_sync(self.board_repository.update_comment, comment_id, comment_data, user_id)
+
+    async def delete_comment(self, comment_id: int, user_id: int) -> bool:
+        return await run_sync(self.board_repository.delete_comment, comment_id, user_id)
@@ -1,38 +1,104 @@
+from datetime import datetime
 from typing import Optional
 from fastapi import Depends, HTTPException
 from app.user.service.service import UserService
-from app.board.repository.repository import BoardRepository
+from app.board.repository.repository import AsyncBoardRepository
 from app.board.dto.dto import BoardCreate, BoardUpdate, CommentCreate, CommentUpdate
+from app.cache.tagged import response_cache, cache_key, NotModified
 
 user_service = UserService()
 
+def not_modified(e: NotModified) -> HTTPException:
+    # 본문 없이 ETag 만 돌려주는 304 응답입니다.
+    return HTTPException(status_code=304, headers={"ETag": e.etag})
+
+
 class BoardService:
+    # 캐시 무효화는 DB 트리거가 resource_version 을 올리는 것으로 대신합니다.
     def __init__(self):
-        self.board_repository = BoardRepository()
+        self.board_repository = AsyncBoardRepository()
+        self.cache = response_cache
+
+    async def create_board(self, board_data: BoardCreate, user_id: int = Depends(user_service.get_userid_by_email)):
+        try:
+            return await self.board_repository.create_board(board_data, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def get_boards(self, category_id: Optional[int] = None, category_type: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None, preview: int = 0, if_none_match: Optional[str] = None):
+        try:
+            return await self.cache.conditional(
+                cache_key("boards", category_id, category_type, limit, cursor, preview),
+                ["boards"],
+                lambda: self.board_repository.get_boards(category_id, category_type, limit, cursor, preview),
+                if_none_match,
+            )
+        except NotModified as e:
+            raise not_modified(e)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def get_board(self, board_id: int, include_comments: bool = False, comment_limit: int = 20, if_none_match: Optional[str] = None):
+        try:
+            if include_comments:
+                return await self.cache.conditional(
+                    cache_key("board", board_id, "comments", comment_limit),
+                    [f"board:{board_id}", f"comments:{board_id}", "nicknames"],
+                    lambda: self.board_repository.get_board_with_comments(board_id, comment_limit),
+                    if_none_match,
+                )
+            return await self.cache.conditional(
+                cache_key("board", board_id),
+                [f"board:{board_id}"],
+                lambda: self.board_repository.get_board(board_id),
+                if_none_match,
+            )
+        except NotModified as e:
+            raise not_modified(e)
 
-    def create_board(self, board_data: BoardCreate, user_id: int = Depends(user_service.get_userid_by_email)):
-        return self.board_repository.create_board(board_data, user_id)
+    async def update_board(self, board_id: int, board_data: BoardUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
+        try:
+            return await self.board_repository.update_board(board_id, board_data, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    def get_boards(self, category_id: Optional[int] = None, category_type: Optional[str] = None):
-        return self.board_repository.get_boards(category_id, category_type)
+    async def delete_board(self, board_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
+        return await self.board_repository.delete_board(board_id, user_id)
 
-    def get_board(self, board_id: int):
-        return self.board_repository.get_board(board_id)
+    async def create_comment(self, board_id: int, comment_data: CommentCreate, user_id: int = Depends(user_service.get_userid_by_email)):
+        try:
+            return await self.board_repository.create_comment(board_id, comment_data, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
 
-    def update_board(self, board_id: int, board_data: BoardUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
-        return self.board_repository.update_board(board_id, board_data, user_id)
+    async def get_comments(self, board_id: int, limit: int = 20, cursor: Optional[str] = None, if_none_match: Optional[str] = None):
+        try:
+            return await self.cache.conditional(
+                cache_key("comments", board_id, limit, cursor),
+                [f"comments:{board_id}", "nicknames"],
+                lambda: self.board_repository.get_comments(board_id, limit, cursor),
+                if_none_match,
+            )
+        except NotModified as e:
+            raise not_modified(e)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    def delete_board(self, board_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
-        return self.board_repository.delete_board(board_id, user_id)
+    def export_boards(self, category_id: Optional[int] = None, category_type: Optional[str] = None, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None):
+        # 스트리밍이 시작된 뒤에는 상태 코드를 바꿀 수 없으므로 조건 검사는 여기서 먼저 합니다.
+        self._check_range(created_from, created_to)
+        return self.board_repository.export_boards(category_id, category_type, created_from, created_to)
 
-    def create_comment(self, board_id: int, comment_data: CommentCreate, user_id: int = Depends(user_service.get_userid_by_email)):
-        return self.board_repository.create_comment(board_id, comment_data, user_id)
+    def export_comments(self, category_id: Optional[int] = None, category_type: Optional[str] = None, created_from: Optional[datetime] = None, created_to: Optional[datetime] = None):
+        self._check_range(created_from, created_to)
+        return self.board_repository.export_comments(category_id, category_type, created_from, created_to)
 
-    def get_comments(self, board_id: int):
-        return self.board_repository.get_comments(board_id)
+    def _check_range(self, created_from: Optional[datetime], created_to: Optional[datetime]):
+        if created_from is not None and created_to is not None and created_from >= created_to:
+            raise HTTPException(status_code=400, detail="created_from must be earlier than created_to")
 
-    def update_comment(self, comment_id: int, comment_data: CommentUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
-        return self.board_repository.update_comment(comment_id, comment_data, user_id)
+    async def update_comment(self, comment_id: int, comment_data: CommentUpdate, user_id: int = Depends(user_service.get_userid_by_email)):
+        return await self.board_repository.update_comment(comment_id, comment_data, user_id)
 
-    def delete_comment(self, comment_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
-        return self.board_repository.delete_comment(comment_id, user_id)
\ No newline at end of file
+    async def delete_comment(self, comment_id: int, user_id: int = Depends(user_service.get_userid_by_email)):
+        return await self.board_repository.delete_comment(comment_id, user_id)
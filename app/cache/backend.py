@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from app.cache.lru import LRUCache
+
+
+class CacheBackend(ABC):
+    # 여러 워커가 캐시를 공유해야 하면 이 인터페이스로 Redis 등 외부 저장소를 연결합니다.
+    @abstractmethod
+    def get(self, key: str) -> Any:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self._entries = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str) -> Any:
+        return self._entries.get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._entries.set(key, value, ttl=ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
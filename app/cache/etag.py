@@ -0,0 +1,15 @@
+import hashlib
+from typing import Iterable, Optional
+
+
+def make_etag(key: str, versions: Iterable[int]) -> str:
+    # 같은 요청 키와 같은 리소스 버전이면 응답 본문도 같으므로 강한 ETag 로 씁니다.
+    digest = hashlib.sha1(f"{key}|{tuple(versions)}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
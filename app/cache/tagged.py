@@ -0,0 +1,82 @@
+import os
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence, Tuple
+
+from app.cache.backend import CacheBackend, MemoryCacheBackend
+from app.cache.etag import make_etag, etag_matches
+from app.database.versions import AsyncResourceVersionRepository
+
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "30"))
+
+VersionSource = Callable[[Sequence[str]], Awaitable[Tuple[int, ...]]]
+
+
+def cache_key(*parts: Any) -> str:
+    return ":".join(str(part) for part in parts)
+
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        super().__init__(etag)
+        self.etag = etag
+
+
+class TaggedCache:
+    # 항목은 저장할 때의 태그 버전과 함께 보관하고, 조회 시 현재 버전과 다르면 버립니다.
+    # 버전은 version_source(resource_version 테이블)에서 읽습니다.
+    def __init__(
+        self,
+        backend: CacheBackend,
+        version_source: VersionSource,
+        ttl: Optional[float] = None,
+    ):
+        self.backend = backend
+        self.version_source = version_source
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    async def versions(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return await self.version_source(tuple(tags))
+
+    async def get_or_load(
+        self,
+        key: str,
+        tags: Iterable[str],
+        loader: Callable[[], Awaitable[Any]],
+        versions: Optional[Tuple[int, ...]] = None,
+    ) -> Any:
+        # 로드 전에 버전을 읽어 두어야 로드 중에 들어온 쓰기를 놓치지 않습니다.
+        if versions is None:
+            versions = await self.versions(tags)
+        entry = self.backend.get(key)
+        if entry is not None and entry[0] == versions:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        value = await loader()
+        self.backend.set(key, (versions, value), ttl=self.ttl)
+        return value
+
+    async def conditional(
+        self,
+        key: str,
+        tags: Iterable[str],
+        loader: Callable[[], Awaitable[Any]],
+        if_none_match: Optional[str] = None,
+    ) -> Tuple[str, Any]:
+        # 버전만 읽어 ETag 를 만들고, 클라이언트가 같은 ETag 를 갖고 있으면 본문을 읽지 않습니다.
+        tags = tuple(tags)
+        versions = await self.versions(tags)
+        etag = make_etag(key, versions)
+        if etag_matches(if_none_match, etag):
+            raise NotModified(etag)
+        return etag, await self.get_or_load(key, tags, loader, versions)
+
+
+# 버전은 DB 트리거가 관리하므로 다른 워커에서 일어난 쓰기도 바로 반영됩니다.
+response_cache = TaggedCache(
+    MemoryCacheBackend(maxsize=RESPONSE_CACHE_SIZE),
+    version_source=AsyncResourceVersionRepository().get_versions,
+    ttl=RESPONSE_CACHE_TTL,
+)
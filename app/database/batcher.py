@@ -0,0 +1,124 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+from app.database.connection import ConnectionPool, pool
+
+WRITE_BATCH = os.environ.get("SUDDEN_ATTACK_WRITE_BATCH", "0") == "1"
+WRITE_BATCH_WINDOW_MS = float(os.environ.get("SUDDEN_ATTACK_WRITE_BATCH_WINDOW_MS", "2"))
+WRITE_BATCH_SIZE = int(os.environ.get("SUDDEN_ATTACK_WRITE_BATCH_SIZE", "256"))
+
+_STOP = object()
+
+
+class WriteBatcher:
+    # 동시에 들어온 쓰기를 모아 하나의 트랜잭션(커밋/fsync 한 번)으로 처리하는 그룹 커밋 스레드입니다.
+    # 각 쓰기는 리포지토리의 동기 메서드이고, 작업 단위 안에서 실행되므로 그 안의 commit() 은 무시됩니다.
+    # 쓰기마다 SAVEPOINT 를 두어 한 건이 실패해도 같은 배치의 다른 쓰기는 커밋됩니다.
+    def __init__(
+        self,
+        pool: ConnectionPool = pool,
+        window: float = WRITE_BATCH_WINDOW_MS / 1000,
+        max_batch: int = WRITE_BATCH_SIZE,
+    ):
+        self.pool = pool
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self.writes = 0
+        self._last_batch = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="sqlite-write-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def submit_sync(self, func: Callable[..., Any], *args: Any) -> Future:
+        if self._thread is None:
+            self._start()
+        future: Future = Future()
+        self._queue.put((func, args, future))
+        return future
+
+    async def submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.wrap_future(self.submit_sync(func, *args))
+
+    def _collect(self, first) -> Tuple[List, bool]:
+        # 이미 큐에 쌓인 쓰기는 모두 같은 배치로 묶습니다. 배치가 직전 배치 크기(최근 동시 쓰기 수)에
+        # 이르지 못했으면 window 까지만 더 기다리므로, 쓰기가 드물 때는 대기 없이 바로 커밋합니다.
+        batch = [first]
+        deadline = time.perf_counter() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter() if len(batch) < self._last_batch else 0
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        self._last_batch = len(batch)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            self._write(batch)
+
+    def _write(self, batch: List) -> None:
+        results = []
+        try:
+            with self.pool.transaction() as conn:
+                for func, args, future in batch:
+                    conn.execute("SAVEPOINT batch_item")
+                    try:
+                        results.append((future, func(*args), None))
+                        conn.execute("RELEASE batch_item")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO batch_item")
+                        conn.execute("RELEASE batch_item")
+                        results.append((future, None, e))
+        except Exception as e:
+            # BEGIN 이나 COMMIT 이 실패하면 배치 전체가 반영되지 않았으므로 모두에게 알립니다.
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.writes += len(batch)
+        for future, result, error in results:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def close(self) -> None:
+        # 큐에 남은 쓰기를 모두 커밋한 뒤 스레드를 멈춥니다.
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def metrics(self) -> dict:
+        return {
+            "batches": self.batches,
+            "writes": self.writes,
+            "pending": self._queue.qsize(),
+        }
+
+
+write_batcher = WriteBatcher()
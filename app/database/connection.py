@@ -0,0 +1,262 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from app.database.instrument import TimedConnection
+from app.metrics.registry import METRICS_ENABLED
+
+DATABASE_PATH = os.environ.get("SUDDEN_ATTACK_DB", "sudden-attack.db")
+POOL_SIZE = int(os.environ.get("SUDDEN_ATTACK_DB_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.environ.get("SUDDEN_ATTACK_DB_POOL_TIMEOUT", "5"))
+DB_PROFILE = os.environ.get("SUDDEN_ATTACK_DB_PROFILE", "wal")
+# 커넥션마다 유지하는 준비된 문장(prepared statement) 캐시 크기
+CACHED_STATEMENTS = int(os.environ.get("SUDDEN_ATTACK_DB_CACHED_STATEMENTS", "256"))
+
+# 커넥션을 열 때마다 적용하는 PRAGMA 묶음입니다. 외래 키는 모든 프로필에서 켭니다.
+PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    # sqlite 기본값: 롤백 저널, 커밋마다 fsync, 쓰는 동안 읽기도 막힘
+    "default": {
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # WAL: 읽기와 쓰기가 서로 막지 않고, fsync 는 체크포인트 때만 합니다.
+    # synchronous=NORMAL 은 전원이 꺼지면 마지막 커밋 몇 개를 잃을 수 있지만 DB 가 깨지지는 않습니다.
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    # WAL 이지만 커밋마다 fsync 해서 커밋 유실도 허용하지 않습니다.
+    "wal-durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+}
+
+
+def profile_pragmas(profile: str, overrides: Optional[str] = None) -> Dict[str, Union[str, int]]:
+    # overrides 는 "mmap_size=0,cache_size=-2000" 형식으로 프로필 값을 덮어씁니다.
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown database profile: {profile}")
+    pragmas = dict(PROFILES[profile])
+    for item in filter(None, (overrides or "").split(",")):
+        name, _, value = item.partition("=")
+        pragmas[name.strip()] = value.strip()
+    return pragmas
+
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
+class UnitOfWork:
+    # 작업 단위(트랜잭션) 안에서 리포지토리에 넘겨지는 커넥션입니다.
+    # 리포지토리가 부르는 commit()/rollback() 은 무시하고, 작업 단위를 연 쪽이 한 번만 커밋합니다.
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        # 커밋이 끝난 뒤 실행할 콜백(캐시 무효화 등)
+        self.after_commit: List[Callable[[], None]] = []
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        database: str = DATABASE_PATH,
+        size: int = POOL_SIZE,
+        timeout: float = POOL_TIMEOUT,
+        profile: str = DB_PROFILE,
+    ):
+        self.database = database
+        self.size = size
+        self.timeout = timeout
+        self.profile = profile
+        self.pragmas = profile_pragmas(
+            profile, os.environ.get("SUDDEN_ATTACK_DB_PRAGMAS")
+        )
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(size)
+        self._created = 0
+        self._lock = threading.Lock()
+        # 커넥션 반납을 기다린 횟수/시간과 시간 초과 횟수
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        # 현재 실행 컨텍스트(요청)에서 체크아웃한 커넥션
+        self._current: ContextVar[Optional[sqlite3.Connection]] = ContextVar(
+            f"current_connection_{id(self)}", default=None
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.database,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+            factory=TimedConnection if METRICS_ENABLED else sqlite3.Connection,
+        )
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # 풀 크기에 여유가 있으면 새 커넥션을 만들고, 아니면 반납을 기다립니다.
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+        if can_create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            with self._lock:
+                self.timeouts += 1
+            raise PoolTimeoutError(
+                f"No database connection available within {self.timeout}s"
+            )
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds += time.perf_counter() - started
+        return conn
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        # 커밋되지 않은 트랜잭션은 다음 사용자에게 넘기지 않습니다.
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        # 같은 컨텍스트 안에서 중첩 호출되면 이미 체크아웃한 커넥션을 재사용합니다.
+        current = self._current.get()
+        if current is not None:
+            yield current
+            return
+
+        conn = self.acquire()
+        token = self._current.set(conn)
+        try:
+            yield conn
+        finally:
+            self._current.reset(token)
+            self.release(conn)
+
+    @contextmanager
+    def unmanaged(self) -> Iterator[sqlite3.Connection]:
+        # 마이그레이션처럼 시작할 때 한 번만 쓰는 커넥션입니다. 풀에 넣지 않고 쿼리 지표도 남기지 않습니다.
+        conn = sqlite3.connect(self.database)
+        try:
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value}")
+            yield conn
+        finally:
+            conn.close()
+
+    def current(self) -> Optional[sqlite3.Connection]:
+        return self._current.get()
+
+    def bind(self, conn: sqlite3.Connection):
+        return self._current.set(conn)
+
+    def unbind(self, token) -> None:
+        self._current.reset(token)
+
+    def begin(self, immediate: bool = True) -> UnitOfWork:
+        # BEGIN IMMEDIATE 는 시작할 때 쓰기 잠금을 잡아, 조회 후 쓰기 사이에 다른 쓰기가 끼지 못하게 합니다.
+        conn = self.acquire()
+        try:
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        except Exception:
+            self.release(conn)
+            raise
+        return UnitOfWork(conn)
+
+    def finish(self, unit: UnitOfWork, commit: bool) -> None:
+        try:
+            if commit:
+                unit.conn.commit()
+        finally:
+            self.release(unit.conn)
+        if commit:
+            for callback in unit.after_commit:
+                callback()
+
+    @contextmanager
+    def transaction(self, immediate: bool = True) -> Iterator[UnitOfWork]:
+        # 이미 열린 작업 단위가 있으면 그 안에 합류합니다.
+        current = self._current.get()
+        if isinstance(current, UnitOfWork):
+            yield current
+            return
+
+        unit = self.begin(immediate)
+        token = self._current.set(unit)
+        committed = False
+        try:
+            yield unit
+            committed = True
+        finally:
+            self._current.reset(token)
+            self.finish(unit, committed)
+
+    def warm(self, calls: Iterable[Callable[[], object]] = ()) -> int:
+        # 풀 크기만큼 커넥션을 미리 열고, 각 커넥션에서 calls 를 한 번씩 실행해
+        # 자주 쓰는 쿼리를 준비된 문장 캐시에 올려 둡니다.
+        conns = [self.acquire() for _ in range(self.size)]
+        try:
+            for conn in conns:
+                token = self.bind(conn)
+                try:
+                    for call in calls:
+                        call()
+                finally:
+                    self.unbind(token)
+        finally:
+            for conn in conns:
+                self.release(conn)
+        return len(conns)
+
+    def close(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+pool = ConnectionPool()
@@ -0,0 +1,20 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.database.connection import pool
+
+T = TypeVar("T")
+
+# 커넥션 풀 크기만큼만 스레드를 두어 스레드가 커넥션을 기다리며 쌓이지 않게 합니다.
+executor = ThreadPoolExecutor(max_workers=pool.size, thread_name_prefix="sqlite")
+
+
+async def run_sync(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    # 동기 리포지토리 호출을 이벤트 루프 밖에서 실행합니다.
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await loop.run_in_executor(executor, call)
@@ -0,0 +1,99 @@
+import functools
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import time
+from typing import Optional
+
+from app.metrics.registry import slow_queries, sql_query_duration
+
+# 이 시간(ms) 이상 걸린 문장은 실행 계획과 함께 로그로 남깁니다. 0 이면 끕니다.
+SLOW_QUERY_MS = float(os.environ.get("SUDDEN_ATTACK_SLOW_QUERY_MS", "100"))
+
+logger = logging.getLogger("app.database.slow_query")
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE)\s+['\"`]?(\w+)", re.IGNORECASE)
+_EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+# 마이그레이션과 커넥션 설정에서만 실행되는 문장은 요청 쿼리 지표에 넣지 않습니다.
+_UNLABELED = ("create", "drop", "alter", "pragma")
+
+
+@functools.lru_cache(maxsize=1024)
+def query_name(sql: str) -> Optional[str]:
+    # "select group_member 1a2b3c4d" 처럼 동사, 첫 테이블, 정규화한 SQL 의 해시로 이름을 붙입니다.
+    # IN (?, ?, ...) 목록은 길이와 상관없이 같은 이름이 되도록 접습니다. DDL 과 PRAGMA 는 None 입니다.
+    normalized = _SPACE.sub(" ", _IN_LIST.sub("(?...)", sql)).strip()
+    verb = normalized.split(" ", 1)[0].lower()
+    if verb in _UNLABELED:
+        return None
+    match = _TABLE.search(normalized)
+    table = match.group(1) if match else "-"
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:8]
+    return f"{verb} {table} {digest}"
+
+
+def _record(conn: sqlite3.Connection, sql: str, parameters, elapsed: float) -> None:
+    name = query_name(sql)
+    if name is None:
+        return
+    sql_query_duration.observe(elapsed, query=name)
+    if SLOW_QUERY_MS <= 0 or elapsed * 1000 < SLOW_QUERY_MS:
+        return
+    slow_queries.inc(query=name)
+    plan = []
+    if name.split(" ", 1)[0] in _EXPLAINABLE:
+        try:
+            # 파라미터 값은 로그에 남기지 않고 실행 계획을 만드는 데만 씁니다.
+            rows = sqlite3.Connection.execute(conn, "EXPLAIN QUERY PLAN " + sql, parameters)
+            plan = [row[-1] for row in rows]
+        except sqlite3.Error as e:
+            plan = [f"(plan unavailable: {e})"]
+    logger.warning(
+        "slow query %s took %.1f ms: %s\n    %s",
+        name,
+        elapsed * 1000,
+        " ".join(sql.split()),
+        "\n    ".join(plan),
+    )
+
+
+class TimedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record(self.connection, sql, parameters, time.perf_counter() - started)
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            first = seq_of_parameters[0] if seq_of_parameters else ()
+            _record(self.connection, sql, first, time.perf_counter() - started)
+
+
+class TimedConnection(sqlite3.Connection):
+    # 리포지토리가 쓰는 cursor()/execute() 와 COMMIT(fsync 포함) 시간을 기록합니다.
+    # SELECT 는 첫 행까지 읽는 시간만 포함되고, 나머지 fetch 시간은 포함되지 않습니다.
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            sql_query_duration.observe(time.perf_counter() - started, query="commit")
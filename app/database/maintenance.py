@@ -0,0 +1,128 @@
+"""DB 유지보수 명령.
+
+    python -m app.database.maintenance recount-members
+    python -m app.database.maintenance churn-check [--operations 2000]
+
+recount-members 는 group.member_count 를 실제 멤버 수로 다시 맞추고,
+churn-check 는 빈 DB에서 무작위로 가입/승인/거절/탈퇴/강퇴/삭제를 반복한 뒤
+카운터가 실제 멤버 수와 같은지 확인합니다.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+
+from app.database.connection import ConnectionPool
+from app.database.migrations import migrate
+
+
+def member_count_drift(conn: sqlite3.Connection):
+    return conn.execute(
+        """
+        SELECT g.id, g.member_count, (
+            SELECT COUNT(*)
+            FROM group_member gm
+            WHERE gm.group_id = g.id
+                AND gm.role != 'PENDING'
+        ) AS actual
+        FROM 'group' g
+        WHERE g.member_count != actual
+        """
+    ).fetchall()
+
+
+def recount_members() -> int:
+    from app.group.repository.repository import GroupRepository
+
+    fixed = GroupRepository().recount_member_counts()
+    print(f"recounted {fixed} group(s)")
+    return 0
+
+
+def churn_check(operations: int, seed: int) -> int:
+    from app.group.repository.repository import GroupRepository
+    from app.group.dto.dto import GroupCreate, AdminUser
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        database = os.path.join(workdir, "churn.db")
+        conn = sqlite3.connect(database)
+        migrate(conn)
+        users = list(range(1, 21))
+        conn.executemany(
+            "INSERT INTO user (id, username, nickname, email, password) VALUES (?, ?, ?, ?, '')",
+            [(user, f"churn{user}", f"churn{user}", f"churn{user}@example.com") for user in users],
+        )
+        conn.commit()
+
+        repository = GroupRepository()
+        repository.pool = ConnectionPool(database, size=1)
+        groups = []
+        for i in range(5):
+            created = repository.create_group(
+                GroupCreate(name=f"churn-{i}", description="churn", created_at="2024-01-01T00:00:00"),
+                rng.choice(users),
+            )
+            groups.append(created.id)
+
+        for i in range(operations):
+            rows = conn.execute("SELECT id, user_id, group_id, role FROM group_member").fetchall()
+            pending = [row for row in rows if row[3] == "PENDING"]
+            members = [row for row in rows if row[3] != "PENDING"]
+            action = rng.choice(
+                ["join", "join", "approve", "deny", "withdraw", "remove", "promote", "demote", "group"]
+            )
+            if action == "join" and groups:
+                repository.study_group_join_request(rng.choice(users), rng.choice(groups))
+            elif action == "approve" and pending:
+                repository.add_member(rng.choice(pending)[0])
+            elif action == "deny" and pending:
+                repository.deny_request(rng.choice(pending)[0])
+            elif action == "withdraw" and members:
+                row = rng.choice(members)
+                repository.group_withdrawal(row[2], row[1])
+            elif action == "remove" and members:
+                row = rng.choice(members)
+                repository.remove_member(AdminUser(role="ADMIN", group_id=row[2], user_id=row[1]))
+            elif action == "promote" and members:
+                row = rng.choice(members)
+                repository.change_member_role_to_admin(row[2], row[1])
+            elif action == "demote" and members:
+                row = rng.choice(members)
+                repository.change_member_role_to_member(row[2], row[1])
+            elif action == "group":
+                if groups and rng.random() < 0.3:
+                    repository.delete_group(groups.pop(rng.randrange(len(groups))))
+                else:
+                    created = repository.create_group(
+                        GroupCreate(name=f"churn-{i}-{len(groups)}", description="churn", created_at="2024-01-01T00:00:00"),
+                        rng.choice(users),
+                    )
+                    groups.append(created.id)
+
+        drift = member_count_drift(conn)
+        repository.pool.close()
+        conn.close()
+
+    for group_id, stored, actual in drift:
+        print(f"group {group_id}: member_count={stored}, actual={actual}")
+    if drift:
+        return 1
+    print(f"OK: member_count matches after {operations} operations (seed {seed})")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("recount-members")
+    churn = commands.add_parser("churn-check")
+    churn.add_argument("--operations", type=int, default=2000)
+    churn.add_argument("--seed", type=int, default=random.randrange(1 << 30))
+    args = parser.parse_args()
+
+    if args.command == "recount-members":
+        sys.exit(recount_members())
+    sys.exit(churn_check(args.operations, args.seed))
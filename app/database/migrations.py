@@ -0,0 +1,317 @@
+import sqlite3
+from typing import List, Tuple
+
+
+def _bump(resource: str) -> str:
+    # 트리거 안에서 리소스 버전을 1 올립니다. 처음 바뀌는 리소스는 1부터 시작합니다.
+    return f"""
+        INSERT INTO resource_version (name, version) VALUES ({resource}, 1)
+        ON CONFLICT (name) DO UPDATE SET version = version + 1;
+    """
+
+
+# (버전, 설명, SQL 목록). 버전은 PRAGMA user_version 에 기록되며 순서대로 한 번씩만 적용됩니다.
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (
+        1,
+        "initial schema",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS `category` (
+                `id` INTEGER PRIMARY KEY AUTOINCREMENT,
+                `type` TEXT,
+                `name` TEXT NOT NULL
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "occupation" (
+                "id" INTEGER NOT NULL,
+                "occupation_name" TEXT NOT NULL UNIQUE,
+                PRIMARY KEY("id" AUTOINCREMENT)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "user" (
+                "id" INTEGER,
+                "username" TEXT NOT NULL,
+                "nickname" TEXT NOT NULL UNIQUE,
+                "email" TEXT NOT NULL UNIQUE,
+                "password" TEXT NOT NULL,
+                "occupation_id" INTEGER,
+                "created_at" DATETIME DEFAULT CURRENT_TIMESTAMP,
+                "modified_at" DATETIME DEFAULT NULL,
+                "deleted_at" DATETIME DEFAULT NULL,
+                "refresh_token" TEXT DEFAULT NULL,
+                activate INTEGER DEFAULT 1,
+                FOREIGN KEY("occupation_id") REFERENCES "occupation"("id"),
+                PRIMARY KEY("id" AUTOINCREMENT)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "group" (
+                "id" INTEGER NOT NULL,
+                "name" TEXT NOT NULL UNIQUE,
+                "description" TEXT NOT NULL,
+                "created_at" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY("id" AUTOINCREMENT)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "board" (
+                "id" INTEGER,
+                "category_type" TEXT,
+                "title" TEXT NOT NULL,
+                "content" TEXT,
+                "user_id" INTEGER,
+                "category_id" INTEGER,
+                "status" TEXT DEFAULT 'UNRESOLVED',
+                "created_at" DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY("user_id") REFERENCES "user"("id") ON DELETE CASCADE,
+                PRIMARY KEY("id" AUTOINCREMENT),
+                FOREIGN KEY("category_id") REFERENCES "category"("id"),
+                FOREIGN KEY("category_type") REFERENCES "category"("type")
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "board_comment" (
+                "id" INTEGER NOT NULL,
+                "content" TEXT NOT NULL,
+                "user_id" INTEGER NOT NULL,
+                "board_id" INTEGER NOT NULL,
+                "created_at" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY("board_id") REFERENCES "board"("id"),
+                PRIMARY KEY("id" AUTOINCREMENT),
+                FOREIGN KEY("user_id") REFERENCES "user"("id") ON DELETE CASCADE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS "group_member" (
+                "id" INTEGER,
+                "user_id" INTEGER NOT NULL,
+                "group_id" INTEGER NOT NULL,
+                "role" TEXT NOT NULL DEFAULT 'PENDING',
+                "created_at" DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY("id" AUTOINCREMENT),
+                FOREIGN KEY("group_id") REFERENCES "group"("id") ON DELETE CASCADE,
+                FOREIGN KEY("user_id") REFERENCES "user"("id")
+            )
+            """,
+        ],
+    ),
+    (
+        2,
+        "secondary indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_group_member_user ON group_member (user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_group_member_group_role ON group_member (group_id, role)",
+            "CREATE INDEX IF NOT EXISTS idx_group_member_group_user ON group_member (group_id, user_id)",
+            "CREATE INDEX IF NOT EXISTS idx_board_comment_board ON board_comment (board_id)",
+            "CREATE INDEX IF NOT EXISTS idx_board_category_id ON board (category_id)",
+            "CREATE INDEX IF NOT EXISTS idx_board_category_type ON board (category_type)",
+        ],
+    ),
+    (
+        3,
+        "board keyset pagination indexes",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_board_created ON board (created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_board_category_id_created ON board (category_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_board_category_type_created ON board (category_type, created_at, id)",
+            "DROP INDEX IF EXISTS idx_board_category_id",
+            "DROP INDEX IF EXISTS idx_board_category_type",
+        ],
+    ),
+    (
+        4,
+        "group directory full-text search",
+        [
+            # trigram 토크나이저는 한글 이름도 부분 문자열로 검색할 수 있습니다.
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS group_search USING fts5(
+                name, description, content='group', content_rowid='id', tokenize='trigram'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS group_search_ai AFTER INSERT ON "group" BEGIN
+                INSERT INTO group_search (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS group_search_ad AFTER DELETE ON "group" BEGIN
+                INSERT INTO group_search (group_search, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS group_search_au AFTER UPDATE ON "group" BEGIN
+                INSERT INTO group_search (group_search, rowid, name, description)
+                VALUES ('delete', old.id, old.name, old.description);
+                INSERT INTO group_search (rowid, name, description)
+                VALUES (new.id, new.name, new.description);
+            END
+            """,
+            "INSERT INTO group_search (group_search) VALUES ('rebuild')",
+        ],
+    ),
+    (
+        5,
+        "denormalized group member count",
+        [
+            """ALTER TABLE "group" ADD COLUMN member_count INTEGER NOT NULL DEFAULT 0""",
+            """
+            UPDATE "group"
+            SET member_count = (
+                SELECT COUNT(*)
+                FROM group_member gm
+                WHERE gm.group_id = "group".id
+                    AND gm.role != 'PENDING'
+            )
+            """,
+            # 멤버 행이 바뀌는 같은 트랜잭션 안에서 카운터도 함께 갱신됩니다.
+            """
+            CREATE TRIGGER IF NOT EXISTS group_member_count_ai
+            AFTER INSERT ON group_member WHEN new.role != 'PENDING' BEGIN
+                UPDATE "group" SET member_count = member_count + 1 WHERE id = new.group_id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS group_member_count_ad
+            AFTER DELETE ON group_member WHEN old.role != 'PENDING' BEGIN
+                UPDATE "group" SET member_count = member_count - 1 WHERE id = old.group_id;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS group_member_count_au
+            AFTER UPDATE OF role, group_id ON group_member BEGIN
+                UPDATE "group" SET member_count = member_count - 1
+                WHERE id = old.group_id AND old.role != 'PENDING';
+                UPDATE "group" SET member_count = member_count + 1
+                WHERE id = new.group_id AND new.role != 'PENDING';
+            END
+            """,
+        ],
+    ),
+    (
+        6,
+        "comment keyset pagination index",
+        [
+            "CREATE INDEX IF NOT EXISTS idx_board_comment_board_created ON board_comment (board_id, created_at, id)",
+            "DROP INDEX IF EXISTS idx_board_comment_board",
+        ],
+    ),
+    (
+        7,
+        "resource versions for ETags and cache validation",
+        [
+            """
+            CREATE TABLE IF NOT EXISTS resource_version (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            ) WITHOUT ROWID
+            """,
+            *[
+                f"""
+                CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} BEGIN
+                    {"".join(_bump(resource) for resource in resources)}
+                END
+                """
+                for name, event, table, resources in [
+                    ("board_version_ai", "INSERT", "board", ["'boards'", "'board:' || new.id"]),
+                    ("board_version_au", "UPDATE", "board", ["'boards'", "'board:' || old.id", "'board:' || new.id"]),
+                    ("board_version_ad", "DELETE", "board", ["'boards'", "'board:' || old.id", "'comments:' || old.id"]),
+                    ("comment_version_ai", "INSERT", "board_comment", ["'comments:' || new.board_id"]),
+                    ("comment_version_au", "UPDATE", "board_comment", ["'comments:' || old.board_id", "'comments:' || new.board_id"]),
+                    ("comment_version_ad", "DELETE", "board_comment", ["'comments:' || old.board_id"]),
+                    ("group_version_ai", "INSERT", '"group"', ["'groups'"]),
+                    ("group_version_au", "UPDATE", '"group"', ["'groups'"]),
+                    ("group_version_ad", "DELETE", '"group"', ["'groups'"]),
+                    ("user_version_au", "UPDATE OF nickname", "user", ["'nicknames'"]),
+                    ("user_version_ad", "DELETE", "user", ["'nicknames'"]),
+                ]
+            ],
+        ],
+    ),
+    (
+        8,
+        "unique category type so board's foreign key to category(type) resolves",
+        [
+            # 외래 키를 켜면 부모 컬럼이 UNIQUE 가 아닐 때 board 에 대한 모든 쓰기가
+            # "foreign key mismatch" 로 실패합니다.
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_category_type ON category (type)",
+        ],
+    ),
+    (
+        9,
+        "reference version for the in-memory occupation/category cache",
+        [
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_version_{suffix} AFTER {event} ON {table} BEGIN
+                {_bump("'reference'")}
+            END
+            """
+            for table in ("occupation", "category")
+            for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE"))
+        ],
+    ),
+    (
+        10,
+        "rotating refresh token families",
+        [
+            # 가족 하나당 한 행입니다. 만료 시각은 unix 초이며 주기적으로 지웁니다.
+            """
+            CREATE TABLE IF NOT EXISTS token_family (
+                id TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL,
+                revoked INTEGER NOT NULL DEFAULT 0,
+                expires_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_token_family_expires ON token_family (expires_at)",
+            # 이 시각(unix 초) 전에 로그인한 가족은 더 이상 교환할 수 없습니다. 비밀번호를 바꾸면 갱신됩니다.
+            "ALTER TABLE user ADD COLUMN tokens_valid_after REAL DEFAULT NULL",
+        ],
+    ),
+    (
+        11,
+        "default board categories",
+        [
+            # 외래 키를 켠 뒤로는 category 에 없는 (id, type) 으로 게시글을 쓸 수 없습니다.
+            # 배포된 DB 의 category 가 비어 있으면 기본 분류를 넣습니다. 이미 분류가 있으면 건드리지 않습니다.
+            """
+            INSERT INTO category (id, type, name)
+            SELECT id, type, name
+            FROM (
+                SELECT 1 AS id, 'QNA' AS type, '질문' AS name
+                UNION ALL SELECT 2, 'FREE', '자유'
+                UNION ALL SELECT 3, 'STUDY', '스터디'
+            )
+            WHERE NOT EXISTS (SELECT 1 FROM category)
+            """,
+        ],
+    ),
+]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    for version, _, statements in MIGRATIONS:
+        if version <= get_version(conn):
+            continue
+        # 여러 프로세스가 동시에 시작해도 한 번만 적용되도록 쓰기 잠금을 잡고 다시 확인합니다.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= get_version(conn):
+                conn.rollback()
+                continue
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return get_version(conn)
@@ -0,0 +1,25 @@
+import base64
+import json
+from typing import Any, Optional, Sequence
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Sequence[Any]]:
+    # 클라이언트가 보낸 커서는 신뢰할 수 없으므로 형식이 맞지 않으면 ValueError 를 냅니다.
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    # 값은 그대로 SQL 에 바인딩되므로 문자열과 정수만 받습니다(bool 은 int 의 하위 클래스라 따로 거릅니다).
+    if not all(isinstance(value, (str, int)) and not isinstance(value, bool) for value in values):
+        raise ValueError("Invalid cursor")
+    return values
@@ -0,0 +1,210 @@
+"""리포지토리 쿼리의 실행 계획을 검사합니다.
+
+    python -m app.database.query_plan
+
+빈 DB에 마이그레이션을 적용한 뒤 리포지토리 메서드를 차례로 호출하고, 실행된 각 SQL의
+EXPLAIN QUERY PLAN 에 인덱스 없는 SCAN 이 있으면 종료 코드 1로 끝납니다.
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from app.database.connection import ConnectionPool
+from app.database.migrations import migrate
+
+# 의도적으로 테이블 전체를 읽는 호출과 그 이유
+ALLOWED_SCANS: Dict[str, str] = {
+    "group.get_all_groups": "first page walks the table in rowid order up to LIMIT",
+    "group.get_all_groups(short name)": "trigram search needs 3+ characters; LIKE fallback is capped at SHORT_SEARCH_MAX_OFFSET",
+    "reference.load": "loads the whole (tiny) occupation and category tables into memory",
+}
+
+
+def explain(conn: sqlite3.Connection, sql: str, params=()) -> List[str]:
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+    return [row[-1] for row in rows]
+
+
+# 항상 한 행뿐인 원본: 상수 행과 역할 확인용 caller CTE
+ONE_ROW_SCANS = ("SCAN CONSTANT ROW", "SCAN caller")
+
+
+def full_scans(conn: sqlite3.Connection, sql: str, params=()) -> List[str]:
+    # "SCAN t USING INDEX ..." 는 인덱스 순서로, "SCAN t VIRTUAL TABLE INDEX ..." 는
+    # 전문 검색 인덱스로 읽는 경우라 허용합니다.
+    return [
+        detail
+        for detail in explain(conn, sql, params)
+        if detail.startswith("SCAN ")
+        and " USING " not in detail
+        and " VIRTUAL TABLE INDEX " not in detail
+        and detail not in ONE_ROW_SCANS
+    ]
+
+
+class TracingPool(ConnectionPool):
+    def __init__(self, database: str):
+        super().__init__(database, size=1)
+        self.statements: List[str] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = super()._connect()
+        conn.set_trace_callback(self.statements.append)
+        return conn
+
+
+def repository_calls() -> List[Tuple[str, Callable]]:
+    from app.user.dto.dto import User
+    from app.group.dto.dto import GroupCreate, AdminUser
+    from app.board.dto.dto import BoardCreate, BoardUpdate, CommentCreate, CommentUpdate
+    from app.importer.dto.dto import ImportUser, ImportGroup, ImportMember
+
+    user = User(
+        username="plan", nickname="plan", email="plan@example.com",
+        password="plan", occupation=1,
+    )
+    group = GroupCreate(name="plan", description="plan", created_at="2024-01-01T00:00:00")
+    board = BoardCreate(title="plan", content="plan", category_id=1, category_type="QNA")
+    comment = CommentCreate(content="plan")
+    return [
+        ("user.register", lambda r: r.user.register(user, hashed_password="plan")),
+        ("user.get_user_info", lambda r: r.user.get_user_info(user.email)),
+        ("user.update_user_info", lambda r: r.user.update_user_info(user.email, "plan", "plan", "plan")),
+        ("user.update_user_password", lambda r: r.user.update_user_password(user.email, "", hashed_password="plan")),
+        ("user.get_active_user", lambda r: r.user.get_active_user(user.email)),
+        ("user.get_userid_by_email", lambda r: r.user.get_userid_by_email(user.email)),
+        ("token.rotate", lambda r: r.token.rotate("plan1@example.com", "plan", 0, 0.0, 1.0)),
+        ("token.rotate(next)", lambda r: r.token.rotate("plan1@example.com", "plan", 1, 0.0, 1.0)),
+        ("token.rotate(reused)", lambda r: r.token.rotate("plan1@example.com", "plan", 0, 0.0, 1.0)),
+        ("token.revoke", lambda r: r.token.revoke("plan", 1.0)),
+        ("token.sweep", lambda r: r.token.sweep()),
+        ("group.create_group", lambda r: r.group.create_group(group, 1)),
+        ("group.get_user_groups", lambda r: r.group.get_user_groups(1)),
+        ("group.get_member_role", lambda r: r.group.get_member_role(1, 1)),
+        ("group.study_group_join_request", lambda r: r.group.study_group_join_request(2, 1)),
+        ("group.get_member_requests_by_user", lambda r: r.group.get_member_requests_by_user(2)),
+        ("group.get_member_requests", lambda r: r.group.get_member_requests(1)),
+        ("group.add_member", lambda r: r.group.add_member(2)),
+        ("group.add_members", lambda r: r.group.add_members(1, [2, 3])),
+        ("group.get_all_members", lambda r: r.group.get_all_members(1, "ADMIN", 1)),
+        ("group.get_all_members_with_role", lambda r: r.group.get_all_members_with_role(1, 1)),
+        ("group.get_member_requests_as_admin", lambda r: r.group.get_member_requests_as_admin(1, 1)),
+        ("group.get_all_groups", lambda r: r.group.get_all_groups()),
+        ("group.get_all_groups(name)", lambda r: r.group.get_all_groups("plan")),
+        ("group.get_all_groups(short name)", lambda r: r.group.get_all_groups("pl")),
+        ("group.get_all_groups(cursor)", lambda r: r.group.get_all_groups(cursor="WzFd")),
+        ("group.change_member_role_to_admin", lambda r: r.group.change_member_role_to_admin(1, 2)),
+        ("group.change_member_role_to_member", lambda r: r.group.change_member_role_to_member(1, 2)),
+        ("group.remove_member", lambda r: r.group.remove_member(AdminUser(role="ADMIN", group_id=1, user_id=2))),
+        ("group.group_withdrawal", lambda r: r.group.group_withdrawal(1, 2)),
+        ("group.deny_request", lambda r: r.group.deny_request(2)),
+        ("group.deny_requests", lambda r: r.group.deny_requests(1, [2, 3])),
+        ("board.create_board", lambda r: r.board.create_board(board, 1)),
+        ("board.get_board", lambda r: r.board.get_board(1)),
+        ("board.get_boards", lambda r: r.board.get_boards()),
+        ("board.get_boards(category)", lambda r: r.board.get_boards(1, "QNA")),
+        ("board.get_boards(cursor)", lambda r: r.board.get_boards(cursor="WyIyMDI0LTAxLTAxIiwxXQ")),
+        ("board.update_board", lambda r: r.board.update_board(1, BoardUpdate(**board.model_dump()), 1)),
+        ("board.create_comment", lambda r: r.board.create_comment(1, comment, 1)),
+        ("board.get_comments", lambda r: r.board.get_comments(1)),
+        ("board.get_comments(cursor)", lambda r: r.board.get_comments(1, cursor="WyIyMDI0LTAxLTAxIiwxXQ")),
+        ("board.get_board_with_comments", lambda r: r.board.get_board_with_comments(1)),
+        ("board.export_boards", lambda r: r.board.export_boards()),
+        ("board.export_boards(filters)", lambda r: r.board.export_boards(
+            1, None, datetime(2024, 1, 1), datetime(2024, 2, 1), after=("2024-01-01 00:00:00", 1),
+        )),
+        ("board.export_boards(category type)", lambda r: r.board.export_boards(category_type="QNA")),
+        ("board.export_comments", lambda r: r.board.export_comments()),
+        ("board.export_comments(filters)", lambda r: r.board.export_comments(
+            None, "QNA", datetime(2024, 1, 1), datetime(2024, 2, 1), after=1,
+        )),
+        ("board.update_comment", lambda r: r.board.update_comment(1, CommentUpdate(content="plan"), 1)),
+        ("board.delete_comment", lambda r: r.board.delete_comment(1, 1)),
+        ("board.delete_board", lambda r: r.board.delete_board(1, 1)),
+        ("reference.load", lambda r: r.reference.load()),
+        ("reference.refresh_if_changed", lambda r: r.reference.refresh_if_changed()),
+        ("importer.import_chunk", lambda r: r.importer.import_chunk(
+            [(1, ImportUser(username="import", nickname="import", email="import@example.com", password="", occupation="1"), 1, "plan")],
+            [(2, ImportGroup(name="import", admin="import@example.com"))],
+            [(3, ImportMember(group="import", email="plan2@example.com"))],
+        )),
+        ("group.delete_group_as_admin", lambda r: r.group.delete_group_as_admin(1, 2)),
+        ("group.delete_group", lambda r: r.group.delete_group(1)),
+    ]
+
+
+def check() -> List[Tuple[str, str, List[str]]]:
+    from app.user.repository.repository import UserRepository
+    from app.group.repository.repository import GroupRepository
+    from app.board.repository.repository import BoardRepository
+    from app.importer.repository.repository import ImportRepository
+    from app.user.repository.token import TokenRepository
+    from app.database.reference import ReferenceCache
+
+    class Repositories:
+        pass
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database = os.path.join(workdir, "plan.db")
+        conn = sqlite3.connect(database)
+        migrate(conn)
+        conn.execute("INSERT INTO occupation (occupation_name) VALUES ('plan')")
+        conn.execute("INSERT OR IGNORE INTO category (type, name) VALUES ('QNA', 'plan')")
+        # 외래 키가 켜져 있으므로 호출들이 참조하는 사용자 1, 2 를 미리 만듭니다.
+        conn.executemany(
+            "INSERT INTO user (id, username, nickname, email, password, occupation_id)"
+            " VALUES (?, ?, ?, ?, '', 1)",
+            [(i, f"plan{i}", f"plan{i}", f"plan{i}@example.com") for i in (1, 2)],
+        )
+        conn.commit()
+
+        tracing_pool = TracingPool(database)
+        repositories = Repositories()
+        repositories.user = UserRepository()
+        repositories.group = GroupRepository()
+        repositories.board = BoardRepository()
+        repositories.importer = ImportRepository()
+        repositories.token = TokenRepository()
+        repositories.reference = ReferenceCache()
+        for repository in (
+            repositories.user, repositories.group, repositories.board,
+            repositories.importer, repositories.token, repositories.reference,
+        ):
+            repository.pool = tracing_pool
+        # 리포지토리는 모듈 전역 참조 데이터 대신 추적 풀로 읽는 캐시를 씁니다.
+        for repository in (repositories.user, repositories.group, repositories.board):
+            repository.reference = repositories.reference
+        # 서버처럼 시작할 때 한 번 읽어 두어, 첫 호출이 참조 데이터를 읽는 SQL 이 섞이지 않게 합니다.
+        repositories.reference.load()
+
+        offenders = []
+        for label, call in repository_calls():
+            del tracing_pool.statements[:]
+            call(repositories)
+            if label in ALLOWED_SCANS:
+                continue
+            for statement in list(tracing_pool.statements):
+                keyword = statement.lstrip().split(None, 1)[0].upper()
+                if keyword not in ("SELECT", "UPDATE", "DELETE", "INSERT", "WITH"):
+                    continue
+                # FTS5 가 내부 테이블에 실행하는 쿼리는 검사 대상이 아닙니다.
+                if "'main'." in statement:
+                    continue
+                scans = full_scans(conn, statement)
+                if scans:
+                    offenders.append((label, " ".join(statement.split()), scans))
+        tracing_pool.close()
+        conn.close()
+    return offenders
+
+
+if __name__ == "__main__":
+    offenders = check()
+    for label, statement, scans in offenders:
+        print(f"{label}: {'; '.join(scans)}\n    {statement}")
+    if offenders:
+        sys.exit(1)
+    print("OK: no repository query falls back to a full table scan")
@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, NamedTuple, Optional
+
+from app.database.connection import pool
+from app.database.executor import run_sync
+
+# 다른 워커/명령이 occupation/category 를 바꿨는지 확인하는 주기(초). 0 이면 확인하지 않습니다.
+REFERENCE_REFRESH_SECONDS = float(os.environ.get("SUDDEN_ATTACK_REFERENCE_REFRESH", "30"))
+# occupation/category 트리거가 올리는 resource_version 이름
+REFERENCE_VERSION = "reference"
+
+logger = logging.getLogger("app.database")
+
+
+class ReferenceData(NamedTuple):
+    # 한 번 만든 뒤에는 바꾸지 않는 스냅숏입니다. 새로 읽으면 통째로 교체합니다.
+    version: int
+    occupations: Mapping[int, str]
+    occupation_ids: Mapping[str, int]
+    categories: Mapping[int, str]
+    category_types: FrozenSet[str]
+
+
+class ReferenceCache:
+    # occupation / category 는 작고 거의 바뀌지 않으므로 메모리에 올려 두고 SQL 없이 검증/변환합니다.
+    def __init__(self):
+        self.pool = pool
+        self._data: Optional[ReferenceData] = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def load(self) -> ReferenceData:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT version FROM resource_version WHERE name = ?", (REFERENCE_VERSION,)
+            )
+            version = cursor.fetchone()
+            cursor.execute("SELECT id, occupation_name FROM occupation")
+            occupations = dict(cursor.fetchall())
+            cursor.execute("SELECT id, type FROM category")
+            categories = dict(cursor.fetchall())
+        data = ReferenceData(
+            version=version[0] if version else 0,
+            occupations=MappingProxyType(occupations),
+            occupation_ids=MappingProxyType({name: id for id, name in occupations.items()}),
+            categories=MappingProxyType(categories),
+            category_types=frozenset(categories.values()),
+        )
+        with self._lock:
+            self._data = data
+            self.reloads += 1
+        return data
+
+    def current(self) -> ReferenceData:
+        data = self._data
+        if data is None:
+            return self.load()
+        return data
+
+    def refresh_if_changed(self) -> ReferenceData:
+        # 버전 한 행만 읽어 보고 바뀌었을 때만 다시 읽습니다.
+        data = self._data
+        if data is None:
+            return self.load()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT version FROM resource_version WHERE name = ?", (REFERENCE_VERSION,)
+            )
+            version = cursor.fetchone()
+        if (version[0] if version else 0) != data.version:
+            return self.load()
+        return data
+
+    def occupation_name(self, occupation_id: Optional[int]) -> Optional[str]:
+        # 모르는 값은 방금 추가된 것일 수 있으므로 버전을 확인하고 한 번 더 찾습니다.
+        name = self.current().occupations.get(occupation_id)
+        if name is None and occupation_id is not None:
+            name = self.refresh_if_changed().occupations.get(occupation_id)
+        return name
+
+    def occupation_id(self, occupation_name: str) -> Optional[int]:
+        occupation_id = self.current().occupation_ids.get(occupation_name)
+        if occupation_id is None:
+            occupation_id = self.refresh_if_changed().occupation_ids.get(occupation_name)
+        return occupation_id
+
+    def has_category(self, category_id: int, category_type: str) -> bool:
+        # board 의 두 외래 키(category.id, category.type)가 모두 있는지 확인합니다.
+        data = self.current()
+        if category_id not in data.categories or category_type not in data.category_types:
+            data = self.refresh_if_changed()
+        return category_id in data.categories and category_type in data.category_types
+
+    async def watch(self, interval: float = REFERENCE_REFRESH_SECONDS) -> None:
+        # 다른 워커나 명령이 표를 바꾸면 interval 안에 반영합니다.
+        while interval > 0:
+            await asyncio.sleep(interval)
+            try:
+                await run_sync(self.refresh_if_changed)
+            except Exception:
+                # 확인에 실패해도 지금 스냅숏으로 계속 서비스하고 다음 주기에 다시 시도합니다.
+                logger.exception("reference data refresh failed")
+
+
+reference_data = ReferenceCache()
@@ -0,0 +1,20 @@
+from typing import Any, Dict, List, Sequence, Type
+
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import TypedDict
+
+
+def row_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    # model 과 같은 필드/타입을 가진 TypedDict 목록의 어댑터입니다. 문자열 날짜 파싱 같은 검증은
+    # pydantic-core 가 목록 전체에 대해 한 번에 처리하고, 결과는 모델 인스턴스가 아닌 dict 입니다.
+    row_type = TypedDict(
+        f"{model.__name__}Row",
+        {name: field.annotation for name, field in model.model_fields.items()},
+    )
+    return TypeAdapter(List[row_type])
+
+
+def as_dicts(description: Sequence[tuple], rows: Sequence[tuple]) -> List[Dict[str, Any]]:
+    # cursor.description 의 컬럼 이름을 키로 씁니다. SELECT 의 컬럼 이름은 DTO 필드 이름과 같아야 합니다.
+    columns = [column[0] for column in description]
+    return [dict(zip(columns, row)) for row in rows]
@@ -0,0 +1,19 @@
+from typing import Any, Callable, TypeVar
+
+from app.database.connection import pool
+from app.database.executor import run_sync
+
+T = TypeVar("T")
+
+
+def _in_transaction(func: Callable[..., T], immediate: bool, args: tuple) -> T:
+    with pool.transaction(immediate):
+        return func(*args)
+
+
+async def run_in_transaction(func: Callable[..., T], *args: Any, immediate: bool = True) -> T:
+    # 서비스의 조회-확인-쓰기를 동기 함수 하나로 묶어 executor 스레드 하나에서 한 트랜잭션으로 실행합니다.
+    # func 안의 리포지토리 호출은 모두 같은 커넥션/트랜잭션을 씁니다.
+    # 쓰기 잠금을 잡은 동안 await 하지 않으므로, 잠금을 가진 작업이 잠금을 기다리는 다른 쓰기 뒤에서
+    # executor 스레드를 기다리는 일이 생기지 않습니다.
+    return await run_sync(_in_transaction, func, immediate, args)
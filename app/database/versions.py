@@ -0,0 +1,34 @@
+from typing import Sequence, Tuple
+
+from app.database.connection import pool
+from app.database.executor import run_sync
+
+
+class ResourceVersionRepository:
+    # resource_version 은 board/board_comment/group/user 트리거가 쓰기마다 올리는 버전 표입니다.
+    def __init__(self):
+        self.pool = pool
+
+    def get_versions(self, names: Sequence[str]) -> Tuple[int, ...]:
+        if not names:
+            return ()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT name, version
+                FROM resource_version
+                WHERE name IN ({", ".join("?" * len(names))})
+                """,
+                tuple(names),
+            )
+            found = dict(cursor.fetchall())
+        return tuple(found.get(name, 0) for name in names)
+
+
+class AsyncResourceVersionRepository:
+    def __init__(self, version_repository: ResourceVersionRepository = None):
+        self.version_repository = version_repository or ResourceVersionRepository()
+
+    async def get_versions(self, names: Sequence[str]) -> Tuple[int, ...]:
+        return await run_sync(self.version_repository.get_versions, tuple(names))
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class Group(BaseModel):
@@ -10,6 +10,15 @@ class Group(BaseModel):
     created_at: datetime
 
 
+class GroupSummary(Group):
+    member_count: int
+
+
+class GroupPage(BaseModel):
+    items: List[GroupSummary]
+    next_cursor: Optional[str] = None
+
+
 class GroupCreate(BaseModel):
     name: str
     description: str
@@ -29,6 +38,17 @@ class MemberRequestsView(BaseModel):
     created_at: Optional[str] = None
 
 
+class MemberRequestBatch(BaseModel):
+    group_id: int
+    request_ids: List[int] = Field(min_length=1, max_length=1000)
+
+
+class MemberRequestOutcome(BaseModel):
+    request_id: int
+    # approved / denied / not_found (해당 그룹의 PENDING 요청이 아님)
+    status: str
+
+
 class AllMembers(BaseModel):
     id: int
     nickname: str
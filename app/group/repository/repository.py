@@ -5,148 +5,208 @@ from app.group.dto.dto import (
     MemberRequestsView,
     AllMembers,
     AdminUser,
+    GroupSummary,
+    GroupPage,
+    MemberRequestOutcome,
 )
 from app.user.dto.dto import UserID
+from app.cache.lru import LRUCache
+from app.database.connection import pool, UnitOfWork
+from app.database.reference import reference_data
+from app.database.pagination import encode_cursor, decode_cursor
+from app.database.executor import run_sync
+from app.database.rows import row_adapter, as_dicts
+import os
 from datetime import datetime
-from typing import List, Optional
-import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+ROLE_CACHE_SIZE = int(os.environ.get("ROLE_CACHE_SIZE", "10000"))
+ROLE_CACHE_TTL = float(os.environ.get("ROLE_CACHE_TTL", "10"))
+# 3글자 미만 검색은 인덱스 없이 LIKE 로 훑으므로 OFFSET 을 이 값까지만 허용합니다.
+SHORT_SEARCH_MAX_OFFSET = int(os.environ.get("GROUP_SHORT_SEARCH_MAX_OFFSET", "200"))
+
+# (group_id, user_id) -> 역할. 같은 프로세스의 쓰기는 즉시 지우고,
+# 다른 워커 프로세스의 쓰기는 TTL 이 지나야 반영되므로 TTL 을 짧게 둡니다.
+role_cache = LRUCache(maxsize=ROLE_CACHE_SIZE, ttl=ROLE_CACHE_TTL)
+# 멤버가 아닌 경우도 캐시하기 위한 값
+_NO_ROLE = ""
+
+# 목록 조회는 행마다 모델을 만들지 않고 dict 목록으로 한 번에 검증합니다.
+group_rows = row_adapter(Group)
+member_request_rows = row_adapter(MemberRequestsView)
 
 
 class GroupRepository:
     def __init__(self):
-        self.conn = sqlite3.connect("sudden-attack.db", check_same_thread=False)
-        self.cursor = self.conn.cursor()
+        self.pool = pool
+        self.reference = reference_data
+
+    def _invalidate_roles(self, conn, keys: Iterable[Tuple[int, int]]) -> None:
+        # 작업 단위 안이라면 커밋 후에 한 번 더 지워, 커밋 전 값을 다른 요청이 다시 캐시하지 못하게 합니다.
+        keys = list(keys)
+        for key in keys:
+            role_cache.delete(key)
+        if isinstance(conn, UnitOfWork):
+            conn.after_commit.append(lambda: [role_cache.delete(key) for key in keys])
+
+    def _with_occupation_names(self, description, rows) -> List[dict]:
+        # occupation_name 컬럼에는 occupation_id 가 들어 있으므로 참조 데이터로 이름을 채웁니다.
+        # 직업을 찾을 수 없는 사용자는 예전의 occupation JOIN 처럼 결과에서 뺍니다.
+        items = []
+        for item in as_dicts(description, rows):
+            item["occupation_name"] = self.reference.occupation_name(item["occupation_name"])
+            if item["occupation_name"] is not None:
+                items.append(item)
+        return items
+
+    def _clear_roles(self, conn) -> None:
+        role_cache.clear()
+        if isinstance(conn, UnitOfWork):
+            conn.after_commit.append(role_cache.clear)
 
     def create_group(self, group_create: GroupCreate, user_id: UserID) -> Group:
         # 새로운 그룹을 데이터베이스에 추가합니다.
         created_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
 
-        # 동일한 이름의 그룹이 이미 존재하는지 확인합니다.
-        self.cursor.execute(
-            """
-            SELECT id
-            FROM 'group'
-            WHERE name = ?
-            """,
-            (group_create.name,),
-        )
-        existing_group = self.cursor.fetchone()
+        # 이름 중복 확인과 두 INSERT 를 하나의 쓰기 트랜잭션으로 묶어 동시 생성 경쟁을 막습니다.
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            # 동일한 이름의 그룹이 이미 존재하는지 확인합니다.
+            cursor.execute(
+                """
+                SELECT id
+                FROM 'group'
+                WHERE name = ?
+                """,
+                (group_create.name,),
+            )
+            existing_group = cursor.fetchone()
 
-        if existing_group:
-            # 이미 존재하는 그룹이라면 에러를 발생시킵니다.
-            raise ValueError("A group with the same name already exists.")
+            if existing_group:
+                # 이미 존재하는 그룹이라면 에러를 발생시킵니다.
+                raise ValueError("A group with the same name already exists.")
 
-        # 그룹이 존재하지 않는다면 새로운 그룹을 추가합니다.
-        self.cursor.execute(
-            """
-            INSERT INTO 'group' (name, description, created_at)
-            VALUES (?, ?, ?)
-            """,
-            (group_create.name, group_create.description, created_at),
-        )
-        group_id = self.cursor.lastrowid
+            # 그룹이 존재하지 않는다면 새로운 그룹을 추가합니다.
+            cursor.execute(
+                """
+                INSERT INTO 'group' (name, description, created_at)
+                VALUES (?, ?, ?)
+                """,
+                (group_create.name, group_create.description, created_at),
+            )
+            group_id = cursor.lastrowid
+
+            # 새로운 그룹이 추가되었는지 확인합니다.
+            if group_id is None:
+                # 그룹 추가에 실패한 경우에 대한 처리
+                raise ValueError("Failed to create group")
 
-        # 새로운 그룹이 추가되었는지 확인합니다.
-        if group_id is not None:
             # 그룹 멤버를 추가합니다.
-            self.cursor.execute(
+            cursor.execute(
                 """
                 INSERT INTO group_member (user_id, group_id, role, created_at)
                 VALUES (?, ?, ?, ?)
                 """,
                 (user_id, group_id, "ADMIN", created_at),
             )
-            self.conn.commit()
-
-            # 새로운 그룹을 반환합니다.
-            return Group(
-                id=group_id,
-                name=group_create.name,
-                description=group_create.description,
-                created_at=created_at,
-            )
-        else:
-            # 그룹 추가에 실패한 경우에 대한 처리
-            raise ValueError("Failed to create group")
+            conn.commit()
+            self._invalidate_roles(conn, [(group_id, user_id)])
 
-    def get_user_groups(self, user_id: UserID) -> List[Group]:
-        self.cursor.execute(
-            """
-            SELECT g.id, g.name, g.description, g.created_at
-            FROM group_member gm
-            JOIN 'group' g ON gm.group_id = g.id
-            WHERE gm.user_id = ?
-            """,
-            (user_id,),
+        # 새로운 그룹을 반환합니다.
+        return Group(
+            id=group_id,
+            name=group_create.name,
+            description=group_create.description,
+            created_at=created_at,
         )
-        user_groups = self.cursor.fetchall()
-        groups = []
-        for group in user_groups:
-            groups.append(
-                Group(
-                    id=group[0],
-                    name=group[1],
-                    description=group[2],
-                    created_at=group[3],
-                )
+
+    def get_user_groups(self, user_id: UserID) -> List[dict]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT g.id, g.name, g.description, g.created_at
+                FROM group_member gm
+                JOIN 'group' g ON gm.group_id = g.id
+                WHERE gm.user_id = ?
+                """,
+                (user_id,),
             )
-        return groups
+            user_groups = cursor.fetchall()
+        return group_rows.validate_python(as_dicts(cursor.description, user_groups))
 
     def get_member_role(self, group_id: int, user_id: UserID) -> str:
-        self.cursor.execute(
-            """
-            SELECT role
-            FROM group_member
-            WHERE group_id = ? 
-                AND user_id = ?
-            """,
-            (group_id, user_id),
-        )
-        role = self.cursor.fetchone()
+        # 작업 단위 안에서는 확인 직후 쓰기가 이어지므로 캐시를 거치지 않고 DB 에서 읽습니다.
+        in_unit = isinstance(self.pool.current(), UnitOfWork)
+        if not in_unit:
+            cached = role_cache.get((group_id, user_id))
+            if cached is not None:
+                return cached or None
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT role
+                FROM group_member
+                WHERE group_id = ? 
+                    AND user_id = ?
+                """,
+                (group_id, user_id),
+            )
+            role = cursor.fetchone()
+        if not in_unit:
+            role_cache.set((group_id, user_id), role[0] if role else _NO_ROLE)
         if role:
             return role[0]
         else:
             return None
 
     def delete_group(self, group_id: int):
-        # 외래 키 제약 조건 활성화
-        self.cursor.execute("PRAGMA foreign_keys = ON;")
-        self.cursor.execute(
-            """
-            DELETE
-            FROM 'group'
-            WHERE id = ?
-            """,
-            (group_id,),
-        )
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            # group_member 는 ON DELETE CASCADE 로 함께 지워집니다(외래 키는 커넥션을 열 때 켭니다).
+            cursor.execute(
+                """
+                DELETE
+                FROM 'group'
+                WHERE id = ?
+                """,
+                (group_id,),
+            )
+            conn.commit()
+            self._clear_roles(conn)
 
     def study_group_join_request(self, user_id: UserID, group_id: int):
         created_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-        self.cursor.execute(
-            """
-            INSERT INTO group_member (user_id, group_id, created_at)
-            VALUES (?, ?, ?)
-            """,
-            (user_id, group_id, created_at),
-        )
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO group_member (user_id, group_id, created_at)
+                VALUES (?, ?, ?)
+                """,
+                (user_id, group_id, created_at),
+            )
+            conn.commit()
+            self._invalidate_roles(conn, [(group_id, user_id)])
         return {"message": "Group membership request created successfully"}
 
     def get_member_requests_by_user(
         self, user_id: UserID
     ) -> List[GroupMembershipRequest]:
-        self.cursor.execute(
-            """
-            SELECT g.name, gm.created_at
-            FROM group_member gm
-            JOIN 'group' g ON gm.group_id = g.id
-            WHERE gm.user_id = ? 
-                AND gm.role = 'PENDING'
-            """,
-            (user_id,),
-        )
-        rows = self.cursor.fetchall()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT g.name, gm.created_at
+                FROM group_member gm
+                JOIN 'group' g ON gm.group_id = g.id
+                WHERE gm.user_id = ? 
+                    AND gm.role = 'PENDING'
+                """,
+                (user_id,),
+            )
+            rows = cursor.fetchall()
         requests = []
         for row in rows:
             requests.append(
@@ -154,67 +214,125 @@ class GroupRepository:
             )
         return requests
 
-    def get_member_requests(self, group_id: int) -> List[MemberRequestsView]:
-        self.cursor.execute(
-            """
-            SELECT gm.id, u.username, u.nickname, o.occupation_name, gm.created_at
-            FROM group_member gm
-            JOIN user u ON gm.user_id = u.id
-            JOIN occupation o ON u.occupation_id = o.id
-            WHERE gm.group_id = ? 
-                AND gm.role = 'PENDING'
-            """,
-            (group_id,),
-        )
-        rows = self.cursor.fetchall()
-        requests = []
-        for row in rows:
-            requests.append(
-                MemberRequestsView(
-                    id=row[0],
-                    username=row[1],
-                    nickname=row[2],
-                    occupation_name=row[3],
-                    created_at=row[4],
-                )
+    def get_member_requests(self, group_id: int) -> List[dict]:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT gm.id, u.username, u.nickname, u.occupation_id AS occupation_name, gm.created_at
+                FROM group_member gm
+                JOIN user u ON gm.user_id = u.id
+                WHERE gm.group_id = ? 
+                    AND gm.role = 'PENDING'
+                """,
+                (group_id,),
             )
-        return requests
+            rows = cursor.fetchall()
+        return member_request_rows.validate_python(self._with_occupation_names(cursor.description, rows))
 
     def deny_request(self, request_id: int):
-        self.cursor.execute(
-            """
-            DELETE
-            FROM group_member
-            WHERE id = ?
-            """,
-            (request_id,),
-        )
-        self.conn.commit()
-        return self.cursor.rowcount
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE
+                FROM group_member
+                WHERE id = ?
+                RETURNING group_id, user_id
+                """,
+                (request_id,),
+            )
+            denied = cursor.fetchall()
+            conn.commit()
+            self._invalidate_roles(conn, denied)
+        return len(denied)
 
     def add_member(self, request_id: int):
-        self.cursor.execute(
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE group_member
+                SET role=?, created_at=?
+                WHERE id=?
+                RETURNING group_id, user_id
+                """,
+                ("MEMBER", datetime.now().strftime("%Y-%m-%d %H:%M"), request_id),
+            )
+            added = cursor.fetchall()
+            conn.commit()
+            self._invalidate_roles(conn, added)
+
+    def _moderate_requests(
+        self, group_id: int, request_ids: List[int], statement: str, params, status: str
+    ) -> List[MemberRequestOutcome]:
+        # 요청 목록 전체를 한 트랜잭션(COMMIT 한 번)으로 처리합니다.
+        request_ids = list(dict.fromkeys(request_ids))
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT id, user_id
+                FROM group_member
+                WHERE group_id = ?
+                    AND role = 'PENDING'
+                    AND id IN ({", ".join("?" * len(request_ids))})
+                """,
+                (group_id, *request_ids),
+            )
+            pending = dict(cursor.fetchall())
+            cursor.executemany(
+                statement, [(*params, request_id) for request_id in pending]
+            )
+            self._invalidate_roles(conn, [(group_id, user_id) for user_id in pending.values()])
+        return [
+            MemberRequestOutcome(
+                request_id=request_id,
+                status=status if request_id in pending else "not_found",
+            )
+            for request_id in request_ids
+        ]
+
+    def add_members(self, group_id: int, request_ids: List[int]) -> List[MemberRequestOutcome]:
+        return self._moderate_requests(
+            group_id,
+            request_ids,
             """
             UPDATE group_member
             SET role=?, created_at=?
             WHERE id=?
             """,
-            ("MEMBER", datetime.now().strftime("%Y-%m-%d %H:%M"), request_id),
+            ("MEMBER", datetime.now().strftime("%Y-%m-%d %H:%M")),
+            "approved",
         )
-        self.conn.commit()
 
-    def get_all_members(self, group_id: int, role: str, current_user_id: int):
-        self.cursor.execute(
+    def deny_requests(self, group_id: int, request_ids: List[int]) -> List[MemberRequestOutcome]:
+        return self._moderate_requests(
+            group_id,
+            request_ids,
             """
-            SELECT gm.user_id, u.nickname, gm.role
-            FROM group_member gm
-            JOIN user u ON gm.user_id = u.id
-            WHERE gm.group_id = ? 
-                AND gm.role != 'PENDING'
+            DELETE
+            FROM group_member
+            WHERE id = ?
             """,
-            (group_id,),
+            (),
+            "denied",
         )
-        members = self.cursor.fetchall()
+
+    def get_all_members(self, group_id: int, role: str, current_user_id: int):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT gm.user_id, u.nickname, gm.role
+                FROM group_member gm
+                JOIN user u ON gm.user_id = u.id
+                WHERE gm.group_id = ? 
+                    AND gm.role != 'PENDING'
+                """,
+                (group_id,),
+            )
+            members = cursor.fetchall()
         members_info = []
         for member in members:
             members_info.append(
@@ -226,95 +344,358 @@ class GroupRepository:
         return current_user_id, role, members
 
     def group_withdrawal(self, group_id: int, current_user_id: UserID):
-        self.cursor.execute(
-            """
-            DELETE
-            FROM group_member
-            WHERE user_id = ? 
-                AND group_id = ?
-            """,
-            (current_user_id, group_id),
-        )
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE
+                FROM group_member
+                WHERE user_id = ? 
+                    AND group_id = ?
+                """,
+                (current_user_id, group_id),
+            )
+            conn.commit()
+            self._invalidate_roles(conn, [(group_id, current_user_id)])
         return {"message": "Successfully left the group."}
 
     def remove_member(self, admin_user: AdminUser):
-        self.cursor.execute(
-            """
-            DELETE
-            FROM group_member
-            WHERE user_id = ? 
-                AND group_id = ?
-            """,
-            (admin_user.user_id, admin_user.group_id),
-        )
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE
+                FROM group_member
+                WHERE user_id = ? 
+                    AND group_id = ?
+                """,
+                (admin_user.user_id, admin_user.group_id),
+            )
+            conn.commit()
+            self._invalidate_roles(conn, [(admin_user.group_id, admin_user.user_id)])
         return {"message": "Successfully removed a member."}
 
-    def get_all_groups(self, name: Optional[str] = None):
-        if name:
-            self.cursor.execute(
+    # 아래 *_as_admin / *_with_role 메서드는 호출자의 역할 확인을 본 쿼리와 같은 SQL 문에서 처리합니다.
+    # caller CTE 는 멤버가 아니어도 항상 한 행을 돌려주고 나머지는 LEFT JOIN 하므로,
+    # 결과 행이 없을 때도 역할을 알 수 있습니다.
+
+    def delete_group_as_admin(self, group_id: int, user_id: UserID) -> bool:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
                 """
-                SELECT g.id, g.name, g.description, g.created_at, COUNT(gm.group_id) AS member_count
-                FROM 'group' g
-                LEFT JOIN group_member gm ON gm.group_id = g.id 
-                    AND gm.role != 'PENDING'
-                WHERE g.name LIKE ?
-                GROUP BY g.id
+                DELETE
+                FROM 'group'
+                WHERE id = ?
+                    AND EXISTS (
+                        SELECT 1
+                        FROM group_member
+                        WHERE group_id = ?
+                            AND user_id = ?
+                            AND role = 'ADMIN'
+                    )
                 """,
-                ("%" + name + "%",),
+                (group_id, group_id, user_id),
             )
-        else:
-            self.cursor.execute(
+            conn.commit()
+            if cursor.rowcount:
+                self._clear_roles(conn)
+        return cursor.rowcount > 0
+
+    def get_member_requests_as_admin(
+        self, group_id: int, user_id: UserID
+    ) -> Optional[List[dict]]:
+        # 호출자가 ADMIN 이 아니면 None 을 돌려줍니다.
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
                 """
-                SELECT g.id, g.name, g.description, g.created_at, COUNT(gm.group_id) AS member_count
-                FROM 'group' g
-                LEFT JOIN group_member gm ON gm.group_id = g.id 
-                    AND gm.role != 'PENDING'
-                GROUP BY g.id
+                WITH caller AS (
+                    SELECT (
+                        SELECT role
+                        FROM group_member
+                        WHERE group_id = ?
+                            AND user_id = ?
+                    ) AS role
+                )
+                SELECT caller.role, gm.id, u.username, u.nickname, u.occupation_id AS occupation_name, gm.created_at
+                FROM caller
+                LEFT JOIN group_member gm
+                    ON caller.role = 'ADMIN'
+                    AND gm.group_id = ?
+                    AND gm.role = 'PENDING'
+                LEFT JOIN user u ON gm.user_id = u.id
+                """,
+                (group_id, user_id, group_id),
+            )
+            rows = cursor.fetchall()
+        if rows[0][0] != "ADMIN":
+            return None
+        # 첫 컬럼(caller.role)을 빼고 나머지를 get_member_requests 와 같은 형태로 돌려줍니다.
+        return member_request_rows.validate_python(
+            self._with_occupation_names(cursor.description[1:], [row[1:] for row in rows if row[1] is not None])
+        )
+
+    def get_all_members_with_role(self, group_id: int, current_user_id: int):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
                 """
+                WITH caller AS (
+                    SELECT (
+                        SELECT role
+                        FROM group_member
+                        WHERE group_id = ?
+                            AND user_id = ?
+                    ) AS role
+                )
+                SELECT caller.role, gm.user_id, u.nickname, gm.role
+                FROM caller
+                LEFT JOIN group_member gm
+                    ON gm.group_id = ?
+                    AND gm.role != 'PENDING'
+                LEFT JOIN user u ON gm.user_id = u.id
+                """,
+                (group_id, current_user_id, group_id),
             )
+            rows = cursor.fetchall()
+        # 원래 쿼리의 JOIN 처럼 사용자 행이 없는 멤버는 제외합니다.
+        members = [row[1:] for row in rows if row[2] is not None]
+        return current_user_id, rows[0][0], members
+
+    def _decode_offset(self, cursor: Optional[str], max_offset: Optional[int] = None) -> int:
+        offset = decode_cursor(cursor, 1)
+        if not offset:
+            return 0
+        try:
+            offset = int(offset[0])
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+        if offset < 0 or (max_offset is not None and offset > max_offset):
+            raise ValueError("Invalid cursor")
+        return offset
+
+    def get_all_groups(
+        self, name: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None
+    ) -> GroupPage:
+        # member_count 는 group_member 트리거가 관리하는 컬럼이라 집계가 필요 없습니다.
+        columns = "g.id, g.name, g.description, g.created_at, g.member_count"
+        if name and len(name) >= 3:
+            # 검색 결과는 이름에 가중치를 둔 bm25 순위로 정렬되므로 offset 커서를 씁니다.
+            offset = self._decode_offset(cursor)
+            query = f"""
+                SELECT {columns}
+                FROM group_search s
+                JOIN 'group' g ON g.id = s.rowid
+                WHERE group_search MATCH ?
+                ORDER BY bm25(group_search, 10.0, 1.0), g.id
+                LIMIT ? OFFSET ?
+            """
+            params = ('"' + name.replace('"', '""') + '"', limit + 1, offset)
+        elif name:
+            # trigram 인덱스는 3글자 미만을 검색할 수 없어 이름에 대한 LIKE 로 대신합니다.
+            # 페이지마다 테이블을 앞에서부터 훑으므로 깊이를 SHORT_SEARCH_MAX_OFFSET 까지로 제한합니다.
+            offset = self._decode_offset(cursor, SHORT_SEARCH_MAX_OFFSET)
+            query = f"""
+                SELECT {columns}
+                FROM 'group' g
+                WHERE g.name LIKE ?
+                ORDER BY g.id
+                LIMIT ? OFFSET ?
+            """
+            params = ("%" + name + "%", limit + 1, offset)
+        else:
+            offset = None
+            after = decode_cursor(cursor, 1)
+            query = f"""
+                SELECT {columns}
+                FROM 'group' g
+                WHERE g.id > ?
+                ORDER BY g.id
+                LIMIT ?
+            """
+            params = (after[0] if after else 0, limit + 1)
+
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            if offset is None:
+                next_cursor = encode_cursor(rows[-1][0])
+            elif not (name and len(name) < 3 and offset + limit > SHORT_SEARCH_MAX_OFFSET):
+                next_cursor = encode_cursor(offset + limit)
         # 결과를 파이썬 객체로 변환하여 반환
         groups = []
-        for row in self.cursor.fetchall():
-            group = {
-                "id": row[0],
-                "name": row[1],
-                "description": row[2],
-                "created_at": row[3],
-                "member_count": row[4],
-            }
-            groups.append(group)
-        return groups
+        for row in rows:
+            groups.append(
+                GroupSummary(
+                    id=row[0],
+                    name=row[1],
+                    description=row[2],
+                    created_at=row[3],
+                    member_count=row[4],
+                )
+            )
+        return GroupPage(items=groups, next_cursor=next_cursor)
+
+    def recount_member_counts(self) -> int:
+        # 트리거가 빠졌거나 수동으로 데이터를 고친 뒤 카운터를 실제 멤버 수로 맞춥니다.
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE 'group'
+                SET member_count = (
+                    SELECT COUNT(*)
+                    FROM group_member gm
+                    WHERE gm.group_id = 'group'.id
+                        AND gm.role != 'PENDING'
+                )
+                WHERE member_count != (
+                    SELECT COUNT(*)
+                    FROM group_member gm
+                    WHERE gm.group_id = 'group'.id
+                        AND gm.role != 'PENDING'
+                )
+                """
+            )
+            conn.commit()
+        return cursor.rowcount
 
     def change_member_role_to_admin(self, group_id: int, user_id: int):
-        if self.get_member_role(group_id, user_id) == "ADMIN":
-            return {"message": "User's role is already ADMIN"}
+        with self.pool.transaction() as conn:
+            if self.get_member_role(group_id, user_id) == "ADMIN":
+                return {"message": "User's role is already ADMIN"}
 
-        self.cursor.execute(
-            """
-            UPDATE group_member
-            SET role=?
-            WHERE group_id = ? 
-                AND user_id = ?
-            """,
-            ("ADMIN", group_id, user_id),
-        )
-        self.conn.commit()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE group_member
+                SET role=?
+                WHERE group_id = ? 
+                    AND user_id = ?
+                """,
+                ("ADMIN", group_id, user_id),
+            )
+            conn.commit()
+            self._invalidate_roles(conn, [(group_id, user_id)])
         return {"message": "Successfully changed."}
 
     def change_member_role_to_member(self, group_id: int, user_id: int):
-        if self.get_member_role(group_id, user_id) == "MEMBER":
-            return {"message": "User's role is already MEMBER"}
+        with self.pool.transaction() as conn:
+            if self.get_member_role(group_id, user_id) == "MEMBER":
+                return {"message": "User's role is already MEMBER"}
 
-        self.cursor.execute(
-            """
-            UPDATE group_member
-            SET role=?
-            WHERE group_id = ? 
-                AND user_id = ?
-            """,
-            ("MEMBER", group_id, user_id),
-        )
-        self.conn.commit()
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE group_member
+                SET role=?
+                WHERE group_id = ? 
+                    AND user_id = ?
+                """,
+                ("MEMBER", group_id, user_id),
+            )
+            conn.commit()
+            self._invalidate_roles(conn, [(group_id, user_id)])
         return {"message": "Successfully changed."}
+
+
+class AsyncGroupRepository:
+    def __init__(self, group_repository: GroupRepository = None):
+        self.group_repository = group_repository or GroupRepository()
+
+    async def create_group(self, group_create: GroupCreate, user_id: UserID) -> Group:
+        return await run_sync(self.group_repository.create_group, group_create, user_id)
+
+    async def get_user_groups(self, user_id: UserID) -> List[dict]:
+        return await run_sync(self.group_repository.get_user_groups, user_id)
+
+    async def get_member_role(self, group_id: int, user_id: UserID) -> str:
+        # 캐시에 있으면 DB 스레드로 넘기지 않고 바로 반환합니다.
+        if not isinstance(self.group_repository.pool.current(), UnitOfWork):
+            cached = role_cache.get((group_id, user_id))
+            if cached is not None:
+                return cached or None
+        return await run_sync(self.group_repository.get_member_role, group_id, user_id)
+
+    async def delete_group(self, group_id: int):
+        return await run_sync(self.group_repository.delete_group, group_id)
+
+    async def study_group_join_request(self, user_id: UserID, group_id: int):
+        return await run_sync(
+            self.group_repository.study_group_join_request, user_id, group_id
+        )
+
+    async def get_member_requests_by_user(
+        self, user_id: UserID
+    ) -> List[GroupMembershipRequest]:
+        return await run_sync(self.group_repository.get_member_requests_by_user, user_id)
+
+    async def get_member_requests(self, group_id: int) -> List[dict]:
+        return await run_sync(self.group_repository.get_member_requests, group_id)
+
+    async def deny_request(self, request_id: int):
+        return await run_sync(self.group_repository.deny_request, request_id)
+
+    async def add_members(
+        self, group_id: int, request_ids: List[int]
+    ) -> List[MemberRequestOutcome]:
+        return await run_sync(self.group_repository.add_members, group_id, request_ids)
+
+    async def deny_requests(
+        self, group_id: int, request_ids: List[int]
+    ) -> List[MemberRequestOutcome]:
+        return await run_sync(self.group_repository.deny_requests, group_id, request_ids)
+
+    async def add_member(self, request_id: int):
+        return await run_sync(self.group_repository.add_member, request_id)
+
+    async def get_all_members(self, group_id: int, role: str, current_user_id: int):
+        return await run_sync(
+            self.group_repository.get_all_members, group_id, role, current_user_id
+        )
+
+    async def group_withdrawal(self, group_id: int, current_user_id: UserID):
+        return await run_sync(
+            self.group_repository.group_withdrawal, group_id, current_user_id
+        )
+
+    async def remove_member(self, admin_user: AdminUser):
+        return await run_sync(self.group_repository.remove_member, admin_user)
+
+    async def delete_group_as_admin(self, group_id: int, user_id: UserID) -> bool:
+        return await run_sync(self.group_repository.delete_group_as_admin, group_id, user_id)
+
+    async def get_member_requests_as_admin(
+        self, group_id: int, user_id: UserID
+    ) -> Optional[List[dict]]:
+        return await run_sync(
+            self.group_repository.get_member_requests_as_admin, group_id, user_id
+        )
+
+    async def get_all_members_with_role(self, group_id: int, current_user_id: int):
+        return await run_sync(
+            self.group_repository.get_all_members_with_role, group_id, current_user_id
+        )
+
+    async def get_all_groups(
+        self, name: Optional[str] = None, limit: int = 20, cursor: Optional[str] = None
+    ) -> GroupPage:
+        return await run_sync(
+            self.group_repository.get_all_groups, name, limit, cursor
+        )
+
+    async def change_member_role_to_admin(self, group_id: int, user_id: int):
+        return await run_sync(
+            self.group_repository.change_member_role_to_admin, group_id, user_id
+        )
+
+    async def change_member_role_to_member(self, group_id: int, user_id: int):
+        return await run_sync(
+            self.group_repository.change_member_role_to_member, group_id, user_id
+        )
@@ -2,86 +2,165 @@ from app.group.dto.dto import (
     Group,
     GroupCreate,
     GroupMembershipRequest,
-    MemberRequestsView,
     AdminUser,
+    GroupPage,
+    MemberRequestBatch,
+    MemberRequestOutcome,
 )
-from app.user.dto.dto import UserID
-from app.group.repository.repository import GroupRepository
+from app.group.repository.repository import AsyncGroupRepository
+from app.database.unit_of_work import run_in_transaction
+from app.cache.tagged import response_cache, cache_key, NotModified
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import os
 
+# 켜면 역할 확인을 본 쿼리와 같은 SQL 문으로 처리합니다(역할 캐시를 거치지 않음).
+INLINE_ROLE_CHECK = os.environ.get("SUDDEN_ATTACK_INLINE_ROLE_CHECK", "0") == "1"
 
-class GroupService:
-    def __init__(self):
-        self.group_repository = GroupRepository()
-
-    def create_group(self, group_create: GroupCreate, user_id: int) -> Group:
-        group = self.group_repository.create_group(group_create, user_id)
-        return group
-
-    def get_user_groups(self, user_id: int) -> List[Group]:
-        return self.group_repository.get_user_groups(user_id)
-
-    def delete_group(self, group_id: int, user_id: int):
-        role = self.group_repository.get_member_role(group_id, user_id)
-        if role == "ADMIN":
-            self.group_repository.delete_group(group_id)
-        else:
-            raise HTTPException(
-                status_code=403, detail="Only group admins can delete the group"
-            )
-
-    def study_group_join_request(self, user_id: int, group_id: int):
-        return self.group_repository.study_group_join_request(user_id, group_id)
-
-    def get_member_requests_by_user(self, user_id: int) -> List[GroupMembershipRequest]:
-        return self.group_repository.get_member_requests_by_user(user_id)
 
-    def get_member_requests(
+class GroupService:
+    def __init__(self, inline_role_check: bool = INLINE_ROLE_CHECK):
+        self.group_repository = AsyncGroupRepository()
+        # 여러 호출을 한 트랜잭션으로 묶는 작업은 동기 리포지토리로 run_in_transaction 안에서 실행합니다.
+        self.repository = self.group_repository.group_repository
+        self.cache = response_cache
+        self.inline_role_check = inline_role_check
+
+    async def create_group(self, group_create: GroupCreate, user_id: int) -> Group:
+        try:
+            return await run_in_transaction(self.repository.create_group, group_create, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+
+    async def get_user_groups(self, user_id: int) -> List[dict]:
+        return await self.group_repository.get_user_groups(user_id)
+
+    async def delete_group(self, group_id: int, user_id: int):
+        if self.inline_role_check:
+            if not await self.group_repository.delete_group_as_admin(group_id, user_id):
+                raise HTTPException(
+                    status_code=403, detail="Only group admins can delete the group"
+                )
+            return
+        def delete():
+            role = self.repository.get_member_role(group_id, user_id)
+            if role == "ADMIN":
+                self.repository.delete_group(group_id)
+            else:
+                raise HTTPException(
+                    status_code=403, detail="Only group admins can delete the group"
+                )
+
+        await run_in_transaction(delete)
+
+    async def study_group_join_request(self, user_id: int, group_id: int):
+        return await self.group_repository.study_group_join_request(user_id, group_id)
+
+    async def get_member_requests_by_user(self, user_id: int) -> List[GroupMembershipRequest]:
+        return await self.group_repository.get_member_requests_by_user(user_id)
+
+    async def get_member_requests(
         self, group_id: int, user_id: int
-    ) -> List[MemberRequestsView]:
-        role = self.group_repository.get_member_role(group_id, user_id)
+    ) -> List[dict]:
+        if self.inline_role_check:
+            requests = await self.group_repository.get_member_requests_as_admin(group_id, user_id)
+            if requests is None:
+                raise HTTPException(
+                    status_code=403,
+                    detail="Only group administrators can view member requests.",
+                )
+            return requests
+        role = await self.group_repository.get_member_role(group_id, user_id)
         if role == "ADMIN":
-            return self.group_repository.get_member_requests(group_id)
+            return await self.group_repository.get_member_requests(group_id)
         else:
             raise HTTPException(
                 status_code=403,
                 detail="Only group administrators can view member requests.",
             )
 
-    def add_member(self, request_id: int):
-        self.group_repository.add_member(request_id)
+    async def add_member(self, request_id: int):
+        await self.group_repository.add_member(request_id)
         return True
 
-    def deny_request(self, request_id: int):
-        return self.group_repository.deny_request(request_id)
+    async def deny_request(self, request_id: int):
+        return await self.group_repository.deny_request(request_id)
+
+    def _require_admin(self, group_id: int, user_id: int, detail: str):
+        role = self.repository.get_member_role(group_id, user_id)
+        if role != "ADMIN":
+            raise HTTPException(status_code=403, detail=detail)
+
+    async def add_members(
+        self, batch: MemberRequestBatch, user_id: int
+    ) -> List[MemberRequestOutcome]:
+        # 권한은 요청 목록 전체에 대해 한 번만 확인하고, 확인과 처리를 한 트랜잭션으로 묶습니다.
+        def approve():
+            self._require_admin(
+                batch.group_id, user_id, "Only group administrators can approve member requests."
+            )
+            return self.repository.add_members(batch.group_id, batch.request_ids)
 
-    def get_all_members(self, group_id: int, current_user_id: int):
-        role = self.group_repository.get_member_role(group_id, current_user_id)
-        return self.group_repository.get_all_members(group_id, role, current_user_id)
+        return await run_in_transaction(approve)
 
-    def group_withdrawal(self, group_id: int, current_user_id: int):
-        role = self.group_repository.get_member_role(group_id, current_user_id)
-        if role == "ADMIN":
-            return HTTPException(
-                status_code=403, detail="Group administrators are not allowed to leave."
+    async def deny_requests(
+        self, batch: MemberRequestBatch, user_id: int
+    ) -> List[MemberRequestOutcome]:
+        def deny():
+            self._require_admin(
+                batch.group_id, user_id, "Only group administrators can deny member requests."
             )
-        return self.group_repository.group_withdrawal(group_id, current_user_id)
+            return self.repository.deny_requests(batch.group_id, batch.request_ids)
 
-    def remove_member(self, admin_user: AdminUser):
-        if admin_user.role == "ADMIN":
-            return self.group_repository.remove_member(AdminUser)
+        return await run_in_transaction(deny)
+
+    async def get_all_members(self, group_id: int, current_user_id: int):
+        if self.inline_role_check:
+            return await self.group_repository.get_all_members_with_role(group_id, current_user_id)
+        role = await self.group_repository.get_member_role(group_id, current_user_id)
+        return await self.group_repository.get_all_members(group_id, role, current_user_id)
 
-    def get_all_groups(self, name: Optional[str] = None):
-        groups = self.group_repository.get_all_groups(name)
-        if not groups:
+    async def group_withdrawal(self, group_id: int, current_user_id: int):
+        def withdraw():
+            role = self.repository.get_member_role(group_id, current_user_id)
+            if role == "ADMIN":
+                return HTTPException(
+                    status_code=403, detail="Group administrators are not allowed to leave."
+                )
+            return self.repository.group_withdrawal(group_id, current_user_id)
+
+        return await run_in_transaction(withdraw)
+
+    async def remove_member(self, admin_user: AdminUser):
+        if admin_user.role == "ADMIN":
+            return await self.group_repository.remove_member(admin_user)
+
+    async def get_all_groups(
+        self,
+        name: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> Tuple[str, GroupPage]:
+        try:
+            etag, groups = await self.cache.conditional(
+                cache_key("groups", name, limit, cursor),
+                ["groups"],
+                lambda: self.group_repository.get_all_groups(name, limit, cursor),
+                if_none_match,
+            )
+        except NotModified as e:
+            raise HTTPException(status_code=304, headers={"ETag": e.etag})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if not groups.items:
             raise HTTPException(status_code=404, detail="No groups found")
-        return groups
+        return etag, groups
 
-    def change_member_role_to_admin(self, role: str, group_id: int, user_id: int):
+    async def change_member_role_to_admin(self, role: str, group_id: int, user_id: int):
         if role == "ADMIN":
-            return self.group_repository.change_member_role_to_admin(group_id, user_id)
+            return await run_in_transaction(self.repository.change_member_role_to_admin, group_id, user_id)
 
-    def change_member_role_to_member(self, role: str, group_id: int, user_id: int):
+    async def change_member_role_to_member(self, role: str, group_id: int, user_id: int):
         if role == "ADMIN":
-            return self.group_repository.change_member_role_to_member(group_id, user_id)
+            return await run_in_transaction(self.repository.change_member_role_to_member, group_id, user_id)
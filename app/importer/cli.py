@@ -0,0 +1,36 @@
+"""사용자/그룹/멤버 대량 가져오기 명령.
+
+    python -m app.importer.cli cohort.csv
+    python -m app.importer.cli cohort.ndjson --chunk-size 1000
+
+각 행의 type 은 user(username, nickname, email, password, occupation), group(name, description, admin),
+member(group, email, role) 중 하나입니다. CSV 는 모든 종류의 컬럼을 한 헤더에 두고 쓰지 않는 칸을 비워 둡니다.
+보고서는 JSON 으로 출력하고, 실패한 행이 있으면 종료 코드 1로 끝납니다.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.database.connection import pool
+from app.importer.service.service import IMPORT_CHUNK_SIZE, FORMATS, ImportService, detect_format
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="없으면 확장자로 정합니다")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot tell the format from the file name, pass --format")
+    with open(args.path, "rb") as f:
+        report = asyncio.run(ImportService().import_file(f, fmt, args.chunk_size))
+    pool.close()
+    print(report.model_dump_json(indent=2))
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
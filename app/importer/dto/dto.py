@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Dict, List, Literal
+
+
+class ImportUser(BaseModel):
+    username: str
+    nickname: str
+    email: str
+    password: str
+    # 직업 id 또는 직업 이름
+    occupation: str
+
+
+class ImportGroup(BaseModel):
+    name: str
+    description: str = ""
+    # 그룹 관리자가 될 사용자의 이메일
+    admin: str
+
+
+class ImportMember(BaseModel):
+    # 그룹 이름
+    group: str
+    email: str
+    role: Literal["MEMBER", "ADMIN", "PENDING"] = "MEMBER"
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportReport(BaseModel):
+    imported: Dict[str, int]
+    failed: int
+    # 최대 IMPORT_MAX_ERRORS 개까지만 담습니다.
+    errors: List[ImportRowError]
@@ -0,0 +1,240 @@
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+from app.importer.dto.dto import ImportUser, ImportGroup, ImportMember
+from app.database.connection import pool
+from app.database.executor import run_sync
+from app.group.repository.repository import role_cache
+
+# (줄 번호, 오류 메시지)
+RowErrors = List[Tuple[int, str]]
+
+
+def _placeholders(values: Sequence) -> str:
+    return ", ".join("?" * len(values))
+
+
+class ImportRepository:
+    def __init__(self):
+        self.pool = pool
+
+    def import_chunk(
+        self,
+        users: List[Tuple[int, ImportUser, int, str]],
+        groups: List[Tuple[int, ImportGroup]],
+        members: List[Tuple[int, ImportMember]],
+    ) -> Tuple[Dict[str, int], RowErrors]:
+        # 한 청크를 하나의 쓰기 트랜잭션으로 넣습니다. 같은 청크의 사용자 -> 그룹 -> 멤버 순서로 넣으므로
+        # 앞에서 만든 사용자/그룹을 뒤의 행이 참조할 수 있습니다.
+        # users 의 각 항목은 (줄 번호, 행, 직업 id, 해시된 비밀번호) 입니다.
+        errors: RowErrors = []
+        with self.pool.transaction() as conn:
+            imported = {
+                "user": self._insert_users(conn, users, errors),
+                "group": self._insert_groups(conn, groups, errors),
+                "member": self._insert_members(conn, members, errors),
+            }
+            conn.commit()
+        return imported, errors
+
+    def _insert_users(self, conn, users, errors: RowErrors) -> int:
+        if not users:
+            return 0
+        emails = [user.email for _, user, _, _ in users]
+        nicknames = [user.nickname for _, user, _, _ in users]
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT email, nickname
+            FROM user
+            WHERE email IN ({_placeholders(emails)})
+                OR nickname IN ({_placeholders(nicknames)})
+            """,
+            (*emails, *nicknames),
+        )
+        taken_emails, taken_nicknames = set(), set()
+        for email, nickname in cursor.fetchall():
+            taken_emails.add(email)
+            taken_nicknames.add(nickname)
+
+        rows = []
+        for line, user, occupation_id, hashed_password in users:
+            # 이미 있는 사용자뿐 아니라 같은 청크 안의 중복도 걸러냅니다.
+            if user.email in taken_emails or user.nickname in taken_nicknames:
+                errors.append((line, "Email or nickname already registered"))
+                continue
+            taken_emails.add(user.email)
+            taken_nicknames.add(user.nickname)
+            rows.append((line, (user.username, user.email, hashed_password, user.nickname, occupation_id)))
+        return len(self._insert_rows(
+            conn,
+            """
+            INSERT INTO user (username, email, password, nickname, occupation_id)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            rows,
+            errors,
+        ))
+
+    def _insert_groups(self, conn, groups, errors: RowErrors) -> int:
+        if not groups:
+            return 0
+        admins = self._user_ids(conn, [group.admin for _, group in groups])
+        names = [group.name for _, group in groups]
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT name
+            FROM 'group'
+            WHERE name IN ({_placeholders(names)})
+            """,
+            names,
+        )
+        taken = {name for name, in cursor.fetchall()}
+
+        created_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        admin_of = {}
+        for line, group in groups:
+            if group.admin not in admins:
+                errors.append((line, "Admin user not found"))
+                continue
+            if group.name in taken:
+                errors.append((line, "A group with the same name already exists."))
+                continue
+            taken.add(group.name)
+            admin_of[group.name] = admins[group.admin]
+            rows.append((line, (group.name, group.description, created_at)))
+        inserted = self._insert_rows(
+            conn,
+            """
+            INSERT INTO 'group' (name, description, created_at)
+            VALUES (?, ?, ?)
+            """,
+            rows,
+            errors,
+        )
+        if not inserted:
+            return 0
+
+        # executemany 는 마지막 id 만 알려 주므로 새 그룹의 id 는 이름으로 다시 읽습니다.
+        created = [params[0] for line, params in rows if line in inserted]
+        group_ids = self._group_ids(conn, created)
+        conn.executemany(
+            """
+            INSERT INTO group_member (user_id, group_id, role, created_at)
+            VALUES (?, ?, 'ADMIN', ?)
+            """,
+            [(admin_of[name], group_ids[name], created_at) for name in created],
+        )
+        self._invalidate_roles(conn, [(group_ids[name], admin_of[name]) for name in created])
+        return len(inserted)
+
+    def _insert_members(self, conn, members, errors: RowErrors) -> int:
+        if not members:
+            return 0
+        user_ids = self._user_ids(conn, [member.email for _, member in members])
+        group_ids = self._group_ids(conn, [member.group for _, member in members])
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT group_id, user_id
+            FROM group_member
+            WHERE user_id IN ({_placeholders(user_ids)})
+            """,
+            list(user_ids.values()),
+        )
+        taken = set(cursor.fetchall())
+
+        created_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        rows = []
+        for line, member in members:
+            if member.group not in group_ids:
+                errors.append((line, "Group not found"))
+                continue
+            if member.email not in user_ids:
+                errors.append((line, "User not found"))
+                continue
+            key = (group_ids[member.group], user_ids[member.email])
+            if key in taken:
+                errors.append((line, "Already a member or requested"))
+                continue
+            taken.add(key)
+            rows.append((line, (key[1], key[0], member.role, created_at)))
+        inserted = self._insert_rows(
+            conn,
+            """
+            INSERT INTO group_member (user_id, group_id, role, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows,
+            errors,
+        )
+        self._invalidate_roles(conn, [(params[1], params[0]) for line, params in rows if line in inserted])
+        return len(inserted)
+
+    def _insert_rows(self, conn, sql: str, rows: List[Tuple[int, tuple]], errors: RowErrors) -> set:
+        # 먼저 executemany 한 번으로 넣고, 제약 조건에 걸리는 행이 있으면 세이브포인트로 되돌린 뒤
+        # 한 행씩 다시 넣어 실패한 행만 오류로 남깁니다. 넣은 행의 줄 번호를 돌려줍니다.
+        if not rows:
+            return set()
+        conn.execute("SAVEPOINT import_rows")
+        try:
+            conn.executemany(sql, [params for _, params in rows])
+            conn.execute("RELEASE import_rows")
+            return {line for line, _ in rows}
+        except sqlite3.IntegrityError:
+            conn.execute("ROLLBACK TO import_rows")
+            conn.execute("RELEASE import_rows")
+        inserted = set()
+        for line, params in rows:
+            try:
+                conn.execute(sql, params)
+                inserted.add(line)
+            except sqlite3.IntegrityError as e:
+                errors.append((line, str(e)))
+        return inserted
+
+    def _user_ids(self, conn, emails: List[str]) -> Dict[str, int]:
+        emails = list(set(emails))
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT email, id
+            FROM user
+            WHERE email IN ({_placeholders(emails)})
+                AND activate = 1
+            """,
+            emails,
+        )
+        return dict(cursor.fetchall())
+
+    def _group_ids(self, conn, names: List[str]) -> Dict[str, int]:
+        names = list(set(names))
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT name, id
+            FROM 'group'
+            WHERE name IN ({_placeholders(names)})
+            """,
+            names,
+        )
+        return dict(cursor.fetchall())
+
+    def _invalidate_roles(self, conn, keys: List[Tuple[int, int]]) -> None:
+        # 멤버가 아니라고 캐시된 (그룹, 사용자) 를 커밋 후에 지웁니다.
+        conn.after_commit.append(lambda: [role_cache.delete(key) for key in keys])
+
+
+class AsyncImportRepository:
+    def __init__(self, import_repository: ImportRepository = None):
+        self.import_repository = import_repository or ImportRepository()
+
+    async def import_chunk(
+        self,
+        users: List[Tuple[int, ImportUser, int, str]],
+        groups: List[Tuple[int, ImportGroup]],
+        members: List[Tuple[int, ImportMember]],
+    ) -> Tuple[Dict[str, int], RowErrors]:
+        return await run_sync(self.import_repository.import_chunk, users, groups, members)
@@ -0,0 +1,150 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+import os
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from app.importer.repository.repository import AsyncImportRepository
+from app.importer.dto.dto import ImportUser, ImportGroup, ImportMember, ImportReport, ImportRowError
+from app.user.repository.password import hash_password, import_hash_pool
+from app.database.executor import run_sync
+from app.database.reference import ReferenceData, reference_data
+
+# 한 번에 검증/해시하고 한 트랜잭션으로 넣는 행 수
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", "500"))
+# 보고서에 담는 행 오류의 최대 개수
+IMPORT_MAX_ERRORS = int(os.environ.get("IMPORT_MAX_ERRORS", "1000"))
+# 가져오기 엔드포인트를 쓸 수 있는 사용자 이메일(쉼표로 구분). 비어 있으면 엔드포인트는 막혀 있습니다.
+IMPORT_ADMINS = {email.strip() for email in os.environ.get("IMPORT_ADMINS", "").split(",") if email.strip()}
+
+# 각 행의 type 컬럼 값 -> 행 모델
+RECORD_TYPES = {"user": ImportUser, "group": ImportGroup, "member": ImportMember}
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def read_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Union[BaseModel, str]]]:
+    # 파일을 한 행씩 읽어 (줄 번호, 검증된 행 또는 오류 메시지) 를 내줍니다. 파일 전체를 메모리에 올리지 않습니다.
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # 다른 종류의 행이 쓰는 빈 칸은 값이 없는 것으로 봅니다.
+            yield reader.line_num, validate_record({k: v for k, v in row.items() if k and v})
+    else:
+        for line, raw in enumerate(text, 1):
+            if not raw.strip():
+                continue
+            try:
+                record = json.loads(raw)
+            except ValueError as e:
+                yield line, f"Invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line, "Each line must be a JSON object"
+                continue
+            yield line, validate_record(record)
+
+
+def validate_record(record: dict) -> Union[BaseModel, str]:
+    model = RECORD_TYPES.get(record.pop("type", None))
+    if model is None:
+        return f"type must be one of {', '.join(RECORD_TYPES)}"
+    try:
+        return model.model_validate(record)
+    except ValidationError as e:
+        return "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+
+
+class ImportService:
+    # CSV/NDJSON 으로 사용자, 그룹, 멤버를 한꺼번에 넣습니다. 잘못된 행은 건너뛰고 보고서에 남깁니다.
+    def __init__(self):
+        self.import_repository = AsyncImportRepository()
+
+    async def import_upload(self, email: str, stream: BinaryIO, filename: Optional[str], content_type: Optional[str], fmt: Optional[str] = None) -> ImportReport:
+        if email not in IMPORT_ADMINS:
+            raise HTTPException(status_code=403, detail="Not allowed to import")
+        try:
+            return await self.import_file(stream, fmt or detect_format(filename, content_type))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def import_file(self, stream: BinaryIO, fmt: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> ImportReport:
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        # 직업은 메모리의 참조 데이터로 확인합니다. 가져오기 직전에 바뀐 것이 있으면 다시 읽습니다.
+        occupations = await run_sync(reference_data.refresh_if_changed)
+        records = read_records(stream, fmt)
+        imported = {name: 0 for name in RECORD_TYPES}
+        errors: List[Tuple[int, str]] = []
+        failed = 0
+        hash_pool = None
+        try:
+            while True:
+                # 파일 읽기와 검증은 블로킹 작업이라 이벤트 루프 밖에서 합니다.
+                chunk = await run_sync(lambda: list(itertools.islice(records, chunk_size)))
+                if not chunk:
+                    break
+                users, groups, members, chunk_errors = self._split(chunk, occupations)
+                if users and hash_pool is None:
+                    hash_pool = import_hash_pool()
+                hashed = await self._hash_passwords(hash_pool, [user.password for _, user, _ in users])
+                counts, insert_errors = await self.import_repository.import_chunk(
+                    [(line, user, occupation_id, password) for (line, user, occupation_id), password in zip(users, hashed)],
+                    groups,
+                    members,
+                )
+                for name, count in counts.items():
+                    imported[name] += count
+                for error in sorted(chunk_errors + insert_errors):
+                    failed += 1
+                    if len(errors) < IMPORT_MAX_ERRORS:
+                        errors.append(error)
+        finally:
+            if hash_pool is not None:
+                hash_pool.shutdown(wait=False, cancel_futures=True)
+        return ImportReport(
+            imported=imported,
+            failed=failed,
+            errors=[ImportRowError(line=line, error=error) for line, error in errors],
+        )
+
+    def _split(self, chunk, occupations: ReferenceData):
+        users, groups, members, errors = [], [], [], []
+        for line, record in chunk:
+            if isinstance(record, str):
+                errors.append((line, record))
+            elif isinstance(record, ImportUser):
+                # 직업은 id 나 이름 어느 쪽이든 받습니다.
+                occupation_id = occupations.occupation_ids.get(record.occupation)
+                if occupation_id is None and record.occupation.isdigit() and int(record.occupation) in occupations.occupations:
+                    occupation_id = int(record.occupation)
+                if occupation_id is None:
+                    errors.append((line, "Invalid occupation"))
+                else:
+                    users.append((line, record, occupation_id))
+            elif isinstance(record, ImportGroup):
+                groups.append((line, record))
+            else:
+                members.append((line, record))
+        return users, groups, members, errors
+
+    async def _hash_passwords(self, hash_pool, passwords: List[str]) -> List[str]:
+        # bcrypt 는 행마다 수백 ms 가 걸리므로 청크의 비밀번호를 프로세스 풀에 나눠 해시합니다.
+        if not passwords:
+            return []
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(
+            *(loop.run_in_executor(hash_pool, hash_password, password) for password in passwords)
+        )
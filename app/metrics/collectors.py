@@ -0,0 +1,74 @@
+from app.metrics.registry import registry
+
+
+@registry.collector
+def cache_metrics():
+    from app.cache.tagged import response_cache
+    from app.user.repository.repository import userid_cache
+    from app.user.service.service import token_cache
+    from app.group.repository.repository import role_cache
+
+    samples = []
+    for name, cache in (
+        ("response", response_cache),
+        ("userid", userid_cache),
+        ("token", token_cache),
+        ("role", role_cache),
+    ):
+        samples.append(("cache_requests_total", {"cache": name, "result": "hit"}, cache.hits))
+        samples.append(("cache_requests_total", {"cache": name, "result": "miss"}, cache.misses))
+    yield "cache_requests_total", "counter", "Cache lookups by cache and result", samples
+
+
+@registry.collector
+def pool_metrics():
+    from app.database.connection import pool
+
+    yield "db_pool_waits_total", "counter", "Connection checkouts that had to wait", [
+        ("db_pool_waits_total", {}, pool.waits)
+    ]
+    yield "db_pool_wait_seconds_total", "counter", "Time spent waiting for a connection", [
+        ("db_pool_wait_seconds_total", {}, pool.wait_seconds)
+    ]
+    yield "db_pool_timeouts_total", "counter", "Checkouts that gave up after the pool timeout", [
+        ("db_pool_timeouts_total", {}, pool.timeouts)
+    ]
+    yield "db_pool_connections", "gauge", "Open and idle pooled connections", [
+        ("db_pool_connections", {"state": "open"}, pool._created),
+        ("db_pool_connections", {"state": "idle"}, pool._idle.qsize()),
+    ]
+
+
+@registry.collector
+def password_metrics():
+    from app.user.repository.password import password_hasher
+
+    metrics = password_hasher.metrics()
+    yield "password_hash_completed_total", "counter", "bcrypt hash/verify calls completed", [
+        ("password_hash_completed_total", {}, metrics["completed"])
+    ]
+    yield "password_hash_rejected_total", "counter", "bcrypt calls rejected because the queue was full", [
+        ("password_hash_rejected_total", {}, metrics["rejected"])
+    ]
+    yield "password_hash_queue_wait_seconds_total", "counter", "Time bcrypt calls waited in the queue", [
+        ("password_hash_queue_wait_seconds_total", {}, metrics["queue_wait_seconds"])
+    ]
+    yield "password_hash_seconds_total", "counter", "Time spent inside bcrypt", [
+        ("password_hash_seconds_total", {}, metrics["hash_seconds"])
+    ]
+    yield "password_hash_pending", "gauge", "bcrypt calls queued or running", [
+        ("password_hash_pending", {}, metrics["pending"])
+    ]
+
+
+@registry.collector
+def write_batch_metrics():
+    from app.database.batcher import write_batcher
+
+    metrics = write_batcher.metrics()
+    yield "write_batch_commits_total", "counter", "Group commits made by the write batcher", [
+        ("write_batch_commits_total", {}, metrics["batches"])
+    ]
+    yield "write_batch_writes_total", "counter", "Writes committed by the write batcher", [
+        ("write_batch_writes_total", {}, metrics["writes"])
+    ]
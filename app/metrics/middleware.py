@@ -0,0 +1,48 @@
+import time
+from typing import Dict, Optional
+
+from app.metrics.registry import http_request_duration
+
+
+class TimingMiddleware:
+    # 응답을 끝까지 보낼 때까지의 시간을 라우트 템플릿(/boards/{board_id}/ 등) 별 히스토그램에 기록합니다.
+    # 실제 경로를 라벨로 쓰면 게시글마다 라벨이 생기므로, 라우터가 scope 에 남긴 endpoint 로 템플릿을 찾습니다.
+    def __init__(self, app):
+        self.app = app
+        self._paths: Optional[Dict] = None
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if self._paths is None:
+            self._paths = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._paths.get(endpoint, "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=self._route(scope),
+                status=str(status),
+            )
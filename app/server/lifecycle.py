@@ -0,0 +1,59 @@
+import os
+from typing import Callable, List
+
+from fastapi import HTTPException
+
+from app.database.connection import pool
+from app.database.batcher import write_batcher
+from app.user.repository.password import password_hasher
+
+# 끄면 첫 요청들이 커넥션 생성, 쿼리 준비, bcrypt 백엔드 로딩 비용을 냅니다.
+WARM_UP = os.environ.get("SUDDEN_ATTACK_WARM_UP", "1") == "1"
+
+
+def hot_statements() -> List[Callable[[], object]]:
+    # 거의 모든 요청이 실행하는 조회들입니다. 결과를 캐시에 남기는 역할/사용자 id 조회는 제외합니다.
+    from app.database.versions import ResourceVersionRepository
+    from app.board.repository.repository import BoardRepository
+    from app.group.repository.repository import GroupRepository
+    from app.user.repository.repository import UserRepository
+
+    versions = ResourceVersionRepository()
+    board = BoardRepository()
+    group = GroupRepository()
+    user = UserRepository()
+    return [
+        # ETag 버전 조회는 태그 수(1~3개)마다 SQL 이 다릅니다.
+        lambda: versions.get_versions(("boards",)),
+        lambda: versions.get_versions(("comments:0", "nicknames")),
+        lambda: versions.get_versions(("board:0", "comments:0", "nicknames")),
+        board.get_boards,
+        lambda: board.get_board(0),
+        lambda: board.get_comments(0),
+        group.get_all_groups,
+        lambda: group.get_user_groups(0),
+        lambda: group.get_member_requests_by_user(0),
+        lambda: user.get_active_user(""),
+        lambda: user.get_user_info(""),
+    ]
+
+
+async def warm_up() -> None:
+    from app.board.service.service import BoardService
+    from app.group.service.service import GroupService
+
+    pool.warm(hot_statements())
+    password_hasher.warm()
+    # 목록 첫 페이지는 응답 캐시에 미리 올려 둡니다.
+    for load in (BoardService().get_boards, GroupService().get_all_groups):
+        try:
+            await load()
+        except HTTPException:
+            pass
+
+
+def shut_down() -> None:
+    # uvicorn 이 처리 중인 요청을 모두 끝낸 뒤(lifespan 종료 단계) 호출됩니다.
+    # 쓰기 배치 큐에 남은 INSERT 를 커밋하고 풀의 커넥션을 닫아 WAL 을 정리합니다.
+    write_batcher.close()
+    pool.close()
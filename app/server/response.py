@@ -0,0 +1,27 @@
+from typing import Any, AsyncIterator, List
+
+import pydantic_core
+from starlette.responses import Response, StreamingResponse
+
+
+class FastJSONResponse(Response):
+    # 리포지토리가 이미 검증한 값(dict/list/모델)을 pydantic-core 로 한 번에 JSON 으로 인코딩합니다.
+    # 엔드포인트가 이 응답을 직접 돌려주면 FastAPI 의 response_model 재검증과 jsonable_encoder 를 건너뜁니다.
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+class NDJSONResponse(StreamingResponse):
+    # 행 목록(청크)을 차례로 내주는 비동기 이터레이터를 받아, 행마다 한 줄짜리 JSON 으로 흘려보냅니다.
+    # 청크 하나를 한 번에 인코딩해 보내므로 전송 단위도 청크 하나입니다.
+    media_type = "application/x-ndjson"
+
+    def __init__(self, chunks: AsyncIterator[List[Any]], **kwargs):
+        super().__init__(self._encode(chunks), **kwargs)
+
+    @staticmethod
+    async def _encode(chunks: AsyncIterator[List[Any]]) -> AsyncIterator[bytes]:
+        async for rows in chunks:
+            yield b"".join([pydantic_core.to_json(row) + b"\n" for row in rows])
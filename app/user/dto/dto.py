@@ -22,3 +22,7 @@ class UserInfo(BaseModel):
 
 class UserID(BaseModel):
     id: int
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
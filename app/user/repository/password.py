@@ -0,0 +1,110 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+
+# bcrypt는 해싱 중 GIL을 놓기 때문에 스레드 풀로도 코어 수만큼 병렬 처리됩니다.
+PASSWORD_WORKERS = int(os.environ.get("PASSWORD_WORKERS", os.cpu_count() or 1))
+PASSWORD_QUEUE_LIMIT = int(
+    os.environ.get("PASSWORD_QUEUE_LIMIT", PASSWORD_WORKERS * 8)
+)
+
+
+# 대량 가져오기에서 비밀번호를 해시하는 프로세스 수
+IMPORT_HASH_WORKERS = int(os.environ.get("IMPORT_HASH_WORKERS", os.cpu_count() or 1))
+
+
+class PasswordQueueFullError(RuntimeError):
+    pass
+
+
+class PasswordHasher:
+    def __init__(
+        self, workers: int = PASSWORD_WORKERS, queue_limit: int = PASSWORD_QUEUE_LIMIT
+    ):
+        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="bcrypt"
+        )
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stats = {
+            "completed": 0,
+            "rejected": 0,
+            "queue_wait_seconds": 0.0,
+            "hash_seconds": 0.0,
+        }
+
+    def hash_sync(self, password: str) -> str:
+        return self.pwd_context.hash(password)
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        return self.pwd_context.verify(plain_password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(self.hash_sync, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(self.verify_sync, plain_password, hashed_password)
+
+    def warm(self) -> None:
+        # passlib 은 첫 호출 때 bcrypt 백엔드를 고르므로 미리 한 번 해시하고,
+        # 작업 스레드도 모두 띄워 두어 첫 로그인 요청이 이 비용을 내지 않게 합니다.
+        self.hash_sync("warm-up")
+        futures = [self.executor.submit(time.sleep, 0.01) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return dict(self._stats, pending=self._pending)
+
+    async def _submit(self, func, *args):
+        # 대기열이 가득 차면 작업을 쌓지 않고 바로 거절합니다.
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                self._stats["rejected"] += 1
+                raise PasswordQueueFullError("Password hashing queue is full")
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished_at = time.perf_counter()
+                with self._lock:
+                    self._stats["completed"] += 1
+                    self._stats["queue_wait_seconds"] += started_at - submitted_at
+                    self._stats["hash_seconds"] += finished_at - started_at
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+
+password_hasher = PasswordHasher()
+
+
+def hash_password(password: str) -> str:
+    # 프로세스 풀 작업자가 부르는 최상위 함수입니다.
+    return password_hasher.hash_sync(password)
+
+
+def import_hash_pool(workers: int = IMPORT_HASH_WORKERS) -> ProcessPoolExecutor:
+    # 대량 가져오기 전용 프로세스 풀입니다. 로그인/가입이 쓰는 스레드 풀과 나눠,
+    # 수천 건의 해시가 로그인 대기열을 막지 않게 합니다.
+    # 서버 프로세스는 스레드를 여러 개 띄우고 있으므로 fork 대신 spawn 으로 작업자를 만듭니다.
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
@@ -1,33 +1,53 @@
-import sqlite3
+import os
+import time
 from fastapi import Depends
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from datetime import datetime
 from app.user.dto.dto import User, UserInfo
+from app.user.repository.password import password_hasher
+from app.database.connection import pool
+from app.database.reference import reference_data
+from app.database.executor import run_sync
+from app.cache.lru import LRUCache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/")
 
+# 인증이 필요한 모든 요청에서 조회되는 email -> user id 매핑.
+# 탈퇴는 그 요청을 처리한 워커의 캐시만 지우므로, 다른 워커에서도 이 시간(초) 안에는 반영되게 합니다.
+USERID_CACHE_TTL = float(os.environ.get("USERID_CACHE_TTL", "300"))
+userid_cache = LRUCache(maxsize=10000, ttl=USERID_CACHE_TTL)
+
 
 class UserRepository:
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-        self.conn = sqlite3.connect("sudden-attack.db", check_same_thread=False)
-        self.cursor = self.conn.cursor()
-
-    def register(self, user: User):
-        self.cursor.execute(
-            """
-            SELECT occupation_name 
-            FROM occupation 
-            WHERE id = ?
-            """,
-            (user.occupation,),
-        )
-        occupation_name = self.cursor.fetchone()
-        if occupation_name:
+        self.password_hasher = password_hasher
+        self.pool = pool
+        self.reference = reference_data
+
+    def register(self, user: User, hashed_password: str = None):
+        # 직업은 메모리의 참조 데이터로 확인하므로 쓰기 트랜잭션 안에서 occupation 을 읽지 않습니다.
+        if self.reference.occupation_name(user.occupation) is None:
+            # 직업명에 해당하는 id를 찾을 수 없는 경우 에러 처리
+            raise ValueError("Invalid occupation")
+        # bcrypt 는 수백 ms 가 걸리므로 쓰기 잠금을 잡기 전에 해싱합니다.
+        if hashed_password is None:
             hashed_password = self.hash_password(user.password)
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            # 같은 쓰기 트랜잭션 안에서 확인하므로 동시 가입이 서로를 놓치지 않습니다.
+            cursor.execute(
+                """
+                SELECT 1
+                FROM user
+                WHERE email = ?
+                    OR nickname = ?
+                """,
+                (user.email, user.nickname),
+            )
+            if cursor.fetchone():
+                raise ValueError("Email or nickname already registered")
             # 검색된 직업 id와 함께 사용자 정보를 삽입하는 쿼리 실행
-            self.cursor.execute(
+            cursor.execute(
                 """
                 INSERT INTO user (username, email, password, nickname, occupation_id) 
                 VALUES (?, ?, ?, ?, ?)
@@ -40,28 +60,28 @@ class UserRepository:
                     user.occupation,
                 ),
             )
-            self.conn.commit()
-        else:
-            # 직업명에 해당하는 id를 찾을 수 없는 경우 에러 처리
-            raise ValueError("Invalid occupation")
+            conn.commit()
 
     def get_user_info(self, email: str) -> UserInfo:
-        self.cursor.execute(
-            """
-            SELECT u.username, u.nickname, u.email, o.occupation_name, u.created_at, u.modified_at 
-            FROM user u 
-            JOIN occupation o ON u.occupation_id = o.id 
-            WHERE u.email=?
-            """,
-            (email,),
-        )
-        user = self.cursor.fetchone()
-        if user:
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT u.username, u.nickname, u.email, u.occupation_id, u.created_at, u.modified_at 
+                FROM user u 
+                WHERE u.email=?
+                """,
+                (email,),
+            )
+            user = cursor.fetchone()
+        # 직업 이름은 occupation 을 JOIN 하지 않고 참조 데이터에서 찾습니다. 직업이 없는 사용자는 JOIN 때처럼 None 입니다.
+        occupation_name = self.reference.occupation_name(user[3]) if user else None
+        if occupation_name is not None:
             return UserInfo(
                 username=user[0],
                 nickname=user[1],
                 email=user[2],
-                occupation_name=user[3],
+                occupation_name=occupation_name,
                 created_at=user[4],
                 modified_at=user[5],
             )
@@ -70,20 +90,16 @@ class UserRepository:
     def update_user_info(
         self, email: str, username: str, nickname: str, occupation_name: str
     ) -> None:
-        # 직업 이름으로부터 직업 ID를 가져오는 쿼리 실행
-        self.cursor.execute(
-            """
-            SELECT id 
-            FROM occupation 
-            WHERE occupation_name=?
-            """,
-            (occupation_name,),
-        )
-        occupation_id = self.cursor.fetchone()[0]
+        # 직업 이름으로부터 직업 ID를 참조 데이터에서 가져옵니다.
+        occupation_id = self.reference.occupation_id(occupation_name)
+        if occupation_id is None:
+            # 직업명에 해당하는 id를 찾을 수 없는 경우 에러 처리
+            raise ValueError("Invalid occupation")
         # 사용자 정보 업데이트
-        if occupation_id:
-            modified_at = datetime.now().strftime("%Y-%m-%d %H:%M")
-            self.cursor.execute(
+        modified_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
                 """
                 UPDATE user
                 SET username=?, nickname=?, occupation_id=?, modified_at=?
@@ -91,50 +107,67 @@ class UserRepository:
                 """,
                 (username, nickname, occupation_id, modified_at, email),
             )
-            self.conn.commit()
-        else:
-            # 직업명에 해당하는 id를 찾을 수 없는 경우 에러 처리
-            raise ValueError("Invalid occupation")
+            conn.commit()
 
-    def update_user_password(self, email: str, new_password: str) -> None:
+    def update_user_password(
+        self, email: str, new_password: str, hashed_password: str = None
+    ) -> None:
         # 새로운 비밀번호를 해싱합니다.
-        hashed_password = self.hash_password(new_password)
+        if hashed_password is None:
+            hashed_password = self.hash_password(new_password)
         # 수정된 날짜를 현재 시간으로 설정합니다.
         modified_at = datetime.now().strftime("%Y-%m-%d %H:%M")
-        # 사용자 비밀번호와 수정된 날짜를 업데이트합니다.
-        self.cursor.execute(
-            """
-            UPDATE user
-            SET password=?, modified_at=?
-            WHERE email=?
-            """,
-            (hashed_password, modified_at, email),
-        )
-        self.conn.commit()
+        # 사용자 비밀번호와 수정된 날짜를 업데이트하고, 이전에 로그인한 refresh token 은 모두 무효로 합니다.
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE user
+                SET password=?, modified_at=?, tokens_valid_after=?
+                WHERE email=?
+                """,
+                (hashed_password, modified_at, time.time(), email),
+            )
+            conn.commit()
 
     def withdrawal(self, email: str):
-        self.cursor.execute(
-            """
-            UPDATE user
-            SET activate=0, deleted_at=?
-            WHERE email=?
-            """,
-            (datetime.now().strftime("%Y-%m-%d %H:%M"), email),
-        )
-        self.conn.commit()
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE user
+                SET activate=0, deleted_at=?
+                WHERE email=?
+                """,
+                (datetime.now().strftime("%Y-%m-%d %H:%M"), email),
+            )
+            conn.commit()
+        self.invalidate_user(email)
+
+    def invalidate_user(self, email: str):
+        # 이메일이 바뀌거나 탈퇴한 사용자는 캐시에서 제거합니다.
+        userid_cache.delete(email)
 
     def authenticate(self, email: str, password: str):
-        self.cursor.execute(
-            """
-            SELECT * 
-            FROM user 
-            WHERE email=? 
-                AND activate=1
-            """,
-            (email,),
-        )
-        user = self.cursor.fetchone()
-        if user and self.verify_password(password, user[4]):
+        user = self.get_active_user(email)
+        if user and self.verify_password(password, user.password):
+            return user
+        return None
+
+    def get_active_user(self, email: str):
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT * 
+                FROM user 
+                WHERE email=? 
+                    AND activate=1
+                """,
+                (email,),
+            )
+            user = cursor.fetchone()
+        if user:
             return User(
                 username=user[1],
                 nickname=user[2],
@@ -145,30 +178,81 @@ class UserRepository:
         return None
 
     def get_userid_by_email(self, email):
-        self.cursor.execute(
-            """
-            SELECT id
-            FROM user
-            WHERE email = ?
-            """,
-            (email,),
-        )
-        userid = self.cursor.fetchone()
+        cached = userid_cache.get(email)
+        if cached is not None:
+            return cached
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT id
+                FROM user
+                WHERE email = ?
+                    AND activate = 1
+                """,
+                (email,),
+            )
+            userid = cursor.fetchone()
+        # 없거나 탈퇴한 사용자는 캐시하지 않습니다.
+        if userid is None:
+            return None
+        userid_cache.set(email, userid[0])
         return userid[0]
 
-    def update_refresh_token(self, email: str, refresh_token: str):
-        self.cursor.execute(
-            """
-            UPDATE user 
-            SET refresh_token=? 
-            WHERE email=?
-            """,
-            (refresh_token, email),
-        )
-        self.conn.commit()
-
     def hash_password(self, password: str):
-        return self.pwd_context.hash(password)
+        return self.password_hasher.hash_sync(password)
 
     def verify_password(self, plain_password, hashed_password):
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return self.password_hasher.verify_sync(plain_password, hashed_password)
+
+
+class AsyncUserRepository:
+    def __init__(self, user_repository: UserRepository = None):
+        self.user_repository = user_repository or UserRepository()
+        self.password_hasher = self.user_repository.password_hasher
+
+    async def register(self, user: User):
+        hashed_password = await self.password_hasher.hash(user.password)
+        return await run_sync(self.user_repository.register, user, hashed_password)
+
+    async def get_user_info(self, email: str) -> UserInfo:
+        return await run_sync(self.user_repository.get_user_info, email)
+
+    async def update_user_info(
+        self, email: str, username: str, nickname: str, occupation_name: str
+    ) -> None:
+        return await run_sync(
+            self.user_repository.update_user_info,
+            email,
+            username,
+            nickname,
+            occupation_name,
+        )
+
+    async def update_user_password(self, email: str, new_password: str) -> None:
+        hashed_password = await self.password_hasher.hash(new_password)
+        return await run_sync(
+            self.user_repository.update_user_password,
+            email,
+            new_password,
+            hashed_password,
+        )
+
+    async def withdrawal(self, email: str):
+        return await run_sync(self.user_repository.withdrawal, email)
+
+    async def authenticate(self, email: str, password: str):
+        user = await self.get_active_user(email)
+        if user and await self.password_hasher.verify(password, user.password):
+            return user
+        return None
+
+    async def get_active_user(self, email: str):
+        return await run_sync(self.user_repository.get_active_user, email)
+
+    async def get_userid_by_email(self, email):
+        # 캐시에 있으면 DB 스레드로 넘기지 않고 바로 반환합니다.
+        cached = userid_cache.get(email)
+        if cached is not None:
+            return cached
+        return await run_sync(self.user_repository.get_userid_by_email, email)
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+from app.database.connection import pool
+from app.database.executor import run_sync
+
+# 만료된 토큰 가족을 지우는 주기(초). 0 이면 지우지 않습니다.
+TOKEN_SWEEP_SECONDS = float(os.environ.get("TOKEN_SWEEP_SECONDS", "3600"))
+
+# rotate() 가 거절한 이유
+TOKEN_REVOKED = "revoked"
+TOKEN_REUSED = "reused"
+
+logger = logging.getLogger("app.database")
+
+
+class TokenRepository:
+    # 로그인 한 번이 하나의 토큰 가족(family)입니다. 로그인할 때는 아무것도 쓰지 않고,
+    # 가족의 refresh token 이 처음 교환될 때 (가족 id, 현재 세대) 한 행이 생깁니다.
+    def __init__(self):
+        self.pool = pool
+
+    def rotate(
+        self, email: str, family: str, generation: int, auth_time: float, expires_at: float
+    ) -> Optional[str]:
+        # generation 세대의 토큰을 다음 세대로 바꿉니다. 성공하면 None, 아니면 거절한 이유를 돌려줍니다.
+        # 쓰기 잠금을 잡고 확인하므로 같은 토큰으로 동시에 요청해도 하나만 성공합니다.
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT activate, tokens_valid_after
+                FROM user
+                WHERE email = ?
+                """,
+                (email,),
+            )
+            user = cursor.fetchone()
+            # 탈퇴했거나, 로그인 뒤에 비밀번호가 바뀐 경우입니다.
+            if not user or not user[0] or (user[1] is not None and auth_time < user[1]):
+                return TOKEN_REVOKED
+            cursor.execute(
+                """
+                SELECT generation, revoked
+                FROM token_family
+                WHERE id = ?
+                """,
+                (family,),
+            )
+            row = cursor.fetchone()
+            if row and row[1]:
+                return TOKEN_REVOKED
+            if generation != (row[0] if row else 0):
+                # 이미 교환된 토큰이 다시 쓰였습니다. 도난으로 보고 가족 전체를 폐기합니다.
+                self._revoke(conn, family, expires_at)
+                conn.commit()
+                return TOKEN_REUSED
+            cursor.execute(
+                """
+                INSERT INTO token_family (id, generation, expires_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET generation = excluded.generation, expires_at = excluded.expires_at
+                """,
+                (family, generation + 1, expires_at),
+            )
+            conn.commit()
+        return None
+
+    def revoke(self, family: str, expires_at: float) -> None:
+        # 로그아웃. 폐기 표시는 가족의 토큰이 모두 만료될 때까지만 남겨 둡니다.
+        with self.pool.transaction() as conn:
+            self._revoke(conn, family, expires_at)
+            conn.commit()
+
+    def _revoke(self, conn, family: str, expires_at: float) -> None:
+        conn.execute(
+            """
+            INSERT INTO token_family (id, generation, revoked, expires_at)
+            VALUES (?, 0, 1, ?)
+            ON CONFLICT (id) DO UPDATE SET revoked = 1, expires_at = MAX(expires_at, excluded.expires_at)
+            """,
+            (family, expires_at),
+        )
+
+    def sweep(self, now: float = None) -> int:
+        # 만료된 가족은 토큰 서명 검증에서 이미 걸러지므로 지워도 됩니다.
+        with self.pool.transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                DELETE FROM token_family
+                WHERE expires_at < ?
+                """,
+                (time.time() if now is None else now,),
+            )
+            conn.commit()
+        return cursor.rowcount
+
+    async def sweep_expired(self, interval: float = TOKEN_SWEEP_SECONDS) -> None:
+        while interval > 0:
+            await asyncio.sleep(interval)
+            try:
+                await run_sync(self.sweep)
+            except Exception:
+                logger.exception("token family sweep failed")
+
+
+class AsyncTokenRepository:
+    def __init__(self, token_repository: TokenRepository = None):
+        self.token_repository = token_repository or TokenRepository()
+
+    async def rotate(
+        self, email: str, family: str, generation: int, auth_time: float, expires_at: float
+    ) -> Optional[str]:
+        return await run_sync(
+            self.token_repository.rotate, email, family, generation, auth_time, expires_at
+        )
+
+    async def revoke(self, family: str, expires_at: float) -> None:
+        return await run_sync(self.token_repository.revoke, family, expires_at)
+
@@ -1,49 +1,108 @@
+import secrets
+import time
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
-from fastapi import Depends
-from app.user.repository.repository import UserRepository
+from fastapi import Depends, HTTPException
+from app.user.repository.repository import AsyncUserRepository
+from app.user.repository.password import PasswordQueueFullError
+from app.user.repository.token import AsyncTokenRepository, TOKEN_REUSED
 from app.user.dto.dto import User, UserInfo
-from jose import jwt
+from app.cache.lru import LRUCache
+from jose import JWTError, jwt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login/")
 
+# 검증이 끝난 토큰 -> email 매핑. 각 항목은 토큰의 exp 시각에 만료됩니다.
+token_cache = LRUCache(maxsize=10000)
+
 
 class UserService:
     def __init__(self):
-        self.user_repository = UserRepository()
+        self.user_repository = AsyncUserRepository()
+        self.token_repository = AsyncTokenRepository()
         self.ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 12  # 12 hours
         self.REFRESH_TOKEN_EXPIRE_SECONDS = 60 * 60 * 24 * 30  # 1 month
         self.SECRET_KEY = "asdasdqweasdqwea"
         self.ALGORITHM = "HS256"
 
-    def register(self, user: User):
-        return self.user_repository.register(user)
+    async def register(self, user: User):
+        try:
+            return await self.user_repository.register(user)
+        except PasswordQueueFullError:
+            raise self.password_queue_full()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    def get_user_info(self, email: str) -> UserInfo:
-        return self.user_repository.get_user_info(email)
+    async def get_user_info(self, email: str) -> UserInfo:
+        return await self.user_repository.get_user_info(email)
 
-    def update_user_info(
+    async def update_user_info(
         self, email: str, username: str, nickname: str, occupation_name: str
     ) -> None:
-        return self.user_repository.update_user_info(
-            email, username, nickname, occupation_name
-        )
+        try:
+            return await self.user_repository.update_user_info(
+                email, username, nickname, occupation_name
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
-    def update_user_password(self, email: str, new_password: str) -> None:
-        return self.user_repository.update_user_password(email, new_password)
+    async def update_user_password(self, email: str, new_password: str) -> None:
+        try:
+            return await self.user_repository.update_user_password(
+                email, new_password
+            )
+        except PasswordQueueFullError:
+            raise self.password_queue_full()
 
-    def withdrawal(self, email: str):
-        return self.user_repository.withdrawal(email)
+    async def withdrawal(self, email: str):
+        result = await self.user_repository.withdrawal(email)
+        # 탈퇴한 사용자의 access token 이 캐시에서 계속 email 로 풀리지 않게 합니다.
+        token_cache.delete_value(email)
+        return result
 
-    def authenticate(self, email: str, password: str):
-        return self.user_repository.authenticate(email, password)
+    async def authenticate(self, email: str, password: str):
+        try:
+            return await self.user_repository.authenticate(email, password)
+        except PasswordQueueFullError:
+            raise self.password_queue_full()
 
-    def get_userid_by_email(self, token: str = Depends(oauth2_scheme)):
+    async def get_userid_by_email(self, token: str = Depends(oauth2_scheme)):
         email = self.get_email_from_token(token)
-        return self.user_repository.get_userid_by_email(email)
+        user_id = await self.user_repository.get_userid_by_email(email)
+        if user_id is None:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return user_id
+
+    async def refresh(self, refresh_token: str) -> dict:
+        # 비밀번호 확인 없이 refresh token 을 새 access token 과 다음 세대 refresh token 으로 바꿉니다.
+        payload = self.decode_refresh_token(refresh_token)
+        email, family, generation = payload["sub"], payload["fam"], payload["gen"]
+        refresh_token = self.create_refresh_token(email, family, generation + 1, payload["auth_time"])
+        rejected = await self.token_repository.rotate(
+            email, family, generation, payload["auth_time"], self.refresh_token_expires_at()
+        )
+        if rejected == TOKEN_REUSED:
+            raise HTTPException(status_code=401, detail="Refresh token reuse detected, please log in again")
+        if rejected:
+            raise HTTPException(status_code=401, detail="Refresh token revoked")
+        return {
+            "access_token": self.create_access_token(email),
+            "token_type": "bearer",
+            "refresh_token": refresh_token,
+        }
 
-    def update_refresh_token(self, email: str, refresh_token: str):
-        return self.user_repository.update_refresh_token(email, refresh_token)
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
+        # 로그아웃. 같은 로그인에서 나온 refresh token 을 모두 폐기합니다.
+        payload = self.decode_refresh_token(refresh_token)
+        await self.token_repository.revoke(payload["fam"], payload["exp"])
+
+    def password_queue_full(self):
+        # 비밀번호 해싱 대기열이 가득 차면 잠시 후 다시 시도하도록 안내합니다.
+        return HTTPException(
+            status_code=503,
+            detail="Too many password requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
 
     def create_access_token(self, username: str):
         data = {
@@ -54,15 +113,46 @@ class UserService:
         access_token = jwt.encode(data, self.SECRET_KEY, algorithm=self.ALGORITHM)
         return access_token
 
-    def create_refresh_token(self, username: str):
+    def create_refresh_token(
+        self, username: str, family: str = None, generation: int = 0, auth_time: float = None
+    ):
+        # 로그인할 때마다 새 가족을 만듭니다. 교환할 때는 같은 가족의 다음 세대를 발급합니다.
+        now = time.time()
         data = {
             "sub": username,
-            "exp": datetime.utcnow()
-            + timedelta(minutes=self.REFRESH_TOKEN_EXPIRE_SECONDS),
+            "typ": "refresh",
+            "fam": family or secrets.token_urlsafe(12),
+            "gen": generation,
+            "auth_time": now if auth_time is None else auth_time,
+            "exp": self.refresh_token_expires_at(now),
         }
         refresh_token = jwt.encode(data, self.SECRET_KEY, algorithm=self.ALGORITHM)
         return refresh_token
 
+    def refresh_token_expires_at(self, now: float = None) -> float:
+        return (time.time() if now is None else now) + self.REFRESH_TOKEN_EXPIRE_SECONDS
+
+    def decode_refresh_token(self, refresh_token: str) -> dict:
+        try:
+            payload = jwt.decode(refresh_token, self.SECRET_KEY, self.ALGORITHM)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        if payload.get("typ") != "refresh" or not all(
+            key in payload for key in ("sub", "fam", "gen", "auth_time")
+        ):
+            raise HTTPException(status_code=401, detail="Invalid refresh token")
+        return payload
+
     def get_email_from_token(self, token: str = Depends(oauth2_scheme)):
+        email = token_cache.get(token)
+        if email is not None:
+            return email
         payload = jwt.decode(token, self.SECRET_KEY, self.ALGORITHM)
-        return payload.get("sub")
+        # refresh token 은 교환에만 쓸 수 있습니다.
+        if payload.get("typ") == "refresh":
+            raise HTTPException(status_code=401, detail="Invalid token")
+        email = payload.get("sub")
+        expires_in = payload.get("exp", 0) - time.time()
+        if email and expires_in > 0:
+            token_cache.set(token, email, ttl=expires_in)
+        return email
@@ -0,0 +1,445 @@
+"""합성 DB 위에서 api/*/routes.py 의 모든 라우트를 프로세스 안 ASGI 클라이언트로 호출합니다.
+
+    python bench/endpoints.py --scale small --requests 200 --concurrency 8 --out api.json
+    python bench/endpoints.py --only "GET /boards/"
+
+bench/seed.py 로 임시 DB를 만들고, 삭제/승인처럼 한 번만 성공하는 라우트가 쓸 행을
+요청 수만큼 미리 넣은 뒤 엔드포인트별로 처리량과 p50/p95/p99(ms)를 JSON 으로 출력합니다.
+bcrypt 를 거치는 라우트(/signup/, /login/, 비밀번호 변경, 탈퇴)는 --bcrypt-requests 만큼만 호출하고,
+엔드포인트마다 --repeat 번 실행한 값의 중앙값을 보고합니다.
+시나리오가 없는 라우트가 있으면 결과의 "uncovered" 에 적고 종료 코드 1로 끝납니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from seed import PASSWORD, ROOT, add_scale_arguments, scale_from_args, seed
+from stats import summarize
+
+
+class Endpoint(NamedTuple):
+    method: str
+    path: str
+    # (fixtures, i) -> httpx 요청 인자
+    build: Callable[["Fixtures", int], dict]
+    bcrypt: bool = False
+    expect: tuple = (200, 201, 204)
+    variant: str = ""
+    # 이 경로의 현재 ETag 를 받아 둔 뒤 실행합니다(If-None-Match 시나리오).
+    etag_from: str = ""
+
+    @property
+    def label(self) -> str:
+        route = f"{self.method} {self.path}"
+        return f"{route} [{self.variant}]" if self.variant else route
+
+
+class Fixtures:
+    """라우트 호출에 필요한 id 와 한 번씩만 쓸 수 있는 행을 준비합니다."""
+
+    def __init__(self, database: str, scale: Dict[str, int], requests: int, bcrypt_requests: int):
+        self.scale = scale
+        self.rng = random.Random(1)
+        self.tokens: Dict[str, str] = {}
+        self.etags: Dict[str, str] = {}
+        users = scale["users"]
+        conn = sqlite3.connect(database)
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        def insert(sql, params) -> int:
+            return conn.execute(sql, params).lastrowid
+
+        def group(name, admin) -> int:
+            group_id = insert(
+                'INSERT INTO "group" (name, description, created_at) VALUES (?, ?, datetime(\'now\'))',
+                (name, name),
+            )
+            member(admin, group_id, "ADMIN")
+            return group_id
+
+        def member(user_id, group_id, role) -> int:
+            return insert(
+                "INSERT INTO group_member (user_id, group_id, role, created_at) VALUES (?, ?, ?, datetime('now'))",
+                (user_id, group_id, role),
+            )
+
+        def board(user_id) -> int:
+            return insert(
+                "INSERT INTO board (title, content, category_id, category_type, user_id) VALUES ('bench', 'bench', 1, 'QNA', ?)",
+                (user_id,),
+            )
+
+        def user(prefix, i) -> str:
+            hashed = conn.execute("SELECT password FROM user WHERE id = 1").fetchone()[0]
+            email = f"{prefix}{i}@bench.test"
+            insert(
+                "INSERT INTO user (username, nickname, email, password, occupation_id) VALUES (?, ?, ?, ?, 1)",
+                (f"{prefix}{i}", f"{prefix}-nick{i}", email, hashed),
+            )
+            return email
+
+        # 시드 데이터에서 사용자 1 은 그룹 1 의 관리자입니다(조회 라우트용).
+        self.actor = 1
+        self.admin_group = 1
+        # 승인/거절 라우트가 소비할 PENDING 요청은 조회 결과가 커지지 않도록 별도 그룹에 둡니다.
+        self.moderated_group = group("bench-moderated", self.actor)
+        self.batch = 10
+        self.pending = {
+            name: [
+                member(self.rng.randint(2, users), self.moderated_group, "PENDING")
+                for _ in range(count)
+            ]
+            for name, count in (
+                ("approve", requests),
+                ("deny", requests),
+                ("approve_batch", requests * self.batch),
+                ("deny_batch", requests * self.batch),
+            )
+        }
+        # 역할 변경을 반복할 멤버와, 탈퇴/강퇴될 멤버
+        self.promoted = self.rng.randint(2, users)
+        member(self.promoted, self.moderated_group, "MEMBER")
+        self.leaving_group = group("bench-withdrawal", self.actor)
+        self.leaving = list(range(2, 2 + min(requests, users - 1)))
+        for user_id in self.leaving:
+            member(user_id, self.leaving_group, "MEMBER")
+        self.removed_group = group("bench-removal", self.actor)
+        self.removed = list(range(2, 2 + min(requests, users - 1)))
+        for user_id in self.removed:
+            member(user_id, self.removed_group, "MEMBER")
+        self.deleted_groups = [group(f"bench-delete-{i}", self.actor) for i in range(requests)]
+        # 사용자 1 의 대기 중 가입 요청(GET /member_requests/{user_id})
+        member(self.actor, 2 if scale["groups"] >= 2 else self.leaving_group, "PENDING")
+
+        self.own_board = board(self.actor)
+        self.deleted_boards = [board(self.actor) for _ in range(requests)]
+        self.own_comment = insert(
+            "INSERT INTO board_comment (content, user_id, board_id) VALUES ('bench', ?, ?)",
+            (self.actor, self.own_board),
+        )
+        self.deleted_comments = [
+            insert(
+                "INSERT INTO board_comment (content, user_id, board_id) VALUES ('bench', ?, ?)",
+                (self.actor, self.own_board),
+            )
+            for _ in range(requests)
+        ]
+        # 비밀번호 변경/탈퇴는 한 사용자당 한 번씩만 호출합니다.
+        self.password_users = [user("password", i) for i in range(bcrypt_requests)]
+        self.withdrawing_users = [user("withdraw", i) for i in range(bcrypt_requests)]
+        conn.commit()
+        conn.close()
+
+    def email(self, user_id: int) -> str:
+        return f"user{user_id}@bench.test"
+
+    def auth(self, user_id: Optional[int] = None, email: Optional[str] = None) -> dict:
+        from app.user.service.service import UserService
+
+        key = email or self.email(user_id or self.actor)
+        if key not in self.tokens:
+            self.tokens[key] = UserService().create_access_token(key)
+        return {"Authorization": f"Bearer {self.tokens[key]}"}
+
+    def refresh_token(self, i: int) -> str:
+        # 요청마다 새로 로그인한 것과 같은 토큰을 만듭니다. 한 번 교환한 토큰은 다시 쓸 수 없습니다.
+        from app.user.service.service import UserService
+
+        return UserService().create_refresh_token(self.email(i % self.scale["users"] + 1))
+
+    def board_id(self) -> int:
+        return self.rng.randint(1, self.scale["boards"])
+
+    def group_id(self) -> int:
+        return self.rng.randint(1, self.scale["groups"])
+
+    def export_window(self) -> dict:
+        # 게시글은 2024-01-01 부터 1분 간격으로 만들어지므로 한 시간 범위에는 게시글 60개와 그 댓글이 들어갑니다.
+        start = datetime(2024, 1, 1) + timedelta(minutes=self.board_id())
+        return {"created_from": start.isoformat(), "created_to": (start + timedelta(hours=1)).isoformat()}
+
+
+def import_file(f: "Fixtures", i: int) -> dict:
+    # 새 사용자 하나가 새 그룹을 만들고 기존 사용자 10명이 들어오는 코호트 파일입니다.
+    email = f"import{i}@bench.test"
+    records = [
+        {"type": "user", "username": f"import{i}", "nickname": f"import-nick{i}", "email": email,
+         "password": PASSWORD, "occupation": "1"},
+        {"type": "group", "name": f"import-{i}", "description": "bench", "admin": email},
+    ] + [
+        {"type": "member", "group": f"import-{i}", "email": f.email(user_id)}
+        for user_id in f.rng.sample(range(1, f.scale["users"] + 1), min(10, f.scale["users"]))
+    ]
+    body = "".join(json.dumps(record) + "\n" for record in records)
+    return dict(headers=f.auth(), files={"file": ("cohort.ndjson", body.encode(), "application/x-ndjson")})
+
+
+def board_body(i: int) -> dict:
+    return {"title": f"bench {i}", "content": "bench " * 20, "category_id": 1, "category_type": "QNA"}
+
+
+ENDPOINTS: List[Endpoint] = [
+    # user
+    Endpoint("POST", "/signup/", lambda f, i: dict(json={
+        "username": f"signup{i}", "nickname": f"signup-nick{i}",
+        "email": f"signup{i}@bench.test", "password": PASSWORD, "occupation": 1,
+    }), bcrypt=True),
+    Endpoint("POST", "/login/", lambda f, i: dict(data={
+        "username": f.email(f.rng.randint(1, f.scale["users"])), "password": PASSWORD,
+    }), bcrypt=True),
+    Endpoint("POST", "/token/refresh/", lambda f, i: dict(json={"refresh_token": f.refresh_token(i)})),
+    Endpoint("POST", "/token/revoke/", lambda f, i: dict(json={"refresh_token": f.refresh_token(i)})),
+    Endpoint("GET", "/user/info/", lambda f, i: dict(headers=f.auth())),
+    Endpoint("POST", "/user/info/", lambda f, i: dict(headers=f.auth(), json={
+        "username": "user1", "nickname": "nick1", "email": f.email(1), "occupation_name": "개발자",
+    })),
+    Endpoint("PUT", "/user/password/", lambda f, i: dict(
+        headers=f.auth(email=f.password_users[i]),
+        params={"current_password": PASSWORD, "new_password": PASSWORD + "!"},
+    ), bcrypt=True),
+    Endpoint("DELETE", "/user/withdrawal/", lambda f, i: dict(
+        headers=f.auth(email=f.withdrawing_users[i]), params={"password": PASSWORD},
+    ), bcrypt=True),
+    # group
+    Endpoint("POST", "/group/", lambda f, i: dict(headers=f.auth(), json={
+        "name": f"bench-created-{i}", "description": "bench", "created_at": "2024-01-01T00:00:00",
+    })),
+    Endpoint("GET", "/mygroup/", lambda f, i: dict(headers=f.auth(f.rng.randint(1, f.scale["groups"])))),
+    Endpoint("DELETE", "/mygroup/", lambda f, i: dict(
+        headers=f.auth(), params={"group_id": f.deleted_groups[i]},
+    )),
+    Endpoint("POST", "/member_requests/", lambda f, i: dict(
+        headers=f.auth(f.rng.randint(1, f.scale["users"])), params={"group_id": f.group_id()},
+    )),
+    Endpoint("GET", "/member_requests/{user_id}", lambda f, i: dict(
+        url=f"/member_requests/{f.actor}", headers=f.auth(),
+    )),
+    Endpoint("GET", "/member_requests/", lambda f, i: dict(
+        headers=f.auth(), params={"group_id": f.admin_group},
+    )),
+    Endpoint("PUT", "/member_requests/", lambda f, i: dict(params={"request_id": f.pending["approve"][i]})),
+    Endpoint("DELETE", "/member_requests/deny_request/", lambda f, i: dict(
+        params={"request_id": f.pending["deny"][i]},
+    )),
+    Endpoint("PUT", "/member_requests/batch/", lambda f, i: dict(headers=f.auth(), json={
+        "group_id": f.moderated_group,
+        "request_ids": f.pending["approve_batch"][i * f.batch:(i + 1) * f.batch],
+    })),
+    Endpoint("POST", "/member_requests/deny_request/batch/", lambda f, i: dict(headers=f.auth(), json={
+        "group_id": f.moderated_group,
+        "request_ids": f.pending["deny_batch"][i * f.batch:(i + 1) * f.batch],
+    })),
+    Endpoint("GET", "/group/members", lambda f, i: dict(
+        headers=f.auth(), params={"group_id": f.admin_group},
+    )),
+    Endpoint("DELETE", "/group/group_withdrawal", lambda f, i: dict(
+        headers=f.auth(f.leaving[i % len(f.leaving)]), params={"group_id": f.leaving_group},
+    )),
+    Endpoint("DELETE", "/group/remove_member", lambda f, i: dict(json={
+        "role": "ADMIN", "group_id": f.removed_group, "user_id": f.removed[i % len(f.removed)],
+    })),
+    Endpoint("GET", "/group/", lambda f, i: dict()),
+    Endpoint("GET", "/group/", lambda f, i: dict(params={"name": "그룹 1"}), variant="search"),
+    Endpoint("GET", "/group/", lambda f, i: dict(
+        headers={"If-None-Match": f.etags["/group/"]},
+    ), expect=(304,), variant="304", etag_from="/group/"),
+    Endpoint("PUT", "/group/{group_id}/{user_id}/ad", lambda f, i: dict(
+        url=f"/group/{f.moderated_group}/{f.promoted}/{'ad' if i % 2 == 0 else 'mem'}",
+        params={"role": "ADMIN"},
+    )),
+    Endpoint("PUT", "/group/{group_id}/{user_id}/mem", lambda f, i: dict(
+        url=f"/group/{f.moderated_group}/{f.promoted}/{'mem' if i % 2 == 0 else 'ad'}",
+        params={"role": "ADMIN"},
+    )),
+    # board
+    Endpoint("POST", "/boards/", lambda f, i: dict(headers=f.auth(), json=board_body(i))),
+    Endpoint("GET", "/boards/", lambda f, i: dict()),
+    Endpoint("GET", "/boards/", lambda f, i: dict(params={"category_type": "FREE", "preview": 100}), variant="category"),
+    Endpoint("GET", "/boards/", lambda f, i: dict(
+        headers={"If-None-Match": f.etags["/boards/"]},
+    ), expect=(304,), variant="304", etag_from="/boards/"),
+    Endpoint("GET", "/boards/export/", lambda f, i: dict(headers=f.auth(), params=f.export_window())),
+    Endpoint("GET", "/boards/export/", lambda f, i: dict(
+        headers=f.auth(), params={"category_type": "FREE", **f.export_window()},
+    ), variant="category"),
+    Endpoint("GET", "/boards/{board_id}/", lambda f, i: dict(url=f"/boards/{f.board_id()}/")),
+    Endpoint("GET", "/boards/{board_id}/", lambda f, i: dict(
+        url=f"/boards/{f.board_id()}/", params={"include": "comments"},
+    ), variant="comments"),
+    Endpoint("PUT", "/boards/{board_id}/", lambda f, i: dict(
+        url=f"/boards/{f.own_board}/", headers=f.auth(), json=board_body(i),
+    )),
+    Endpoint("DELETE", "/boards/{board_id}/", lambda f, i: dict(
+        url=f"/boards/{f.deleted_boards[i]}/", headers=f.auth(),
+    )),
+    Endpoint("POST", "/boards/{board_id}/comments/", lambda f, i: dict(
+        url=f"/boards/{f.board_id()}/comments/", headers=f.auth(), json={"content": f"bench {i}"},
+    )),
+    Endpoint("GET", "/boards/{board_id}/comments/", lambda f, i: dict(url=f"/boards/{f.board_id()}/comments/")),
+    Endpoint("GET", "/comments/export/", lambda f, i: dict(headers=f.auth(), params=f.export_window())),
+    Endpoint("GET", "/comments/export/", lambda f, i: dict(
+        headers=f.auth(), params={"category_type": "FREE", **f.export_window()},
+    ), variant="category"),
+    Endpoint("PUT", "/comments/{comment_id}/", lambda f, i: dict(
+        url=f"/comments/{f.own_comment}/", headers=f.auth(), json={"content": f"bench {i}"},
+    )),
+    Endpoint("DELETE", "/comments/{comment_id}/", lambda f, i: dict(
+        url=f"/comments/{f.deleted_comments[i]}/", headers=f.auth(),
+    )),
+    Endpoint("GET", "/metrics", lambda f, i: dict()),
+    # import
+    Endpoint("POST", "/import/", import_file, bcrypt=True),
+]
+
+
+def uncovered_routes(app, endpoints: List[Endpoint]) -> List[str]:
+    from fastapi.routing import APIRoute
+
+    covered = {(e.method, e.path) for e in endpoints}
+    return sorted(
+        f"{method} {route.path}"
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+        if (method, route.path) not in covered
+    )
+
+
+async def drive(http, fixtures: Fixtures, endpoint: Endpoint, requests: int, concurrency: int, offset: int) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    errors = 0
+    # 반복 실행마다 한 번씩만 쓸 수 있는 행의 다른 구간을 씁니다.
+    counter = iter(range(offset, offset + requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            kwargs = endpoint.build(fixtures, i)
+            url = kwargs.pop("url", endpoint.path)
+            started = time.perf_counter()
+            try:
+                response = await http.request(endpoint.method, url, **kwargs)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[str(status)] += 1
+            if status not in endpoint.expect:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result = summarize(latencies, time.perf_counter() - started)
+    result["errors"] = errors
+    result["statuses"] = dict(statuses)
+    return result
+
+
+def median_of(runs: List[dict]) -> dict:
+    # 반복 실행의 중앙값을 써서 쓰기 잠금 대기 같은 일시적인 꼬리 지연에 덜 흔들리게 합니다.
+    merged = {
+        key: statistics.median(run[key] for run in runs)
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+    }
+    merged["requests"] = sum(run["requests"] for run in runs)
+    merged["errors"] = sum(run["errors"] for run in runs)
+    merged["statuses"] = dict(sum((Counter(run["statuses"]) for run in runs), Counter()))
+    return merged
+
+
+async def run(
+    fixtures: Fixtures, endpoints: List[Endpoint], requests: int, bcrypt_requests: int, concurrency: int, repeat: int
+) -> dict:
+    import httpx
+    import main
+
+    results = {}
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.lifespan(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            for endpoint in endpoints:
+                if endpoint.etag_from:
+                    fixtures.etags[endpoint.etag_from] = (await http.get(endpoint.etag_from)).headers["ETag"]
+                count = bcrypt_requests if endpoint.bcrypt else requests
+                results[endpoint.label] = median_of([
+                    await drive(http, fixtures, endpoint, count, concurrency, r * count)
+                    for r in range(repeat)
+                ])
+                print(
+                    f"{endpoint.label:50} {results[endpoint.label]['throughput_rps']:>9} rps"
+                    f"  p95 {results[endpoint.label]['p95_ms']:>8} ms"
+                    f"  errors {results[endpoint.label]['errors']}",
+                    file=sys.stderr,
+                )
+    return {"endpoints": results, "uncovered": uncovered_routes(main.app, ENDPOINTS)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--bcrypt-requests", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3, help="엔드포인트별 반복 횟수(중앙값 보고)")
+    parser.add_argument("--only", action="append", help="라벨이 이 값으로 시작하는 엔드포인트만 실행")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    scale = scale_from_args(args)
+    endpoints = [
+        e for e in ENDPOINTS if not args.only or any(e.label.startswith(only) for only in args.only)
+    ]
+    with tempfile.TemporaryDirectory() as workdir:
+        database = os.path.join(workdir, "bench.db")
+        seed(database, **scale)
+        fixtures = Fixtures(
+            database, scale, args.requests * args.repeat, args.bcrypt_requests * args.repeat
+        )
+        # app 모듈은 import 시점에 커넥션 풀을 만들므로 DB 경로를 먼저 정합니다.
+        os.environ["SUDDEN_ATTACK_DB"] = database
+        os.environ["IMPORT_ADMINS"] = fixtures.email(fixtures.actor)
+        sys.path.insert(0, ROOT)
+        report = asyncio.run(run(fixtures, endpoints, args.requests, args.bcrypt_requests, args.concurrency, args.repeat))
+
+    report = {
+        "suite": "api",
+        "meta": {
+            "scale": scale,
+            "requests": args.requests,
+            "bcrypt_requests": args.bcrypt_requests,
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        **report,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    failed = [label for label, result in report["endpoints"].items() if result["errors"]]
+    for label in failed:
+        print(f"unexpected statuses for {label}: {report['endpoints'][label]['statuses']}", file=sys.stderr)
+    for route in report["uncovered"]:
+        print(f"no scenario for {route}", file=sys.stderr)
+    if report["uncovered"] or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
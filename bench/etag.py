@@ -0,0 +1,107 @@
+"""조건부 GET(If-None-Match → 304)과 전체 응답 경로의 지연 시간을 비교합니다.
+
+    python bench/etag.py --boards 200 --requests 2000
+
+커밋된 DB를 임시 디렉터리로 복사하고 게시글을 채운 뒤 uvicorn 서버를 띄워 측정합니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from load_latency import ROOT, percentile, wait_until_ready
+
+PATHS = [
+    ("/boards/", {"limit": 100, "preview": 200}),
+    ("/boards/1/", {"include": "comments", "comment_limit": 100}),
+    ("/group/", {"limit": 100}),
+]
+
+
+def seed(database, boards):
+    conn = sqlite3.connect(database)
+    conn.execute("INSERT OR IGNORE INTO category (type, name) VALUES ('QNA', 'bench')")
+    conn.executemany(
+        """
+        INSERT INTO board (title, content, category_id, category_type, status, user_id, created_at)
+        VALUES (?, ?, 1, 'QNA', 'UNRESOLVED', 1, datetime('now'))
+        """,
+        [(f"title {i}", "본문 " * 200) for i in range(boards)],
+    )
+    conn.executemany(
+        "INSERT INTO board_comment (content, user_id, board_id, created_at) VALUES (?, 1, 1, datetime('now'))",
+        [(f"comment {i}",) for i in range(100)],
+    )
+    conn.commit()
+    conn.close()
+
+
+async def measure(http, path, params, requests, headers=None):
+    latencies = []
+    sizes = set()
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await http.get(path, params=params, headers=headers)
+        latencies.append((time.perf_counter() - started) * 1000)
+        sizes.add((response.status_code, len(response.content)))
+    return {
+        "status_bytes": sorted(sizes),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(requests / (sum(latencies) / 1000), 1),
+    }
+
+
+async def run(base_url, requests):
+    import httpx
+
+    results = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+        await wait_until_ready(http)
+        for path, params in PATHS:
+            etag = (await http.get(path, params=params)).headers["ETag"]
+            results[path] = {
+                "full": await measure(http, path, params, requests),
+                "not_modified": await measure(
+                    http, path, params, requests, {"If-None-Match": etag}
+                ),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--boards", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="sudden-attack-bench-")
+    database = os.path.join(workdir, "sudden-attack.db")
+    shutil.copy(os.path.join(ROOT, "sudden-attack.db"), database)
+    seed(database, args.boards)
+    env = dict(os.environ, SUDDEN_ATTACK_DB=database, PYTHONPATH=ROOT)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+    )
+    try:
+        result = asyncio.run(run(f"http://127.0.0.1:{args.port}", args.requests))
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""벤치마크 결과를 저장된 기준선과 비교해 성능 회귀가 있으면 종료 코드 1로 끝납니다.
+
+    python bench/endpoints.py --scale small --out /tmp/api.json
+    python bench/micro.py --scale small --out /tmp/micro.json
+    python bench/gate.py /tmp/api.json /tmp/micro.json
+    python bench/gate.py /tmp/api.json /tmp/micro.json --update   # 기준선 갱신
+
+항목마다 p50 이 기준선보다 --tolerance 비율 이상 늘었거나 처리량이 그만큼 줄었으면 회귀로 봅니다.
+p95 는 표본 수가 적으면 흔들림이 커서 더 느슨한 --tail-tolerance 로 비교합니다.
+아주 짧은 호출의 흔들림을 거르기 위해 호출당 시간 차이가 --min-delta-ms 보다 작으면 무시합니다.
+기준선은 측정한 머신에 묶인 값이므로 다른 머신에서는 먼저 --update 로 다시 만들어야 합니다.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# 스위트별 결과 항목이 들어 있는 키
+ENTRIES = {"api": "endpoints", "micro": "methods"}
+
+
+def compare(
+    suite: str, baseline: dict, current: dict, tolerance: float, tail_tolerance: float, min_delta_ms: float
+) -> List[str]:
+    regressions = []
+    key = ENTRIES[suite]
+    for label, now in current[key].items():
+        before = baseline[key].get(label)
+        if before is None or not now["requests"] or not before["requests"]:
+            continue
+        for stat, allowed in (("p50_ms", tolerance), ("p95_ms", tail_tolerance)):
+            if now[stat] > before[stat] * (1 + allowed) and now[stat] - before[stat] > min_delta_ms:
+                regressions.append(
+                    f"{suite} {label}: {stat[:3]} {before[stat]} -> {now[stat]} ms"
+                )
+        # 처리량은 호출당 평균 시간으로 바꿔 같은 최소 차이를 적용합니다.
+        per_call_delta = 1000 / now["throughput_rps"] - 1000 / before["throughput_rps"]
+        if now["throughput_rps"] < before["throughput_rps"] * (1 - tolerance) and per_call_delta > min_delta_ms:
+            regressions.append(
+                f"{suite} {label}: throughput {before['throughput_rps']} -> {now['throughput_rps']}/s"
+            )
+    missing = sorted(set(baseline[key]) - set(current[key]))
+    for label in missing:
+        print(f"{suite} {label}: not in current results", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("results", nargs="+", help="endpoints.py / micro.py 의 --out 파일")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--tail-tolerance", type=float, default=1.0)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    parser.add_argument("--update", action="store_true", help="결과를 기준선으로 저장")
+    args = parser.parse_args()
+
+    current: Dict[str, dict] = {}
+    for path in args.results:
+        with open(path) as f:
+            result = json.load(f)
+        current[result["suite"]] = result
+
+    baseline: Dict[str, dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.update:
+        baseline.update(current)
+        with open(args.baseline, "w") as f:
+            f.write(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+        print(f"saved {', '.join(sorted(current))} baseline to {args.baseline}")
+        return
+
+    regressions = []
+    for suite, result in current.items():
+        if suite not in baseline:
+            print(f"{suite}: no baseline, skipped", file=sys.stderr)
+            continue
+        if baseline[suite]["meta"]["scale"] != result["meta"]["scale"]:
+            sys.exit(f"{suite}: scale {result['meta']['scale']} differs from baseline {baseline[suite]['meta']['scale']}")
+        regressions += compare(suite, baseline[suite], result, args.tolerance, args.tail_tolerance, args.min_delta_ms)
+
+    for regression in regressions:
+        print(regression)
+    if regressions:
+        sys.exit(1)
+    print(f"OK: no regression beyond {args.tolerance:.0%} in {', '.join(sorted(current))}")
+
+
+if __name__ == "__main__":
+    main()
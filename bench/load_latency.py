@@ -0,0 +1,116 @@
+"""uvicorn 서버를 띄우고 200개 동시 클라이언트로 그룹 API의 지연 시간 분포를 측정합니다.
+
+    python bench/load_latency.py --clients 200 --requests 20
+    python bench/load_latency.py --scale small --clients 200
+
+bench/seed.py 로 임시 DB를 만들어 쓰므로 특정 DB 스냅숏에 의존하지 않고, 원본 DB도 바꾸지 않습니다.
+클라이언트마다 시드 사용자 한 명으로 로그인하고, 가입 신청은 시드 그룹 중 하나로 보냅니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from seed import ROOT, add_scale_arguments, scale_from_args, seed
+from stats import summarize
+
+
+async def client(http, headers, group_id, requests, latencies, errors):
+    for i in range(requests):
+        started = time.perf_counter()
+        try:
+            if i % 5 == 4:
+                # 쓰기(COMMIT)가 섞여 있어야 이벤트 루프 블로킹이 드러납니다.
+                response = await http.post(
+                    "/member_requests/", params={"group_id": group_id}, headers=headers
+                )
+            else:
+                response = await http.get("/group/")
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except Exception as e:
+            errors.append(type(e).__name__)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def wait_until_ready(http):
+    for _ in range(100):
+        try:
+            await http.get("/docs")
+            return
+        except Exception:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+async def run(base_url, scale, clients, requests):
+    import httpx
+    from app.user.service.service import UserService
+
+    rng = random.Random(1)
+    user_service = UserService()
+    # 시드 사용자 user{n}@bench.test 와 그룹 1..groups 중에서 클라이언트마다 하나씩 고릅니다.
+    actors = [
+        (
+            {"Authorization": "Bearer " + user_service.create_access_token(
+                f"user{rng.randint(1, scale['users'])}@bench.test"
+            )},
+            rng.randint(1, scale["groups"]),
+        )
+        for _ in range(clients)
+    ]
+    latencies = []
+    errors = []
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as http:
+        await wait_until_ready(http)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(client(http, headers, group_id, requests, latencies, errors) for headers, group_id in actors)
+        )
+        elapsed = time.perf_counter() - started
+    return {"clients": clients, "errors": len(errors), **summarize(latencies, elapsed)}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    scale = scale_from_args(args)
+    workdir = tempfile.mkdtemp(prefix="sudden-attack-bench-")
+    database = os.path.join(workdir, "bench.db")
+    seed(database, **scale)
+    env = dict(
+        os.environ,
+        SUDDEN_ATTACK_DB=database,
+        PYTHONPATH=ROOT,
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+         "--log-level", "warning"],
+        cwd=workdir,
+        env=env,
+    )
+    try:
+        result = asyncio.run(
+            run(f"http://127.0.0.1:{args.port}", scale, args.clients, args.requests)
+        )
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""합성 DB 위에서 리포지토리 메서드를 하나씩 반복 호출해 호출당 지연 시간을 잽니다.
+
+    python bench/micro.py --scale small --iterations 500 --out micro.json
+
+HTTP, 서비스 계층, 스레드 풀을 거치지 않고 UserRepository / GroupRepository / BoardRepository / ImportRepository 의
+동기 메서드를 직접 부릅니다. 쓰기 메서드는 bench/endpoints.py 와 같은 방식으로 미리 넣어 둔 행을
+한 번씩 소비합니다. 항목이 없는 공개 메서드가 있으면 "uncovered" 에 적고 종료 코드 1로 끝납니다.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from seed import ROOT, add_scale_arguments, scale_from_args, seed
+from stats import summarize
+
+# bcrypt 를 계산하는 메서드는 --bcrypt-iterations 만큼만 호출합니다.
+BCRYPT_METHODS = {"user.authenticate", "user.hash_password", "user.verify_password"}
+
+
+def method_calls(f, n: int) -> List[Tuple[str, Callable]]:
+    from seed import PASSWORD
+    from app.user.dto.dto import User
+    from app.group.dto.dto import GroupCreate, AdminUser
+    from app.board.dto.dto import BoardCreate, BoardUpdate, CommentCreate, CommentUpdate
+    from app.importer.dto.dto import ImportGroup, ImportMember
+
+    users = f.scale["users"]
+    hashed = f.hashed
+    board = BoardCreate(title="micro", content="micro " * 20, category_id=1, category_type="QNA")
+
+    def email(i):
+        return f.email(i % users + 1)
+
+    def cohort(i):
+        # 새 그룹 하나와 기존 사용자 50명의 가입 신청을 한 청크로 넣습니다.
+        name = f"micro-import-{i}"
+        members = [(2 + k, ImportMember(group=name, email=email(i + 1 + k), role="PENDING")) for k in range(min(50, users - 1))]
+        return [], [(1, ImportGroup(name=name, admin=email(i)))], members
+
+    return [
+        ("user.register", lambda r, i: r.user.register(
+            User(username=f"micro{i}", nickname=f"micro-nick{i}", email=f"micro{i}@bench.test",
+                 password=PASSWORD, occupation=1),
+            hashed_password=hashed,
+        )),
+        ("user.get_user_info", lambda r, i: r.user.get_user_info(email(i))),
+        ("user.update_user_info", lambda r, i: r.user.update_user_info(email(i), f"user{i % users + 1}", f"nick{i % users + 1}", "개발자")),
+        ("user.update_user_password", lambda r, i: r.user.update_user_password(email(i), "", hashed_password=hashed)),
+        # 앞의 register 가 만든 사용자를 탈퇴시킵니다.
+        ("user.withdrawal", lambda r, i: r.user.withdrawal(f"micro{i}@bench.test")),
+        ("user.invalidate_user", lambda r, i: r.user.invalidate_user(email(i))),
+        ("user.authenticate", lambda r, i: r.user.authenticate(email(i), PASSWORD)),
+        ("user.get_active_user", lambda r, i: r.user.get_active_user(email(i))),
+        ("user.get_userid_by_email", lambda r, i: r.user.get_userid_by_email(email(i))),
+        ("user.hash_password", lambda r, i: r.user.hash_password(PASSWORD)),
+        ("user.verify_password", lambda r, i: r.user.verify_password(PASSWORD, hashed)),
+        ("group.create_group", lambda r, i: r.group.create_group(
+            GroupCreate(name=f"micro-{i}", description="micro", created_at="2024-01-01T00:00:00"), f.actor,
+        )),
+        ("group.get_user_groups", lambda r, i: r.group.get_user_groups(i % users + 1)),
+        ("group.get_member_role", lambda r, i: r.group.get_member_role(f.group_id(), i % users + 1)),
+        ("group.study_group_join_request", lambda r, i: r.group.study_group_join_request(i % users + 1, f.group_id())),
+        ("group.get_member_requests_by_user", lambda r, i: r.group.get_member_requests_by_user(i % users + 1)),
+        ("group.get_member_requests", lambda r, i: r.group.get_member_requests(f.group_id())),
+        ("group.add_member", lambda r, i: r.group.add_member(f.pending["approve"][i])),
+        ("group.deny_request", lambda r, i: r.group.deny_request(f.pending["deny"][i])),
+        ("group.add_members", lambda r, i: r.group.add_members(
+            f.moderated_group, f.pending["approve_batch"][i * f.batch:(i + 1) * f.batch],
+        )),
+        ("group.deny_requests", lambda r, i: r.group.deny_requests(
+            f.moderated_group, f.pending["deny_batch"][i * f.batch:(i + 1) * f.batch],
+        )),
+        ("group.get_all_members", lambda r, i: r.group.get_all_members(f.group_id(), "MEMBER", f.actor)),
+        ("group.get_all_members_with_role", lambda r, i: r.group.get_all_members_with_role(f.group_id(), f.actor)),
+        ("group.get_member_requests_as_admin", lambda r, i: r.group.get_member_requests_as_admin(f.group_id(), f.actor)),
+        ("group.group_withdrawal", lambda r, i: r.group.group_withdrawal(f.leaving_group, f.leaving[i % len(f.leaving)])),
+        ("group.remove_member", lambda r, i: r.group.remove_member(
+            AdminUser(role="ADMIN", group_id=f.removed_group, user_id=f.removed[i % len(f.removed)]),
+        )),
+        ("group.delete_group", lambda r, i: r.group.delete_group(f.deleted_groups[i])),
+        ("group.delete_group_as_admin", lambda r, i: r.group.delete_group_as_admin(f.deleted_groups[n + i], f.actor)),
+        ("group.get_all_groups", lambda r, i: r.group.get_all_groups()),
+        ("group.get_all_groups(name)", lambda r, i: r.group.get_all_groups("그룹 1")),
+        ("group.recount_member_counts", lambda r, i: r.group.recount_member_counts()),
+        ("group.change_member_role_to_admin", lambda r, i: r.group.change_member_role_to_admin(f.moderated_group, f.promoted)),
+        ("group.change_member_role_to_member", lambda r, i: r.group.change_member_role_to_member(f.moderated_group, f.promoted)),
+        ("board.get_board", lambda r, i: r.board.get_board(f.board_id())),
+        ("board.get_boards", lambda r, i: r.board.get_boards()),
+        ("board.get_boards(category)", lambda r, i: r.board.get_boards(category_type="FREE", preview=100)),
+        ("board.create_board", lambda r, i: r.board.create_board(board, f.actor)),
+        ("board.update_board", lambda r, i: r.board.update_board(f.own_board, BoardUpdate(**board.model_dump()), f.actor)),
+        ("board.delete_board", lambda r, i: r.board.delete_board(f.deleted_boards[i], f.actor)),
+        ("board.create_comment", lambda r, i: r.board.create_comment(f.board_id(), CommentCreate(content=f"micro {i}"), f.actor)),
+        ("board.get_comments", lambda r, i: r.board.get_comments(f.board_id())),
+        ("board.get_board_with_comments", lambda r, i: r.board.get_board_with_comments(f.board_id())),
+        ("board.export_boards", lambda r, i: r.board.export_boards()),
+        ("board.export_boards(category)", lambda r, i: r.board.export_boards(category_type="FREE", after=("2024-01-01", i))),
+        ("board.export_comments", lambda r, i: r.board.export_comments(after=i)),
+        ("board.export_comments(category)", lambda r, i: r.board.export_comments(category_type="FREE", after=i)),
+        ("board.update_comment", lambda r, i: r.board.update_comment(f.own_comment, CommentUpdate(content=f"micro {i}"), f.actor)),
+        ("board.delete_comment", lambda r, i: r.board.delete_comment(f.deleted_comments[i], f.actor)),
+        ("reference.load", lambda r, i: r.reference.load()),
+        ("reference.refresh_if_changed", lambda r, i: r.reference.refresh_if_changed()),
+        ("reference.occupation_name", lambda r, i: r.reference.occupation_name(i % 4 + 1)),
+        ("reference.has_category", lambda r, i: r.reference.has_category(1, "QNA")),
+        ("importer.import_chunk", lambda r, i: r.importer.import_chunk(*cohort(i))),
+        # 로그인마다 새 가족이 생기므로 첫 교환(행 추가)과 이어지는 교환(행 갱신)을 나눠 잽니다.
+        ("token.rotate", lambda r, i: r.token.rotate(email(i), f"micro-{i}", 0, time.time(), time.time() + 3600)),
+        ("token.rotate(next)", lambda r, i: r.token.rotate(email(i), f"micro-{i}", 1, time.time(), time.time() + 3600)),
+        ("token.revoke", lambda r, i: r.token.revoke(f"micro-{i}", time.time() + 3600)),
+        ("token.sweep", lambda r, i: r.token.sweep()),
+    ]
+
+
+def uncovered_methods(repositories, labels) -> List[str]:
+    covered = {label.split("(")[0] for label in labels}
+    return sorted(
+        f"{prefix}.{name}"
+        for prefix, repository in repositories
+        for name in dir(type(repository))
+        if not name.startswith("_")
+        and callable(getattr(repository, name))
+        and f"{prefix}.{name}" not in covered
+    )
+
+
+def run(fixtures, iterations: int, bcrypt_iterations: int, only) -> dict:
+    from app.user.repository.repository import UserRepository
+    from app.group.repository.repository import GroupRepository
+    from app.board.repository.repository import BoardRepository
+    from app.importer.repository.repository import ImportRepository
+    from app.user.repository.token import TokenRepository
+    from app.database.reference import reference_data
+
+    class Repositories:
+        pass
+
+    repositories = Repositories()
+    repositories.user = UserRepository()
+    repositories.group = GroupRepository()
+    repositories.board = BoardRepository()
+    repositories.importer = ImportRepository()
+    repositories.token = TokenRepository()
+    repositories.reference = reference_data
+    calls = method_calls(fixtures, iterations)
+    results = {}
+    for label, call in calls:
+        if only and not any(label.startswith(prefix) for prefix in only):
+            continue
+        count = bcrypt_iterations if label in BCRYPT_METHODS else iterations
+        latencies = []
+        started = time.perf_counter()
+        for i in range(count):
+            call_started = time.perf_counter()
+            call(repositories, i)
+            latencies.append((time.perf_counter() - call_started) * 1000)
+        results[label] = summarize(latencies, time.perf_counter() - started)
+        print(
+            f"{label:40} {results[label]['throughput_rps']:>10} ops/s  p95 {results[label]['p95_ms']:>8} ms",
+            file=sys.stderr,
+        )
+    uncovered = uncovered_methods(
+        [
+            ("user", repositories.user), ("group", repositories.group),
+            ("board", repositories.board), ("importer", repositories.importer),
+        ],
+        [label for label, _ in calls],
+    )
+    return {"methods": results, "uncovered": uncovered}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--bcrypt-iterations", type=int, default=5)
+    parser.add_argument("--only", action="append", help="라벨이 이 값으로 시작하는 메서드만 실행")
+    parser.add_argument("--out")
+    args = parser.parse_args()
+
+    from endpoints import Fixtures
+
+    scale = scale_from_args(args)
+    with tempfile.TemporaryDirectory() as workdir:
+        database = os.path.join(workdir, "bench.db")
+        seed(database, **scale)
+        # 삭제되는 그룹은 delete_group 과 delete_group_as_admin 이 나눠 씁니다.
+        fixtures = Fixtures(database, scale, args.iterations * 2, 0)
+        fixtures.hashed = sqlite3.connect(database).execute(
+            "SELECT password FROM user WHERE id = 1"
+        ).fetchone()[0]
+        # 리포지토리가 쓰는 전역 커넥션 풀은 import 시점에 만들어지므로 DB 경로를 먼저 정합니다.
+        os.environ["SUDDEN_ATTACK_DB"] = database
+        sys.path.insert(0, ROOT)
+        report = run(fixtures, args.iterations, args.bcrypt_iterations, args.only)
+        from app.database.connection import pool
+
+        pool.close()
+
+    report = {
+        "suite": "micro",
+        "meta": {
+            "scale": scale,
+            "iterations": args.iterations,
+            "bcrypt_iterations": args.bcrypt_iterations,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        **report,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    for method in report["uncovered"]:
+        print(f"no microbenchmark for {method}", file=sys.stderr)
+    if report["uncovered"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""커넥션 PRAGMA 프로필별로 읽기/쓰기가 섞인 부하의 처리량을 비교합니다.
+
+    python bench/profiles.py --threads 8 --seconds 5 --write-ratio 0.2
+
+프로필마다 커밋된 DB를 새로 복사해 게시글/댓글을 채운 뒤, 앱과 같은 크기의 풀과 스레드로
+BoardRepository 를 직접 호출합니다(HTTP 계층은 제외).
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.database.connection import ConnectionPool, PROFILES  # noqa: E402
+from app.database.migrations import migrate  # noqa: E402
+
+from load_latency import percentile  # noqa: E402
+
+
+def seed(database, boards):
+    conn = sqlite3.connect(database)
+    migrate(conn)
+    conn.execute("INSERT OR IGNORE INTO category (type, name) VALUES ('QNA', 'bench')")
+    user_id = conn.execute("SELECT id FROM user ORDER BY id LIMIT 1").fetchone()[0]
+    conn.executemany(
+        """
+        INSERT INTO board (title, content, category_id, category_type, user_id)
+        VALUES (?, ?, 1, 'QNA', ?)
+        """,
+        [(f"title {i}", "본문 " * 100, user_id) for i in range(boards)],
+    )
+    conn.commit()
+    conn.close()
+    return user_id
+
+
+def worker(repository, user_id, boards, write_ratio, deadline, seed_value, samples, errors):
+    from app.board.dto.dto import BoardCreate, CommentCreate
+
+    rng = random.Random(seed_value)
+    while time.perf_counter() < deadline:
+        write = rng.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if write and rng.random() < 0.5:
+                repository.create_board(
+                    BoardCreate(title="bench", content="본문", category_id=1, category_type="QNA"),
+                    user_id,
+                )
+            elif write:
+                repository.create_comment(rng.randint(1, boards), CommentCreate(content="bench"), user_id)
+            elif rng.random() < 0.5:
+                repository.get_boards(limit=20)
+            else:
+                repository.get_comments(rng.randint(1, boards), limit=20)
+        except Exception as e:
+            errors.append(type(e).__name__)
+            continue
+        samples["write" if write else "read"].append((time.perf_counter() - started) * 1000)
+
+
+def run_profile(profile, threads, seconds, write_ratio, boards):
+    from app.board.repository.repository import BoardRepository
+
+    workdir = tempfile.mkdtemp(prefix="sudden-attack-profile-")
+    database = os.path.join(workdir, "sudden-attack.db")
+    shutil.copy(os.path.join(ROOT, "sudden-attack.db"), database)
+    try:
+        user_id = seed(database, boards)
+        repository = BoardRepository()
+        repository.pool = ConnectionPool(database, size=threads, profile=profile)
+        samples = {"read": [], "write": []}
+        errors = []
+        deadline = time.perf_counter() + seconds
+        workers = [
+            threading.Thread(
+                target=worker,
+                args=(repository, user_id, boards, write_ratio, deadline, i, samples, errors),
+            )
+            for i in range(threads)
+        ]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        repository.pool.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    result = {"ops_per_s": round(sum(map(len, samples.values())) / seconds, 1), "errors": len(errors)}
+    for kind, latencies in samples.items():
+        if latencies:
+            result[kind] = {
+                "ops_per_s": round(len(latencies) / seconds, 1),
+                "p50_ms": round(statistics.median(latencies), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+            }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--boards", type=int, default=500)
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES))
+    args = parser.parse_args()
+
+    results = {
+        profile: run_profile(profile, args.threads, args.seconds, args.write_ratio, args.boards)
+        for profile in args.profiles
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""벤치마크용 합성 DB를 만듭니다.
+
+    python bench/seed.py --scale small --out /tmp/bench.db
+    python bench/seed.py --scale small --boards 20000 --out /tmp/bench.db
+
+빈 파일에 마이그레이션을 적용한 뒤 사용자, 그룹, 멤버십(일부는 PENDING), 게시글, 댓글을
+정해진 난수 시드로 채우므로 같은 인자로는 항상 같은 DB 가 만들어집니다.
+모든 사용자의 비밀번호는 PASSWORD 입니다.
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.database.migrations import migrate  # noqa: E402
+
+PASSWORD = "bench-password"
+OCCUPATIONS = ["개발자", "디자이너", "기획자", "학생"]
+CATEGORIES = [("QNA", "질문"), ("FREE", "자유"), ("STUDY", "스터디")]
+
+SCALES: Dict[str, Dict[str, int]] = {
+    "tiny": dict(users=50, groups=10, members_per_group=5, boards=200, comments_per_board=3),
+    "small": dict(users=1000, groups=100, members_per_group=20, boards=5000, comments_per_board=10),
+    "medium": dict(users=20000, groups=2000, members_per_group=30, boards=100000, comments_per_board=10),
+}
+
+
+def seed(
+    database: str,
+    users: int,
+    groups: int,
+    members_per_group: int,
+    boards: int,
+    comments_per_board: int,
+    seed_value: int = 0,
+) -> Dict[str, int]:
+    from app.user.repository.password import password_hasher
+
+    rng = random.Random(seed_value)
+    start = datetime(2024, 1, 1)
+    # bcrypt 는 한 번만 계산해 모든 사용자에게 같은 해시를 씁니다.
+    hashed = password_hasher.hash_sync(PASSWORD)
+
+    conn = sqlite3.connect(database)
+    migrate(conn)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executemany(
+        "INSERT INTO occupation (occupation_name) VALUES (?)", [(name,) for name in OCCUPATIONS]
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO category (type, name) VALUES (?, ?)", CATEGORIES
+    )
+    conn.executemany(
+        """
+        INSERT INTO user (id, username, nickname, email, password, occupation_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                i, f"user{i}", f"nick{i}", f"user{i}@bench.test", hashed,
+                rng.randint(1, len(OCCUPATIONS)), start + timedelta(minutes=i),
+            )
+            for i in range(1, users + 1)
+        ],
+    )
+    conn.executemany(
+        'INSERT INTO "group" (id, name, description, created_at) VALUES (?, ?, ?, ?)',
+        [
+            (g, f"스터디 그룹 {g}", f"벤치마크 그룹 {g} 설명", start + timedelta(hours=g))
+            for g in range(1, groups + 1)
+        ],
+    )
+    members = []
+    for g in range(1, groups + 1):
+        # 그룹 g 의 관리자는 사용자 ((g - 1) % users) + 1 입니다.
+        admin = (g - 1) % users + 1
+        members.append((admin, g, "ADMIN"))
+        others = rng.sample(range(1, users + 1), min(users, members_per_group + 1))
+        for user_id in [u for u in others if u != admin][:members_per_group]:
+            members.append((user_id, g, "PENDING" if rng.random() < 0.2 else "MEMBER"))
+    conn.executemany(
+        "INSERT INTO group_member (user_id, group_id, role, created_at) VALUES (?, ?, ?, datetime('now'))",
+        members,
+    )
+    conn.executemany(
+        """
+        INSERT INTO board (id, title, content, category_id, category_type, user_id, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                b, f"게시글 {b}", "본문 " * rng.randint(5, 200),
+                category, CATEGORIES[category - 1][0], rng.randint(1, users),
+                start + timedelta(minutes=b),
+            )
+            for b in range(1, boards + 1)
+            for category in [rng.randint(1, len(CATEGORIES))]
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO board_comment (content, user_id, board_id, created_at) VALUES (?, ?, ?, ?)",
+        (
+            (f"댓글 {c}", rng.randint(1, users), b, start + timedelta(minutes=b, seconds=c))
+            for b in range(1, boards + 1)
+            for c in range(comments_per_board)
+        ),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    return {
+        "users": users,
+        "groups": groups,
+        "members_per_group": members_per_group,
+        "boards": boards,
+        "comments_per_board": comments_per_board,
+    }
+
+
+def add_scale_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--scale", choices=sorted(SCALES), default="tiny")
+    for name in SCALES["tiny"]:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=None)
+
+
+def scale_from_args(args) -> Dict[str, int]:
+    scale = dict(SCALES[args.scale])
+    for name in scale:
+        value = getattr(args, name)
+        if value is not None:
+            scale[name] = value
+    return scale
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    add_scale_arguments(parser)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    if os.path.exists(args.out):
+        parser.error(f"{args.out} already exists")
+    facts = seed(args.out, seed_value=args.seed, **scale_from_args(args))
+    print(json.dumps(facts, indent=2))
+
+
+if __name__ == "__main__":
+    main()
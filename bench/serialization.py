@@ -0,0 +1,125 @@
+"""목록 응답의 직렬화 경로를 10k 행으로 비교합니다.
+
+    python bench/serialization.py --rows 10000
+
+model: 행마다 Pydantic 모델을 만들고 FastAPI 가 response_model 로 다시 검증/직렬화한 뒤 json.dumps 하는 경로
+rows:  행을 dict 목록으로 한 번에 검증(app.database.rows)하고 FastJSONResponse 로 한 번 인코딩하는 경로
+SQL 은 제외하고 fetchall() 결과(튜플)부터 응답 본문 바이트까지만 잽니다. 두 경로의 본문이 같은 JSON 인지도 확인합니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.board.dto.dto import BoardPage, BoardSummary, CommentPage, CommentView  # noqa: E402
+from app.group.dto.dto import Group, MemberRequestsView  # noqa: E402
+from app.board.repository.repository import board_summary_rows, comment_rows  # noqa: E402
+from app.group.repository.repository import group_rows, member_request_rows  # noqa: E402
+from app.database.rows import as_dicts  # noqa: E402
+from app.server.response import FastJSONResponse  # noqa: E402
+
+
+def created_at(i):
+    return f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}:{i % 60:02d}"
+
+
+def description(*columns):
+    return [(column,) + (None,) * 6 for column in columns]
+
+
+def cases(n):
+    # (이름, response_model, 컬럼, 행, 예전 리포지토리의 행 -> 모델 변환, 새 변환)
+    return [
+        (
+            "get_user_groups", List[Group],
+            description("id", "name", "description", "created_at"),
+            [(i, f"그룹 {i}", f"설명 {i}", created_at(i)) for i in range(n)],
+            lambda rows: [Group(id=r[0], name=r[1], description=r[2], created_at=r[3]) for r in rows],
+            lambda desc, rows: group_rows.validate_python(as_dicts(desc, rows)),
+        ),
+        (
+            "get_member_requests", List[MemberRequestsView],
+            description("id", "username", "nickname", "occupation_name", "created_at"),
+            [(i, f"user{i}", f"nick{i}", "개발자", created_at(i)) for i in range(n)],
+            lambda rows: [
+                MemberRequestsView(id=r[0], username=r[1], nickname=r[2], occupation_name=r[3], created_at=r[4])
+                for r in rows
+            ],
+            lambda desc, rows: member_request_rows.validate_python(as_dicts(desc, rows)),
+        ),
+        (
+            "get_boards", BoardPage,
+            description("id", "title", "category_id", "category_type", "status", "user_id", "created_at", "preview"),
+            [(i, f"게시글 {i}", 1, "QNA", "ACTIVE", i % 100, created_at(i), "미리보기 " * 5) for i in range(n)],
+            lambda rows: BoardPage(items=[
+                BoardSummary(id=r[0], title=r[1], category_id=r[2], category_type=r[3], status=r[4],
+                             user_id=r[5], created_at=r[6], preview=r[7])
+                for r in rows
+            ], next_cursor="cursor"),
+            lambda desc, rows: {"items": board_summary_rows.validate_python(as_dicts(desc, rows)), "next_cursor": "cursor"},
+        ),
+        (
+            "get_comments", CommentPage,
+            description("id", "content", "user_id", "board_id", "created_at", "nickname"),
+            [(i, f"댓글 {i}", i % 100, 1, created_at(i), f"nick{i % 100}") for i in range(n)],
+            lambda rows: CommentPage(items=[
+                CommentView(id=r[0], content=r[1], user_id=r[2], board_id=r[3], created_at=r[4], nickname=r[5])
+                for r in rows
+            ], next_cursor="cursor"),
+            lambda desc, rows: {"items": comment_rows.validate_python(as_dicts(desc, rows)), "next_cursor": "cursor"},
+        ),
+    ]
+
+
+async def model_path(field, to_models, rows) -> bytes:
+    content = await serialize_response(field=field, response_content=to_models(rows))
+    return JSONResponse(content).body
+
+
+async def rows_path(to_rows, desc, rows) -> bytes:
+    return FastJSONResponse(to_rows(desc, rows)).body
+
+
+async def best_of(repeat, make) -> (float, bytes):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await make()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, body
+
+
+async def run(n, repeat):
+    results = {}
+    for name, model, desc, rows, to_models, to_rows in cases(n):
+        field = create_response_field(name="response", type_=model)
+        model_ms, model_body = await best_of(repeat, lambda: model_path(field, to_models, rows))
+        rows_ms, rows_body = await best_of(repeat, lambda: rows_path(to_rows, desc, rows))
+        if json.loads(model_body) != json.loads(rows_body):
+            raise SystemExit(f"{name}: response bodies differ")
+        results[name] = {
+            "model_ms": round(model_ms, 2),
+            "rows_ms": round(rows_ms, 2),
+            "speedup": round(model_ms / rows_ms, 1),
+        }
+        print(f"{name:22} model {model_ms:8.1f} ms   rows {rows_ms:8.1f} ms   x{model_ms / rows_ms:.1f}", file=sys.stderr)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps({"rows": args.rows, "results": asyncio.run(run(args.rows, args.repeat))}, indent=2))
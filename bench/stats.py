@@ -0,0 +1,22 @@
+"""벤치마크 스크립트가 함께 쓰는 통계 함수입니다."""
+import statistics
+from typing import Dict, List
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies_ms: List[float], elapsed: float) -> Dict[str, float]:
+    # 지연 시간(ms) 목록과 전체 소요 시간(s)으로 처리량과 분위수를 계산합니다.
+    if not latencies_ms:
+        return {"requests": 0, "throughput_rps": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0}
+    return {
+        "requests": len(latencies_ms),
+        "throughput_rps": round(len(latencies_ms) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(statistics.median(latencies_ms), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+    }
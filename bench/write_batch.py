@@ -0,0 +1,105 @@
+"""게시글/댓글 INSERT 처리량을 개별 커밋과 그룹 커밋(WriteBatcher) 모드로 비교합니다.
+
+    python bench/write_batch.py --writers 1 8 64 256 --inserts 2000
+
+프로필마다 커밋된 DB를 새로 복사해 쓰며, 동시 호출자 수를 바꿔 가며 초당 INSERT 수를 잽니다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.database.connection import ConnectionPool  # noqa: E402
+from app.database.migrations import migrate  # noqa: E402
+
+
+def prepare(database):
+    shutil.copy(os.path.join(ROOT, "sudden-attack.db"), database)
+    conn = sqlite3.connect(database)
+    migrate(conn)
+    conn.execute("INSERT OR IGNORE INTO category (type, name) VALUES ('QNA', 'bench')")
+    user_id = conn.execute("SELECT id FROM user ORDER BY id LIMIT 1").fetchone()[0]
+    conn.execute(
+        "INSERT INTO board (title, content, category_id, category_type, user_id) VALUES ('b', 'b', 1, 'QNA', ?)",
+        (user_id,),
+    )
+    conn.commit()
+    conn.close()
+    return user_id
+
+
+async def drive(repository, user_id, writers, inserts):
+    from app.board.dto.dto import BoardCreate, CommentCreate
+
+    board = BoardCreate(title="bench", content="본문", category_id=1, category_type="QNA")
+    comment = CommentCreate(content="bench")
+    ids = []
+
+    async def writer(count):
+        for i in range(count):
+            if i % 2:
+                ids.append(await repository.create_comment(1, comment, user_id))
+            else:
+                ids.append(await repository.create_board(board, user_id))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(inserts // writers) for _ in range(writers)))
+    elapsed = time.perf_counter() - started
+    return len(ids), len(set(ids)), elapsed
+
+
+def run(profile, batched, writers, inserts, workdir):
+    from app.board.repository.repository import BoardRepository, AsyncBoardRepository
+    from app.database.batcher import WriteBatcher
+
+    database = os.path.join(workdir, f"{profile}-{batched}-{writers}.db")
+    user_id = prepare(database)
+    repository = BoardRepository()
+    repository.pool = ConnectionPool(database, profile=profile)
+    batcher = WriteBatcher(repository.pool) if batched else None
+    async_repository = AsyncBoardRepository(repository, batcher)
+    async_repository.batcher = batcher
+    try:
+        count, _, elapsed = asyncio.run(drive(async_repository, user_id, writers, inserts))
+    finally:
+        if batcher is not None:
+            batcher.close()
+        repository.pool.close()
+    result = {"inserts_per_s": round(count / elapsed, 1)}
+    if batcher is not None:
+        result["avg_batch"] = round(batcher.writes / max(batcher.batches, 1), 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, nargs="*", default=[1, 8, 64, 256])
+    parser.add_argument("--inserts", type=int, default=2000)
+    parser.add_argument("--profiles", nargs="*", default=["default", "wal-durable", "wal"])
+    parser.add_argument("--dir", default=None, help="DB를 둘 디렉터리(fsync 비용은 파일 시스템에 따라 다릅니다)")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="sudden-attack-batch-", dir=args.dir)
+    results = {}
+    try:
+        for profile in args.profiles:
+            for writers in args.writers:
+                results[f"{profile} x{writers}"] = {
+                    "individual": run(profile, False, writers, args.inserts, workdir),
+                    "batched": run(profile, True, writers, args.inserts, workdir),
+                }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
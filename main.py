@@ -1,14 +1,60 @@
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from api.user.routes import router as user_router
 from api.group.routes import router as group_router
 from api.board.routes import router as board_router
+from api.metrics.routes import router as metrics_router
+from api.importer.routes import router as import_router
 from fastapi.middleware.cors import CORSMiddleware
+from app.database.connection import pool
+from app.database.migrations import migrate
+from app.database.reference import reference_data
+from app.user.repository.token import TokenRepository
+from app.metrics.middleware import TimingMiddleware
+from app.metrics.registry import METRICS_ENABLED
+from app.server.lifecycle import WARM_UP, warm_up, shut_down
 
-app = FastAPI()
+HOST = os.environ.get("HOST", "0.0.0.0")
+PORT = int(os.environ.get("PORT", "8000"))
+# 워커 프로세스 수. 기본값은 코어 수입니다.
+WORKERS = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+# auto 는 uvloop / httptools 가 설치되어 있으면 그것을, 없으면 asyncio / h11 을 씁니다.
+SERVER_LOOP = os.environ.get("SERVER_LOOP", "auto")
+SERVER_HTTP = os.environ.get("SERVER_HTTP", "auto")
+# 종료 신호를 받은 뒤 처리 중인 요청을 기다리는 최대 시간(초)
+GRACEFUL_TIMEOUT = float(os.environ.get("SERVER_GRACEFUL_TIMEOUT", "30"))
+
+logger = logging.getLogger("app.server")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 DB 스키마를 최신 버전으로 맞춥니다.
+    with pool.unmanaged() as conn:
+        migrate(conn)
+    # occupation / category 를 메모리에 올리고, 다른 워커나 명령이 바꾼 것은 주기적으로 확인합니다.
+    reference_data.load()
+    reference_watch = asyncio.create_task(reference_data.watch())
+    # 만료된 refresh token 가족을 주기적으로 지웁니다.
+    token_sweep = asyncio.create_task(TokenRepository().sweep_expired())
+    if WARM_UP:
+        await warm_up()
+    yield
+    reference_watch.cancel()
+    token_sweep.cancel()
+    shut_down()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(user_router)
 app.include_router(group_router)
 app.include_router(board_router)
+app.include_router(metrics_router)
+app.include_router(import_router)
 
 # CORS 설정
 origins = [
@@ -23,6 +69,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-if __name__ == "__main__":
+# 요청 지연 시간 측정은 CORS 처리까지 포함하도록 가장 바깥에 둡니다.
+if METRICS_ENABLED:
+    app.add_middleware(TimingMiddleware)
+
+
+def serve() -> None:
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    workers = max(1, WORKERS)
+    if workers > 1:
+        # 워커마다 코어 수만큼 bcrypt 스레드를 두면 코어 수의 제곱만큼 스레드가 생기므로 나눠 갖습니다.
+        # 워커는 새 인터프리터로 시작하므로 환경 변수로 넘깁니다.
+        os.environ.setdefault(
+            "PASSWORD_WORKERS", str(max(1, (os.cpu_count() or 1) // workers))
+        )
+        # 롤백 저널에서는 한 프로세스가 쓰는 동안 다른 프로세스의 읽기도 막힙니다.
+        if pool.pragmas.get("journal_mode") != "WAL":
+            logger.warning(
+                "running %d workers on the %r database profile; use a WAL profile", workers, pool.profile
+            )
+    # 워커들이 동시에 마이그레이션 잠금을 다투지 않도록 먼저 한 번 맞춰 둡니다.
+    with pool.unmanaged() as conn:
+        migrate(conn)
+    pool.close()
+
+    # 종료 신호를 받으면 새 연결을 받지 않고, 처리 중인 요청을 GRACEFUL_TIMEOUT 까지 기다린 뒤
+    # lifespan 종료 단계(shut_down)를 실행합니다.
+    uvicorn.run(
+        "main:app",
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        loop=SERVER_LOOP,
+        http=SERVER_HTTP,
+        timeout_graceful_shutdown=GRACEFUL_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    serve()
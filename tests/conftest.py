@@ -0,0 +1,17 @@
+import os
+import tempfile
+
+import pytest
+
+# 전역 커넥션 풀은 import 시점에 DB 경로를 읽으므로 앱을 import 하기 전에 임시 DB 를 지정합니다.
+_workdir = tempfile.TemporaryDirectory()
+os.environ["SUDDEN_ATTACK_DB"] = os.path.join(_workdir.name, "test.db")
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
@@ -0,0 +1,42 @@
+import os
+import sqlite3
+
+import pytest
+
+from app.group.repository.repository import SHORT_SEARCH_MAX_OFFSET
+from tests.test_pagination import raw_cursor
+
+
+@pytest.fixture(scope="module")
+def many_groups(client):
+    conn = sqlite3.connect(os.environ["SUDDEN_ATTACK_DB"])
+    conn.executemany(
+        'INSERT INTO "group" (name, description) VALUES (?, ?)',
+        [(f"zq-group-{i}", "directory") for i in range(SHORT_SEARCH_MAX_OFFSET + 50)],
+    )
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.parametrize("values", [[{}], [None], ["abc"], [-1]])
+@pytest.mark.parametrize("name", ["zq", "zq-group"])
+def test_malformed_offset_cursor_is_400(client, many_groups, name, values):
+    response = client.get("/group/", params={"name": name, "cursor": raw_cursor(values)})
+    assert response.status_code == 400
+
+
+def test_short_search_depth_is_capped(client, many_groups):
+    # 3글자 미만 검색은 SHORT_SEARCH_MAX_OFFSET 을 넘는 페이지를 내주지 않습니다.
+    cursor, pages = None, 0
+    while True:
+        params = {"name": "zq", "limit": 100}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/group/", params=params).json()
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == SHORT_SEARCH_MAX_OFFSET // 100 + 1
+    beyond = client.get("/group/", params={"name": "zq", "cursor": raw_cursor([SHORT_SEARCH_MAX_OFFSET + 1])})
+    assert beyond.status_code == 400
@@ -0,0 +1,20 @@
+import pytest
+
+from app.database.instrument import query_name
+
+
+@pytest.mark.parametrize("sql", [
+    "CREATE TRIGGER IF NOT EXISTS t AFTER UPDATE OF role ON group_member BEGIN SELECT 1; END",
+    "CREATE INDEX IF NOT EXISTS i ON board (created_at, id)",
+    "ALTER TABLE user ADD COLUMN x REAL",
+    "PRAGMA foreign_keys = ON",
+])
+def test_ddl_and_pragma_are_not_labeled(sql):
+    assert query_name(sql) is None
+
+
+def test_in_lists_share_a_label():
+    assert query_name("SELECT id FROM user WHERE id IN (?, ?)") == query_name(
+        "SELECT id FROM user WHERE id IN (?, ?, ?, ?)"
+    )
+    assert query_name("SELECT id FROM user WHERE id IN (?, ?)").startswith("select user ")
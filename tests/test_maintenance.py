@@ -0,0 +1,9 @@
+import pytest
+
+from app.database.maintenance import churn_check
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_member_count_survives_churn(seed):
+    # 무작위 가입/승인/탈퇴/강퇴/삭제 뒤에도 member_count 가 group_member 와 일치해야 합니다.
+    assert churn_check(operations=500, seed=seed) == 0
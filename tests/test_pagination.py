@@ -0,0 +1,32 @@
+import base64
+import json
+
+import pytest
+
+from app.database.pagination import decode_cursor, encode_cursor
+
+
+def raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    assert decode_cursor(encode_cursor("2024-01-01 00:00:00", 7), 2) == ["2024-01-01 00:00:00", 7]
+
+
+@pytest.mark.parametrize("values", [[{}, 1], ["2024-01-01", None], [[1], 1], [True, 1], ["a", 1.5]])
+def test_rejects_non_scalar_values(values):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(raw_cursor(values), 2)
+
+
+def test_boards_malformed_cursor_is_400(client):
+    response = client.get("/boards/", params={"cursor": raw_cursor([{}, 1])})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_comments_malformed_cursor_is_400(client):
+    response = client.get("/boards/1/comments/", params={"cursor": raw_cursor(["2024-01-01", [1]])})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,6 @@
+from app.database.query_plan import check
+
+
+def test_repository_queries_use_indexes():
+    # 인덱스 없이 테이블 전체를 읽는 리포지토리 쿼리가 없어야 합니다.
+    assert check() == []